@@ -2,13 +2,14 @@ import os
 import json
 import random
 import logging
-import requests
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Callable
 from PyQt5.QtCore import QUrl, QTimer, QEventLoop, QThread, pyqtSignal, pyqtSlot
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEnginePage
 from PyQt5.QtNetwork import QNetworkProxy, QNetworkAccessManager, QNetworkRequest
+from offline_archive import ARCHIVE_SCHEME
 from data_manager import DataManager
+from http_client import get_client
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -58,10 +59,12 @@ class ProxyTester(QThread):
             self.result.emit(self.proxy, False)
 
 class PrivacyEngine(QWebEngineUrlRequestInterceptor):
+    blacklist_failed = pyqtSignal(str)
+
     def __init__(self, parent):
         super().__init__()
         self.parent = parent
-        self.data_manager = DataManager()
+        self.data_manager = getattr(parent, "data_manager", None) or DataManager()
         self.https_only = True
         self.permissions = {}
         self.proxy_settings = None
@@ -70,10 +73,21 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
         self.proxy_cache = self.data_manager.get_proxy_cache()
         self.tracker_blacklist_url = "https://easylist.to/easylist/easylist.txt"
         self.tracker_blacklist = set()
+        self.tracker_blacklist_max_age = 24 * 3600
+        self.blacklist_failed.connect(lambda _: self.parent.statusBar().showMessage("Failed to update tracker blacklist", 5000))
         self.load_privacy_settings()
+        self.apply_cached_proxy()
+        self.load_cached_tracker_blacklist()
+        self.anti_fingerprinting_enabled = True
+
+    def apply_cached_proxy(self) -> None:
+        self.working_proxies = [p for p, works in self.proxy_cache.items() if works]
+        if self.working_proxies:
+            self.set_random_proxy()
+
+    def start_background_tasks(self) -> None:
         self.initialize_proxies()
         self.update_tracker_blacklist()
-        self.anti_fingerprinting_enabled = True
 
     def load_proxies_from_file(self, filename="Proxy.txt") -> List[str]:
         proxies = []
@@ -129,16 +143,16 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
             logger.error(f"Failed to save proxy cache: {str(e)}")
 
     def initialize_proxies(self) -> None:
-        self.parent.statusBar().showMessage("Testing proxies...", 5000)
-        self.working_proxies.clear()
         untested_proxies = [p for p in self.proxy_list if p not in self.proxy_cache]
         self.testers = []
 
         if not untested_proxies:
-            self.working_proxies = [p for p, works in self.proxy_cache.items() if works]
-            self.finalize_proxy_init()
+            if not self.proxy_settings:
+                self.finalize_proxy_init()
             return
 
+        self.parent.statusBar().showMessage("Testing proxies...", 5000)
+
         for proxy in untested_proxies:
             tester = ProxyTester(proxy, timeout=3000)
             tester.result.connect(self.on_proxy_tested)
@@ -160,7 +174,8 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
             logger.error("No working proxies found")
             self.parent.statusBar().showMessage("No functional proxies available", 5000)
         else:
-            self.set_random_proxy()
+            if not self.proxy_settings:
+                self.set_random_proxy()
             self.parent.statusBar().showMessage(f"Initialized {len(self.working_proxies)} proxies", 3000)
 
     def test_proxy(self, proxy: str) -> bool:
@@ -201,11 +216,13 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
             host, port = proxy.split(":")
             self.proxy_settings = QNetworkProxy(QNetworkProxy.HttpProxy, host, int(port))
             QNetworkProxy.setApplicationProxy(self.proxy_settings)
+            get_client().set_proxy(proxy)
             self.parent.statusBar().showMessage(f"Connected via proxy: {proxy}", 5000)
         except Exception as e:
             logger.error(f"Failed to set proxy: {str(e)}")
             self.proxy_settings = None
             QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.NoProxy))
+            get_client().set_proxy(None)
             self.parent.statusBar().showMessage(f"No functional proxy: {str(e)}", 5000)
 
     def apply_proxy(self, profile: QWebEngineProfile) -> None:
@@ -219,19 +236,38 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
             logger.error(f"Failed to apply proxy: {str(e)}")
             self.parent.statusBar().showMessage(f"Proxy error: {str(e)}", 5000)
 
+    def parse_tracker_blacklist(self, text):
+        blacklist = set()
+        for line in text.splitlines():
+            if line.startswith("||") and not line.startswith("||*"):
+                domain = line[2:].split("^")[0].split("/")[0]
+                blacklist.add(domain.lower())
+        return blacklist
+
+    def load_cached_tracker_blacklist(self):
+        try:
+            cached = get_client().cache.load(self.tracker_blacklist_url)
+            if cached:
+                self.tracker_blacklist = self.parse_tracker_blacklist(cached[1].decode("utf-8", errors="replace"))
+                logger.info(f"Loaded cached tracker blacklist ({len(self.tracker_blacklist)} domains)")
+        except Exception as e:
+            logger.error(f"Failed to load cached tracker blacklist: {str(e)}")
+
     def update_tracker_blacklist(self):
+        future = get_client().fetch_async(self.tracker_blacklist_url, cache=True, max_age=self.tracker_blacklist_max_age)
+        future.add_done_callback(self.on_tracker_blacklist_fetched)
+        return future
+
+    def on_tracker_blacklist_fetched(self, future):
         try:
-            response = requests.get(self.tracker_blacklist_url, timeout=10)
+            response = future.result()
             response.raise_for_status()
-            blacklist_content = response.text.splitlines()
-            for line in blacklist_content:
-                if line.startswith("||") and not line.startswith("||*"):
-                    domain = line[2:].split("^")[0].split("/")[0]
-                    self.tracker_blacklist.add(domain.lower())
-            logger.info("Updated tracker blacklist from EasyList")
+            blacklist = self.parse_tracker_blacklist(response.text)
+            self.tracker_blacklist = blacklist
+            logger.info(f"Updated tracker blacklist from EasyList ({'cached' if response.from_cache else 'downloaded'}, {len(blacklist)} domains)")
         except Exception as e:
             logger.error(f"Failed to update tracker blacklist: {str(e)}")
-            self.parent.statusBar().showMessage("Failed to update tracker blacklist", 5000)
+            self.blacklist_failed.emit(str(e))
 
     def interceptRequest(self, info) -> None:
         try:
@@ -240,6 +276,10 @@ class PrivacyEngine(QWebEngineUrlRequestInterceptor):
             url_lower = url.lower()
             url_host = info.requestUrl().host().lower()
 
+            if info.firstPartyUrl().scheme() == ARCHIVE_SCHEME and info.requestUrl().scheme() in ("http", "https", "ws", "wss"):
+                info.block(True)
+                return
+
             if self.https_only and url.startswith("http://"):
                 info.redirect(QUrl(url.replace("http://", "https://")))
                 return
@@ -347,6 +387,7 @@ class PrivacyPage(QWebEnginePage):
     def __init__(self, profile: QWebEngineProfile, parent=None):
         super().__init__(profile, parent)
         self.privacy_engine: Optional[PrivacyEngine] = None
+        self.navigation_hook: Optional[Callable[["PrivacyPage", QUrl], bool]] = None
 
     def setPrivacyEngine(self, engine: PrivacyEngine) -> None:
         try:
@@ -360,11 +401,18 @@ class PrivacyPage(QWebEnginePage):
             if self.parent():
                 self.parent().statusBar().showMessage(f"Privacy setup error: {str(e)}", 5000)
 
+    def setNavigationHook(self, hook: Optional[Callable[["PrivacyPage", QUrl], bool]]) -> None:
+        self.navigation_hook = hook
+
     def acceptNavigationRequest(self, url: QUrl, type_, isMainFrame: bool) -> bool:
         try:
             if self.privacy_engine and self.privacy_engine.https_only and url.toString().startswith("http://"):
                 self.setUrl(QUrl(url.toString().replace("http://", "https://")))
                 return False
+            if (isMainFrame and self.navigation_hook
+                    and type_ in (QWebEnginePage.NavigationTypeLinkClicked, QWebEnginePage.NavigationTypeTyped)
+                    and self.navigation_hook(self, url)):
+                return False
             return super().acceptNavigationRequest(url, type_, isMainFrame)
         except Exception as e:
             logger.error(f"Navigation error: {str(e)}")
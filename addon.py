@@ -1,79 +1,177 @@
 import os
+import re
 import json
-import glob
-import requests
+import hashlib
 import logging
+import threading
+from concurrent.futures import as_completed
+from PyQt5.QtCore import QFileSystemWatcher, QTimer, QThread, pyqtSignal
 from PyQt5.QtWidgets import QMessageBox
-from PyQt5.QtWebEngineWidgets import QWebEngineSettings
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
 from data_manager import DataManager
+from extension_matcher import ExtensionMatcher, ALL_URLS
+from extension_profiler import ExtensionProfiler
+from extension_storage import ExtensionStorage, BRIDGE_JS as STORAGE_BRIDGE_JS, SOURCE_PREFIX as SCRIPT_PREFIX
+from store_catalog import StoreCatalog, CatalogRefreshWorker
+from http_client import get_client
 
 logging.basicConfig(filename='mojo_browser.log', level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+STORAGE_SCRIPT_PREFIX = "mojo-extension-storage:"
+HEADER_PATTERN = re.compile(r"^//\s*@(\w+)\s*:?\s*(.*)$")
+INJECTION_POINTS = {
+    "document-start": QWebEngineScript.DocumentCreation,
+    "document-end": QWebEngineScript.DocumentReady,
+    "document-idle": QWebEngineScript.Deferred
+}
+WORLDS = {
+    "main": QWebEngineScript.MainWorld,
+    "application": QWebEngineScript.ApplicationWorld,
+    "isolated": QWebEngineScript.UserWorld
+}
+
+DEFAULT_STORE_URL = "https://mojox.org/MojoBrowser/Add-Ons/"
+MAX_EXTENSION_SIZE = 5 * 1024 * 1024
+
+
+def extension_name_from_url(url):
+    return os.path.splitext(os.path.basename(url.split('?')[0]))[0]
+
+
+def parse_extension_headers(js_code):
+    headers = {}
+    for line in js_code.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith("//"):
+            break
+        match = HEADER_PATTERN.match(line)
+        if match:
+            headers.setdefault(match.group(1).lower(), []).append(match.group(2).strip())
+    return headers
+
+
 class ExtensionManager:
     def __init__(self, browser):
         self.browser = browser
         self.extensions = {}  
         self.display_names = {}  
-        self.data_manager = DataManager()
+        self.sources = {}
+        self.profiles = []
+        self.installed_scripts = {}
+        self.matcher = ExtensionMatcher()
+        self.profiler = ExtensionProfiler(browser)
+        self.profiler.over_budget.connect(self.on_over_budget)
+        self.storage = ExtensionStorage(browser)
+        self.storage.flushed.connect(self.refresh_storage_scripts)
+        self.profiler.channel.registerObject("mojoExtensionStorage", self.storage)
+        self.data_manager = getattr(browser, "data_manager", None) or DataManager()
         self.extension_status = self.data_manager.get_extension_status()
+        self.metadata = dict(self.data_manager.get_extension_cache().get("files", {}))
         self.extensions_dir = "extensions"
-        self.store_url = "https://mojox.org/MojoBrowser/Add-Ons/"
+        self.store_url = os.environ.get("MOJO_STORE_URL", DEFAULT_STORE_URL)
+        if not self.store_url.endswith("/"):
+            self.store_url += "/"
+        self.catalog = StoreCatalog(f"{self.store_url}Add-On-Lists.js")
+        self.catalog.seed(self.data_manager.get_extension_cache().get("store", []))
+        self.catalog_worker = None
+        self.watcher = None
+        self.reload_timer = None
         try:
             os.makedirs(self.extensions_dir, exist_ok=True)
             self.load_extensions()
-            self.update_extension_cache()
         except Exception as e:
             logger.error(f"Failed to initialize ExtensionManager: {str(e)}")
             self.browser.statusBar().showMessage(f"Extension init failed: {str(e)}", 5000)
 
     def load_extensions(self):
         try:
-            ext_files = glob.glob(f"{self.extensions_dir}/*.js")
-            self.extensions.clear()
-            self.display_names.clear()
-            for ext_file in ext_files:
-                ext_name = os.path.splitext(os.path.basename(ext_file))[0]
-                self.extensions[ext_name] = ext_file
-                display_name = self.get_extension_display_name(ext_file)
-                self.display_names[ext_name] = display_name
-                logger.info(f"Loaded extension: {ext_name} (Display: {display_name})")
-            self.validate_extensions()
+            found = {}
+            with os.scandir(self.extensions_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".js") and entry.is_file():
+                        stat = entry.stat()
+                        found[os.path.splitext(entry.name)[0]] = (entry.path, stat.st_mtime_ns, stat.st_size)
+            changed = False
+            for ext_name in set(self.metadata) - set(found):
+                del self.metadata[ext_name]
+                changed = True
+            for ext_name, (ext_path, mtime, size) in found.items():
+                cached = self.metadata.get(ext_name)
+                if cached and cached["mtime"] == mtime and cached["size"] == size:
+                    continue
+                changed = True
+                metadata = self.scan_extension(ext_name, ext_path, mtime, size)
+                if metadata:
+                    self.metadata[ext_name] = metadata
+                    logger.info(f"Loaded extension: {ext_name} (Display: {metadata['display_name']})")
+                else:
+                    self.metadata.pop(ext_name, None)
+            self.extensions = {ext_name: found[ext_name][0] for ext_name in self.metadata}
+            self.display_names = {ext_name: metadata["display_name"] for ext_name, metadata in self.metadata.items()}
+            for ext_name in set(self.sources) - set(self.extensions):
+                del self.sources[ext_name]
+                self.matcher.remove(ext_name)
+            if changed:
+                self.update_extension_cache()
+                self.sync_scripts()
+            self.update_watches()
         except Exception as e:
             logger.error(f"Failed to load extensions: {str(e)}")
 
-    def get_extension_display_name(self, ext_path):
+    def scan_extension(self, ext_name, ext_path, mtime, size):
         try:
             with open(ext_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("// @Name :"):
-                        return line[len("// @Name :"):].strip()
-            return os.path.splitext(os.path.basename(ext_path))[0]
+                js_code = f.read()
+            if not js_code.strip() or "malicious" in js_code.lower():
+                os.remove(ext_path)
+                logger.warning(f"Removed invalid or potentially malicious extension: {ext_name}")
+                return None
+            names = parse_extension_headers(js_code).get("name")
+            return {"mtime": mtime, "size": size, "display_name": names[0] if names and names[0] else ext_name}
         except Exception as e:
-            logger.error(f"Failed to read display name for {ext_path}: {str(e)}")
-            return os.path.splitext(os.path.basename(ext_path))[0]
+            logger.error(f"Failed to validate extension {ext_name}: {str(e)}")
+            return None
 
-    def validate_extensions(self):
-        for ext_name, ext_path in list(self.extensions.items()):
-            try:
-                with open(ext_path, "r", encoding="utf-8") as f:
-                    js_code = f.read()
-                    if not js_code.strip() or "malicious" in js_code.lower():
-                        del self.extensions[ext_name]
-                        del self.display_names[ext_name]
-                        os.remove(ext_path)
-                        logger.warning(f"Removed invalid or potentially malicious extension: {ext_name}")
-            except Exception as e:
-                logger.error(f"Failed to validate extension {ext_name}: {str(e)}")
-                del self.extensions[ext_name]
-                del self.display_names[ext_name]
+    def set_hot_reload(self, enabled):
+        if enabled and not self.watcher:
+            self.watcher = QFileSystemWatcher(self.browser)
+            self.reload_timer = QTimer(self.browser)
+            self.reload_timer.setSingleShot(True)
+            self.reload_timer.timeout.connect(self.load_extensions)
+            self.watcher.directoryChanged.connect(lambda _: self.reload_timer.start(300))
+            self.watcher.fileChanged.connect(lambda _: self.reload_timer.start(300))
+            self.update_watches()
+            logger.info("Extension hot reload enabled")
+        elif not enabled and self.watcher:
+            self.reload_timer.stop()
+            self.watcher.deleteLater()
+            self.reload_timer.deleteLater()
+            self.watcher = None
+            self.reload_timer = None
+            logger.info("Extension hot reload disabled")
+
+    def update_watches(self):
+        if not self.watcher:
+            return
+        wanted = {os.path.abspath(self.extensions_dir)} | {os.path.abspath(path) for path in self.extensions.values()}
+        watched = set(self.watcher.directories()) | set(self.watcher.files())
+        stale = list(watched - wanted)
+        missing = list(wanted - watched)
+        if stale:
+            self.watcher.removePaths(stale)
+        if missing:
+            self.watcher.addPaths(missing)
 
     def enable_extension(self, ext_name):
         try:
             if ext_name in self.extensions and self.extension_status.get(ext_name) != 'enabled':
                 self.extension_status[ext_name] = 'enabled'
+                self.profiler.forget(ext_name)
                 self.data_manager.set_extension_status(self.extension_status)
+                self.sync_scripts()
                 self.inject_extension(ext_name)
                 logger.info(f"Enabled extension: {ext_name}")
         except Exception as e:
@@ -84,82 +182,259 @@ class ExtensionManager:
             if ext_name in self.extension_status:
                 self.extension_status[ext_name] = 'disabled'
                 self.data_manager.set_extension_status(self.extension_status)
+                self.sync_scripts()
                 logger.info(f"Disabled extension: {ext_name}")
         except Exception as e:
             logger.error(f"Failed to disable extension {ext_name}: {str(e)}")
 
+    def fetch_extension(self, item, report=None):
+        report = report or (lambda status: None)
+        url = item["url"]
+        ext_name = extension_name_from_url(url)
+        if not ext_name:
+            raise ValueError(f"Cannot derive an extension name from {url}")
+        report("Downloading")
+        with get_client().stream(url) as response:
+            response.raise_for_status()
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data += chunk
+                if len(data) > MAX_EXTENSION_SIZE:
+                    raise ValueError("Extension exceeds the maximum size")
+        expected = (item.get("sha256") or "").strip().lower()
+        if expected:
+            report("Verifying")
+            digest = hashlib.sha256(data).hexdigest()
+            if digest != expected:
+                raise ValueError(f"Integrity check failed: expected {expected}, got {digest}")
+        bytes(data).decode("utf-8")
+        staging_dir = os.path.join(self.extensions_dir, ".staging")
+        os.makedirs(staging_dir, exist_ok=True)
+        staged_path = os.path.join(staging_dir, f"{ext_name}.{threading.get_ident()}.tmp")
+        with open(staged_path, "wb") as f:
+            f.write(data)
+        os.replace(staged_path, os.path.join(self.extensions_dir, f"{ext_name}.js"))
+        return ext_name
+
+    def install_extensions(self, items):
+        if self.watcher:
+            self.watcher.blockSignals(True)
+        worker = ExtensionInstallWorker(self, items)
+        worker.completed.connect(self.finish_install)
+        return worker
+
+    def finish_install(self, results):
+        self.load_extensions()
+        if self.watcher:
+            self.watcher.blockSignals(False)
+        installed = [ext_name for ext_name in results if ext_name and ext_name in self.extensions]
+        logger.info(f"Installed {len(installed)} of {len(results)} extensions")
+        return installed
+
     def download_extension(self, url):
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            ext_name = os.path.splitext(os.path.basename(url.split('?')[0]))[0]
-            ext_path = os.path.join(self.extensions_dir, f"{ext_name}.js")
-            with open(ext_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-            self.extensions[ext_name] = ext_path
-            display_name = self.get_extension_display_name(ext_path)
-            self.display_names[ext_name] = display_name
+            ext_name = self.fetch_extension({"url": url})
             self.load_extensions()
-            self.update_extension_cache()
-            logger.info(f"Downloaded extension: {ext_name} (Display: {display_name})")
+            if ext_name not in self.extensions:
+                return None
+            logger.info(f"Downloaded extension: {ext_name} (Display: {self.display_names[ext_name]})")
             return ext_name
         except Exception as e:
             logger.error(f"Failed to download extension from {url}: {str(e)}")
             return None
 
-    def fetch_store_extensions(self):
+    def refresh_store_catalog(self, force=False):
+        if self.catalog_worker and self.catalog_worker.isRunning():
+            return self.catalog_worker
+        if not force and not self.catalog.is_stale():
+            return None
+        self.catalog_worker = CatalogRefreshWorker(self.catalog, get_client())
+        self.catalog_worker.start()
+        return self.catalog_worker
+
+    def get_source(self, ext_name):
         try:
-            response = requests.get(f"{self.store_url}Add-On-Lists.js", timeout=10)
-            response.raise_for_status()
-            extensions = response.json()
-            self.cache_extensions(extensions)
-            return extensions
+            ext_path = self.extensions[ext_name]
+            mtime = os.stat(ext_path).st_mtime_ns
+            cached = self.sources.get(ext_name)
+            if cached and cached["mtime"] == mtime:
+                return cached
+            with open(ext_path, "r", encoding="utf-8") as f:
+                js_code = f.read()
+            headers = parse_extension_headers(js_code)
+            run_at = (headers.get("runat") or ["document-end"])[-1].lower()
+            world = (headers.get("world") or ["main"])[-1].lower()
+            if run_at not in INJECTION_POINTS:
+                logger.warning(f"Unknown @RunAt '{run_at}' in {ext_name}, using document-end")
+                run_at = "document-end"
+            if world not in WORLDS:
+                logger.warning(f"Unknown @World '{world}' in {ext_name}, using main")
+                world = "main"
+            self.sources[ext_name] = {"mtime": mtime, "code": js_code, "headers": headers, "run_at": run_at, "world": world}
+            self.matcher.add(ext_name, headers.get("match", []), headers.get("exclude", []))
+            return self.sources[ext_name]
         except Exception as e:
-            logger.error(f"Failed to fetch store extensions: {str(e)}")
-            return self.load_cached_extensions()
+            logger.error(f"Failed to read extension {ext_name}: {str(e)}")
+            self.sources.pop(ext_name, None)
+            self.matcher.remove(ext_name)
+            return None
+
+    def extensions_for_url(self, url):
+        return {ext_name for ext_name in self.matcher.match(url) if self.extension_status.get(ext_name) == 'enabled'}
 
-    def inject_extensions(self, browser):
+    def script_metadata(self, ext_name):
+        lines = [f"// @match {pattern.pattern}" for pattern in self.matcher.includes.get(ext_name, []) if pattern.pattern != ALL_URLS]
+        lines += [f"// @exclude {pattern.pattern}" for pattern in self.matcher.excludes.get(ext_name, [])]
+        if not lines:
+            return ""
+        return "\n".join(["// ==UserScript==", *lines, "// ==/UserScript==", ""])
+
+    def extension_source(self, ext_name, source):
+        world_id = WORLDS[source["world"]]
+        prelude = self.storage.prelude(ext_name, world_id)
+        if INJECTION_POINTS[source["run_at"]] == QWebEngineScript.DocumentCreation:
+            prelude = self.storage.bootstrap(ext_name, world_id) + prelude
+        js_code = self.profiler.instrument(ext_name, source["code"], world_id, prelude)
+        return f"{js_code}//# sourceURL={SCRIPT_PREFIX}{ext_name}\n"
+
+    def build_script(self, ext_name, source):
+        script = QWebEngineScript()
+        script.setName(f"{SCRIPT_PREFIX}{ext_name}")
+        script.setSourceCode(self.script_metadata(ext_name) + self.extension_source(ext_name, source))
+        script.setInjectionPoint(INJECTION_POINTS[source["run_at"]])
+        script.setWorldId(WORLDS[source["world"]])
+        script.setRunsOnSubFrames(False)
+        return script
+
+    def build_storage_script(self, ext_name, source):
+        if INJECTION_POINTS[source["run_at"]] == QWebEngineScript.DocumentCreation:
+            return None
+        script = QWebEngineScript()
+        script.setName(f"{STORAGE_SCRIPT_PREFIX}{ext_name}")
+        script.setSourceCode(self.script_metadata(ext_name) + self.storage.bootstrap(ext_name, WORLDS[source["world"]]))
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(WORLDS[source["world"]])
+        script.setRunsOnSubFrames(False)
+        return script
+
+    def register_profile(self, profile):
+        if any(known is profile for known in self.profiles):
+            return
+        self.profiles.append(profile)
+        bridge = self.profiler.bridge_script(STORAGE_BRIDGE_JS)
+        if bridge:
+            profile.scripts().insert(bridge)
+        self.sync_profile_scripts(profile)
+
+    def attach_page(self, page):
         try:
-            if not browser.settings().testAttribute(QWebEngineSettings.JavascriptEnabled):
-                logger.warning("JavaScript disabled, skipping extension injection")
-                return
-            for ext_name, ext_path in self.extensions.items():
+            self.profiler.attach_page(page)
+        except Exception as e:
+            logger.error(f"Failed to attach extension profiler: {str(e)}")
+
+    def on_over_budget(self, ext_name, cost, verified):
+        display_name = self.display_names.get(ext_name, ext_name)
+        if verified and getattr(self.browser, "extension_auto_disable", False):
+            self.disable_extension(ext_name)
+            self.browser.statusBar().showMessage(f"Disabled slow extension {display_name} ({cost:.0f} ms per page)", 5000)
+        else:
+            self.browser.statusBar().showMessage(f"Extension {display_name} is slowing pages down ({cost:.0f} ms per page)", 5000)
+
+    def sync_scripts(self):
+        for profile in self.profiles:
+            self.sync_profile_scripts(profile)
+
+    def sync_profile_scripts(self, profile):
+        try:
+            collection = profile.scripts()
+            installed = self.installed_scripts.setdefault(id(profile), {})
+            wanted = {}
+            for ext_name in self.extensions:
                 if self.extension_status.get(ext_name) == 'enabled':
-                    self.inject_extension(ext_name, browser)
+                    source = self.get_source(ext_name)
+                    if source and self.matcher.includes.get(ext_name):
+                        wanted[ext_name] = source
+            for ext_name, (mtime, script, storage_script) in list(installed.items()):
+                if ext_name not in wanted or wanted[ext_name]["mtime"] != mtime:
+                    collection.remove(script)
+                    if storage_script:
+                        collection.remove(storage_script)
+                    del installed[ext_name]
+            for ext_name, source in wanted.items():
+                if ext_name not in installed:
+                    script = self.build_script(ext_name, source)
+                    storage_script = self.build_storage_script(ext_name, source)
+                    if storage_script:
+                        collection.insert(storage_script)
+                    collection.insert(script)
+                    installed[ext_name] = (source["mtime"], script, storage_script)
+                    logger.info(f"Registered extension script: {ext_name} ({source['run_at']}, {source['world']} world)")
         except Exception as e:
-            logger.error(f"Failed to inject extensions: {str(e)}")
+            logger.error(f"Failed to update extension scripts: {str(e)}")
+
+    def refresh_storage_scripts(self, ext_names):
+        for profile in self.profiles:
+            try:
+                collection = profile.scripts()
+                installed = self.installed_scripts.get(id(profile), {})
+                for ext_name in ext_names:
+                    if ext_name not in installed or ext_name not in self.sources:
+                        continue
+                    mtime, script, storage_script = installed[ext_name]
+                    if storage_script:
+                        collection.remove(storage_script)
+                        storage_script = self.build_storage_script(ext_name, self.sources[ext_name])
+                        collection.insert(storage_script)
+                    else:
+                        collection.remove(script)
+                        script = self.build_script(ext_name, self.sources[ext_name])
+                        collection.insert(script)
+                    installed[ext_name] = (mtime, script, storage_script)
+            except Exception as e:
+                logger.error(f"Failed to refresh extension storage scripts: {str(e)}")
 
     def inject_extension(self, ext_name, browser=None):
         try:
             browser = browser or self.browser.tabs.currentWidget()
-            with open(self.extensions[ext_name], "r", encoding="utf-8") as f:
-                js_code = f.read()
-                browser.page().runJavaScript(js_code)
+            source = self.get_source(ext_name)
+            if browser and source and ext_name in self.matcher.match(browser.url().toString()):
+                world_id = WORLDS[source["world"]]
+                browser.page().runJavaScript(self.storage.bootstrap(ext_name, world_id), world_id)
+                browser.page().runJavaScript(self.extension_source(ext_name, source), world_id)
                 logger.info(f"Injected extension: {ext_name}")
         except Exception as e:
             logger.error(f"Failed to inject extension {ext_name}: {str(e)}")
 
     def update_extension_cache(self):
         try:
-            cache = {name: os.path.getmtime(path) for name, path in self.extensions.items()}
-            self.data_manager.set_extension_cache(cache)
+            self.data_manager.set_extension_cache({"files": self.metadata})
             logger.info("Updated extension cache")
         except Exception as e:
             logger.error(f"Failed to update extension cache: {str(e)}")
 
-    def cache_extensions(self, extensions):
-        try:
-            cache = self.data_manager.get_extension_cache()
-            cache["store"] = extensions
-            self.data_manager.set_extension_cache(cache)
-            logger.info("Cached store extensions")
-        except Exception as e:
-            logger.error(f"Failed to cache store extensions: {str(e)}")
 
-    def load_cached_extensions(self):
-        try:
-            cache = self.data_manager.get_extension_cache()
-            return cache.get("store", [])
-        except Exception as e:
-            logger.error(f"Failed to load cached extensions: {str(e)}")
-            return []
\ No newline at end of file
+class ExtensionInstallWorker(QThread):
+    item_status = pyqtSignal(int, str)
+    completed = pyqtSignal(list)
+
+    def __init__(self, manager, items):
+        super().__init__()
+        self.manager = manager
+        self.items = items
+
+    def run(self):
+        results = [None] * len(self.items)
+        client = get_client()
+        futures = {
+            client.submit(self.manager.fetch_extension, item, lambda status, index=index: self.item_status.emit(index, status)): index
+            for index, item in enumerate(self.items)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+                self.item_status.emit(index, "Installed")
+            except Exception as e:
+                logger.error(f"Failed to install extension from {self.items[index]['url']}: {str(e)}")
+                self.item_status.emit(index, f"Failed: {str(e)}")
+        self.completed.emit(results)
@@ -0,0 +1,442 @@
+import os
+import json
+import time
+import html
+import logging
+from html.parser import HTMLParser
+from PyQt5.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+ROOT_ID = 0
+
+class BookmarkStore:
+    def __init__(self, path="bookmarks.json", data_manager=None, journal_limit=1000):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.journal_limit = journal_limit
+        self.journal_lines = 0
+        self.nodes = {}
+        self.url_index = {}
+        self.next_id = 1
+        self.flat_cache = None
+        self.path_cache = {}
+        self._reset()
+        self.load()
+        if data_manager is not None:
+            self.migrate(data_manager)
+
+    def _reset(self):
+        self.nodes = {ROOT_ID: {"id": ROOT_ID, "type": "folder", "title": "Bookmarks", "parent": None, "children": []}}
+        self.url_index = {}
+        self.next_id = 1
+        self._invalidate()
+
+    def _invalidate(self):
+        self.flat_cache = None
+        self.path_cache = {}
+
+    def __len__(self):
+        return len(self.url_index)
+
+    def __contains__(self, url):
+        return url in self.url_index
+
+    def get(self, url):
+        node_id = self.url_index.get(url)
+        return self.nodes.get(node_id) if node_id is not None else None
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.next_id = data.get("next_id", 1)
+                for node in data.get("nodes", []):
+                    self.nodes[node["id"]] = node
+                    if node["type"] == "bookmark":
+                        self.url_index[node["url"]] = node["id"]
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            self._replay(json.loads(line))
+                            self.journal_lines += 1
+                        except ValueError:
+                            logger.warning(f"Skipping corrupt bookmark journal entry in {self.journal_path}")
+            if self.journal_lines > self.journal_limit:
+                self.compact()
+            logger.info(f"Loaded {len(self.url_index)} bookmarks from {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to load bookmarks: {str(e)}")
+
+    def migrate(self, data_manager):
+        try:
+            legacy = data_manager.get_bookmarks()
+            if not legacy:
+                return
+            for bookmark in legacy:
+                self.add_bookmark(bookmark.get("url", ""), bookmark.get("title", ""), journal=False)
+            self.compact()
+            data_manager.set_bookmarks([])
+            logger.info(f"Migrated {len(legacy)} bookmarks out of {data_manager.data_file}")
+        except Exception as e:
+            logger.error(f"Failed to migrate bookmarks: {str(e)}")
+
+    def compact(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "next_id": self.next_id, "nodes": list(self.nodes.values())}, f)
+            os.replace(tmp_path, self.path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_lines = 0
+        except Exception as e:
+            logger.error(f"Failed to save bookmarks: {str(e)}")
+
+    def _journal(self, op):
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(op) + "\n")
+            self.journal_lines += 1
+            if self.journal_lines > self.journal_limit:
+                self.compact()
+        except Exception as e:
+            logger.error(f"Failed to write bookmark journal: {str(e)}")
+
+    def _replay(self, op):
+        if op["op"] == "add":
+            node = op["node"]
+            self._insert(node)
+            self.next_id = max(self.next_id, node["id"] + 1)
+        elif op["op"] == "remove":
+            self._delete(op["id"])
+        elif op["op"] == "update":
+            node = self.nodes.get(op["id"])
+            if node:
+                self._update(node, op["fields"])
+        elif op["op"] == "clear":
+            self._reset()
+
+    def _insert(self, node):
+        parent = self.nodes.get(node["parent"]) or self.nodes[ROOT_ID]
+        node["parent"] = parent["id"]
+        self.nodes[node["id"]] = node
+        parent["children"].append(node["id"])
+        if node["type"] == "bookmark":
+            self.url_index[node["url"]] = node["id"]
+        self._invalidate()
+
+    def _delete(self, node_id):
+        node = self.nodes.pop(node_id, None)
+        if not node:
+            return
+        parent = self.nodes.get(node["parent"])
+        if parent:
+            parent["children"].remove(node_id)
+        if node["type"] == "bookmark":
+            self.url_index.pop(node["url"], None)
+        else:
+            for child_id in list(node["children"]):
+                node["children"].remove(child_id)
+                self.nodes[child_id]["parent"] = None
+                self._delete(child_id)
+        self._invalidate()
+
+    def _update(self, node, fields):
+        if "url" in fields and node["type"] == "bookmark":
+            self.url_index.pop(node["url"], None)
+            self.url_index[fields["url"]] = node["id"]
+        node.update(fields)
+        self._invalidate()
+
+    def add_bookmark(self, url, title, folder_id=ROOT_ID, tags=(), added=None, journal=True):
+        if not url or url in self.url_index:
+            return None
+        node = {
+            "id": self.next_id,
+            "type": "bookmark",
+            "url": url,
+            "title": title or url,
+            "parent": folder_id,
+            "tags": list(tags),
+            "added": added or int(time.time())
+        }
+        self.next_id += 1
+        self._insert(node)
+        if journal:
+            self._journal({"op": "add", "node": node})
+        return node["id"]
+
+    def add_folder(self, title, parent_id=ROOT_ID, added=None, journal=True):
+        node = {
+            "id": self.next_id,
+            "type": "folder",
+            "title": title,
+            "parent": parent_id,
+            "children": [],
+            "added": added or int(time.time())
+        }
+        self.next_id += 1
+        self._insert(node)
+        if journal:
+            self._journal({"op": "add", "node": node})
+        return node["id"]
+
+    def find_folder(self, title, parent_id=ROOT_ID):
+        for child_id in self.nodes[parent_id]["children"]:
+            child = self.nodes[child_id]
+            if child["type"] == "folder" and child["title"] == title:
+                return child_id
+        return None
+
+    def ensure_folder_path(self, path):
+        folder_id = ROOT_ID
+        for title in [part.strip() for part in path.split("/") if part.strip()]:
+            existing = self.find_folder(title, folder_id)
+            folder_id = existing if existing is not None else self.add_folder(title, folder_id)
+        return folder_id
+
+    def update(self, node_id, **fields):
+        node = self.nodes.get(node_id)
+        if not node:
+            return
+        if "url" in fields and fields["url"] != node.get("url") and fields["url"] in self.url_index:
+            raise ValueError(f"{fields['url']} is already bookmarked")
+        self._update(node, fields)
+        self._journal({"op": "update", "id": node_id, "fields": fields})
+
+    def remove(self, node_id):
+        if node_id == ROOT_ID or node_id not in self.nodes:
+            return
+        self._delete(node_id)
+        self._journal({"op": "remove", "id": node_id})
+
+    def remove_url(self, url):
+        node_id = self.url_index.get(url)
+        if node_id is not None:
+            self.remove(node_id)
+
+    def clear(self):
+        self._reset()
+        self.compact()
+
+    def folder_path(self, folder_id):
+        if folder_id in self.path_cache:
+            return self.path_cache[folder_id]
+        node = self.nodes.get(folder_id)
+        if not node or folder_id == ROOT_ID:
+            path = ""
+        else:
+            parent_path = self.folder_path(node["parent"])
+            path = f"{parent_path}/{node['title']}" if parent_path else node["title"]
+        self.path_cache[folder_id] = path
+        return path
+
+    def folders(self):
+        return [(node_id, self.folder_path(node_id)) for node_id, _ in self._walk(ROOT_ID, folders_only=True)]
+
+    def bookmarks(self):
+        if self.flat_cache is None:
+            self.flat_cache = [node for _, node in self._walk(ROOT_ID) if node["type"] == "bookmark"]
+        return self.flat_cache
+
+    def describe(self, bookmark):
+        folder = self.folder_path(bookmark["parent"])
+        tags = f" [{', '.join(bookmark['tags'])}]" if bookmark.get("tags") else ""
+        prefix = f"{folder} / " if folder else ""
+        return f"{prefix}{bookmark['title']} - {bookmark['url']}{tags}"
+
+    def _walk(self, folder_id, folders_only=False, depth=0):
+        stack = [(folder_id, depth)]
+        while stack:
+            node_id, level = stack.pop()
+            node = self.nodes[node_id]
+            if node["type"] == "folder":
+                yield level, node
+                children = [c for c in node["children"] if not folders_only or self.nodes[c]["type"] == "folder"]
+                stack.extend((child_id, level + 1) for child_id in reversed(children))
+            elif not folders_only:
+                yield level, node
+
+    def export_entries(self):
+        entries = []
+        stack = [(ROOT_ID, False)]
+        while stack:
+            node_id, closing = stack.pop()
+            if closing:
+                entries.append(("end",))
+                continue
+            node = self.nodes[node_id]
+            if node["type"] == "bookmark":
+                entries.append(("bookmark", node["url"], node["title"], node.get("added", 0), ",".join(node.get("tags", []))))
+                continue
+            if node_id != ROOT_ID:
+                entries.append(("folder", node["title"], node.get("added", 0)))
+            stack.append((node_id, True))
+            stack.extend((child_id, False) for child_id in reversed(node["children"]))
+        return entries
+
+    def begin_import(self, folder_id=ROOT_ID):
+        return BookmarkImport(self, folder_id)
+
+class BookmarkImport:
+    def __init__(self, store, folder_id):
+        self.store = store
+        self.stack = [folder_id]
+        self.added = 0
+        self.skipped = 0
+
+    def apply(self, events):
+        store = self.store
+        added_nodes = []
+        for event in events:
+            kind = event[0]
+            if kind == "folder":
+                _, title, added = event
+                existing = store.find_folder(title, self.stack[-1])
+                self.stack.append(existing if existing is not None else store.add_folder(title, self.stack[-1], added, journal=False))
+            elif kind == "end":
+                if len(self.stack) > 1:
+                    self.stack.pop()
+            elif kind == "bookmark":
+                _, url, title, added, tags = event
+                node_id = store.add_bookmark(url, title, self.stack[-1], tags, added, journal=False)
+                if node_id is None:
+                    self.skipped += 1
+                else:
+                    self.added += 1
+                    added_nodes.append(store.nodes[node_id])
+        return added_nodes
+
+    def finish(self):
+        self.store.compact()
+        return self.added
+
+class NetscapeBookmarkParser(HTMLParser):
+    def __init__(self, emit):
+        super().__init__(convert_charrefs=True)
+        self.emit = emit
+        self.text = None
+        self.current = None
+        self.pending_folder = None
+        self.open_lists = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k.lower(): v for k, v in attrs}
+        if tag == "a":
+            self.current = ("bookmark", attrs.get("href", ""), self._int(attrs.get("add_date")), attrs.get("tags", ""))
+            self.text = []
+        elif tag == "h3":
+            self.current = ("folder", self._int(attrs.get("add_date")))
+            self.text = []
+        elif tag == "dl":
+            opens_folder = self.pending_folder is not None and bool(self.open_lists)
+            if opens_folder:
+                self.emit(self.pending_folder)
+            self.open_lists.append(opens_folder)
+            self.pending_folder = None
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self.current and self.current[0] == "bookmark":
+            _, url, added, tags = self.current
+            if url and not url.lower().startswith(("javascript:", "place:")):
+                title = "".join(self.text).strip()
+                self.emit(("bookmark", url, title or url, added, [t.strip() for t in tags.split(",") if t.strip()]))
+            self.current = None
+            self.text = None
+        elif tag == "h3" and self.current and self.current[0] == "folder":
+            self.pending_folder = ("folder", "".join(self.text).strip() or "Untitled", self.current[1])
+            self.current = None
+            self.text = None
+        elif tag == "dl":
+            if self.open_lists and self.open_lists.pop():
+                self.emit(("end",))
+            self.pending_folder = None
+
+    def handle_data(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+    @staticmethod
+    def _int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+class BookmarkImportWorker(QThread):
+    batch = pyqtSignal(list)
+    progress = pyqtSignal(int, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, batch_size=500, chunk_size=64 * 1024):
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.pending = []
+
+    def _emit(self, event):
+        self.pending.append(event)
+        if len(self.pending) >= self.batch_size:
+            self.batch.emit(self.pending)
+            self.pending = []
+
+    def run(self):
+        try:
+            total = os.path.getsize(self.path)
+            parser = NetscapeBookmarkParser(self._emit)
+            read = 0
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                while not self.isInterruptionRequested():
+                    chunk = f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    parser.feed(chunk)
+                    read += len(chunk)
+                    self.progress.emit(min(read, total), total)
+            parser.close()
+            if self.pending:
+                self.batch.emit(self.pending)
+                self.pending = []
+        except Exception as e:
+            logger.error(f"Failed to import bookmarks from {self.path}: {str(e)}")
+            self.failed.emit(str(e))
+
+class BookmarkExportWorker(QThread):
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, entries):
+        super().__init__()
+        self.path = path
+        self.entries = entries
+
+    def run(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n")
+                f.write('<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
+                f.write("<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n")
+                depth = 1
+                for entry in self.entries:
+                    indent = "    " * depth
+                    if entry[0] == "folder":
+                        _, title, added = entry
+                        f.write(f'{indent}<DT><H3 ADD_DATE="{added or 0}">{html.escape(title)}</H3>\n{indent}<DL><p>\n')
+                        depth += 1
+                    elif entry[0] == "end":
+                        depth -= 1
+                        if depth >= 1:
+                            f.write(f"{'    ' * depth}</DL><p>\n")
+                    else:
+                        _, url, title, added, tags = entry
+                        tags_attr = f' TAGS="{html.escape(tags)}"' if tags else ""
+                        f.write(f'{indent}<DT><A HREF="{html.escape(url)}" ADD_DATE="{added or 0}"{tags_attr}>{html.escape(title)}</A>\n')
+                f.write("</DL><p>\n")
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to export bookmarks to {self.path}: {str(e)}")
+            self.failed.emit(str(e))
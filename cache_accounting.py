@@ -0,0 +1,192 @@
+import os
+import logging
+from collections import defaultdict
+from PyQt5.QtCore import QCoreApplication, QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ["http_cache", "storage", "service_workers", "other"]
+CATEGORY_LABELS = {"http_cache": "HTTP Cache", "storage": "Storage", "service_workers": "Service Workers", "other": "Other"}
+HTTP_CACHE_DIRS = {"Cache", "Code Cache", "GPUCache"}
+STORAGE_DIRS = {"Local Storage", "Session Storage", "IndexedDB", "databases", "File System", "blob_storage", "shared_proto_db", "WebStorage"}
+
+class CacheScanWorker(QObject):
+    scanned = pyqtSignal(dict, bool)
+
+    @pyqtSlot(list, bool)
+    def scan(self, directories, recursive):
+        results = {}
+        stack = list(directories)
+        while stack:
+            directory = stack.pop()
+            total = 0
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except FileNotFoundError:
+                results[directory] = None
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to scan {directory}: {str(e)}")
+                continue
+            results[directory] = (total, subdirs)
+            if recursive:
+                stack.extend(subdirs)
+        self.scanned.emit(results, recursive)
+
+class CacheAccountant(QObject):
+    totals_changed = pyqtSignal(dict)
+    scan_requested = pyqtSignal(list, bool)
+
+    def __init__(self, parent=None, reconcile_interval=120000, debounce_interval=500, max_watches=1024, paused=False):
+        super().__init__(parent)
+        self.paused = paused
+        self.roots = {}
+        self.dir_bytes = {}
+        self.dir_categories = {}
+        self.dirty = set()
+        self.totals = {}
+        self.max_watches = max_watches
+
+        self.thread = QThread(self)
+        self.worker = CacheScanWorker()
+        self.worker.moveToThread(self.thread)
+        self.scan_requested.connect(self.worker.scan)
+        self.worker.scanned.connect(self.on_scanned)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.start(QThread.LowPriority)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self.flush_dirty)
+        self.debounce_interval = debounce_interval
+
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self.refresh)
+        self.reconcile_timer.start(reconcile_interval)
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def add_profile(self, name, profile):
+        if profile.isOffTheRecord():
+            return
+        for path, kind in ((profile.cachePath(), "http_cache"), (profile.persistentStoragePath(), "storage")):
+            if path:
+                self.roots[os.path.realpath(path)] = (name, kind)
+        self.dir_categories.clear()
+        self.refresh()
+
+    def resume(self):
+        if self.paused:
+            self.paused = False
+            self.refresh()
+
+    def refresh(self):
+        if self.paused:
+            return
+        existing = [root for root in self.roots if os.path.isdir(root)]
+        if existing:
+            self.scan_requested.emit(existing, True)
+        else:
+            self.publish()
+
+    def classify(self, directory):
+        category = self.dir_categories.get(directory)
+        if category:
+            return category
+        root = max((r for r in self.roots if directory == r or directory.startswith(r + os.sep)), key=len, default=None)
+        if root is None:
+            return None
+        profile, kind = self.roots[root]
+        relative = os.path.relpath(directory, root)
+        first = relative.split(os.sep)[0]
+        if kind == "http_cache" or first in HTTP_CACHE_DIRS:
+            category = "http_cache"
+        elif first == "Service Worker":
+            category = "service_workers"
+        elif first in STORAGE_DIRS:
+            category = "storage"
+        else:
+            category = "other"
+        self.dir_categories[directory] = (profile, category)
+        return self.dir_categories[directory]
+
+    def on_scanned(self, results, full):
+        try:
+            if full:
+                self.dir_bytes = {directory: result[0] for directory, result in results.items() if result is not None}
+                new_dirs = []
+            else:
+                new_dirs = []
+                for directory, result in results.items():
+                    if result is None:
+                        self.forget(directory)
+                        continue
+                    total, subdirs = result
+                    self.dir_bytes[directory] = total
+                    present = set(subdirs)
+                    for child in [d for d in self.dir_bytes if os.path.dirname(d) == directory and d not in present]:
+                        self.forget(child)
+                    new_dirs.extend(subdir for subdir in subdirs if subdir not in self.dir_bytes)
+                if new_dirs:
+                    self.scan_requested.emit(new_dirs, True)
+            self.update_watches()
+            self.publish()
+        except Exception as e:
+            logger.error(f"Failed to update cache accounting: {str(e)}")
+
+    def forget(self, directory):
+        prefix = directory + os.sep
+        for known in [d for d in self.dir_bytes if d == directory or d.startswith(prefix)]:
+            del self.dir_bytes[known]
+            self.dir_categories.pop(known, None)
+
+    def update_watches(self):
+        watched = set(self.watcher.directories())
+        stale = [d for d in watched if d not in self.dir_bytes]
+        if stale:
+            self.watcher.removePaths(stale)
+        budget = self.max_watches - (len(watched) - len(stale))
+        if budget > 0:
+            missing = sorted((d for d in self.dir_bytes if d not in watched), key=len)[:budget]
+            if missing:
+                self.watcher.addPaths(missing)
+
+    def on_directory_changed(self, directory):
+        self.dirty.add(directory)
+        self.debounce_timer.start(self.debounce_interval)
+
+    def flush_dirty(self):
+        if self.dirty:
+            self.scan_requested.emit(list(self.dirty), False)
+            self.dirty.clear()
+
+    def publish(self):
+        totals = defaultdict(lambda: dict.fromkeys(CATEGORIES, 0))
+        for directory, size in self.dir_bytes.items():
+            classified = self.classify(directory)
+            if classified:
+                profile, category = classified
+                totals[profile][category] += size
+        for profile in {name for name, _ in self.roots.values()}:
+            totals[profile]
+        self.totals = {profile: dict(categories, total=sum(categories.values())) for profile, categories in totals.items()}
+        self.totals_changed.emit(self.totals)
+
+    def shutdown(self):
+        self.reconcile_timer.stop()
+        self.thread.quit()
+        self.thread.wait(2000)
@@ -0,0 +1,55 @@
+import re
+import logging
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_LIMIT = "250 MB"
+PRIVATE_CACHE_CAP = 64 * 1024 * 1024
+LIMIT_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(KB|MB|GB)?\s*$", re.IGNORECASE)
+UNITS = {"KB": 1024, "MB": 1024 * 1024, "GB": 1024 * 1024 * 1024}
+
+def parse_cache_limit(value):
+    if isinstance(value, (int, float)):
+        return max(0, int(value))
+    text = str(value or DEFAULT_CACHE_LIMIT).strip()
+    if text.lower() == "unlimited":
+        return 0
+    match = LIMIT_PATTERN.match(text)
+    if not match:
+        logger.warning(f"Unrecognised cache size limit {text!r}, using {DEFAULT_CACHE_LIMIT}")
+        return parse_cache_limit(DEFAULT_CACHE_LIMIT)
+    return int(float(match.group(1)) * UNITS[(match.group(2) or "MB").upper()])
+
+class CachePolicy:
+    def __init__(self, limit=DEFAULT_CACHE_LIMIT, private_cap=PRIVATE_CACHE_CAP):
+        self.limit = parse_cache_limit(limit)
+        self.private_cap = private_cap
+        self.profiles = []
+
+    def memory_limit(self):
+        return min(self.limit, self.private_cap) if self.limit else self.private_cap
+
+    def configure(self, profile):
+        if any(known is profile for known in self.profiles):
+            return
+        self.profiles.append(profile)
+        self.apply(profile)
+
+    def apply(self, profile):
+        try:
+            if profile.isOffTheRecord():
+                profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+                profile.setHttpCacheMaximumSize(self.memory_limit())
+            else:
+                profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+                profile.setHttpCacheMaximumSize(self.limit)
+        except Exception as e:
+            logger.error(f"Failed to apply cache policy: {str(e)}")
+
+    def set_limit(self, limit):
+        limit = parse_cache_limit(limit)
+        if limit != self.limit:
+            self.limit = limit
+            for profile in self.profiles:
+                self.apply(profile)
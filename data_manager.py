@@ -32,6 +32,15 @@ class DataManager:
                     "hardware_acceleration": True,
                     "preload_pages": False,
                     "cache_size_limit": "250 MB",
+                    "segmented_downloads": False,
+                    "max_active_downloads": 3,
+                    "download_rate_limit": 0,
+                    "download_postprocessing": {},
+                    "reading_list_prefetch": True,
+                    "reading_list_metered": False,
+                    "extension_hot_reload": True,
+                    "extension_budget_ms": 50,
+                    "extension_auto_disable": False,
                     "privacy_settings": {
                         "do_not_track": True,
                         "block_third_party_cookies": True,
@@ -59,12 +68,15 @@ class DataManager:
             self.save_data()  
 
     def _merge_data(self, default, loaded):
+        free_form = not default
         for key, value in loaded.items():
             if key in default:
                 if isinstance(value, dict) and isinstance(default[key], dict):
                     self._merge_data(default[key], value)
                 else:
                     default[key] = value
+            elif free_form:
+                default[key] = value
 
     def save_data(self):
         try:
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+import requests
+from requests.adapters import HTTPAdapter
+from PyQt5.QtCore import QThread, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".mojopart.json"
+PART_SUFFIX = ".mojopart"
+CHUNK_SIZE = 64 * 1024
+
+class RangeNotSatisfied(Exception):
+    pass
+
+class DownloadStopped(Exception):
+    pass
+
+def create_session(pool_size=8, user_agent=None):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+def find_journals(directory):
+    try:
+        return [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(JOURNAL_SUFFIX)]
+    except OSError:
+        return []
+
+class SegmentedDownload:
+    def __init__(self, url, path, session=None, segments=4, min_segment_size=4 * 1024 * 1024,
+                 expected_sha256=None, journal_interval=0.5, retries=3, timeout=30):
+        self.url = url
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.session = session or create_session(segments)
+        self.max_segments = segments
+        self.min_segment_size = min_segment_size
+        self.expected_sha256 = expected_sha256
+        self.journal_interval = journal_interval
+        self.retries = retries
+        self.timeout = timeout
+        self.total = None
+        self.validator = None
+        self.segments = []
+        self.throttles = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    @classmethod
+    def from_journal(cls, journal_path, session=None):
+        with open(journal_path, "r", encoding="utf-8") as f:
+            journal = json.load(f)
+        download = cls(journal["url"], journal["path"], session=session, segments=len(journal["segments"]) or 1,
+                       expected_sha256=journal.get("expected_sha256"))
+        download.total = journal["total"]
+        download.validator = journal.get("validator")
+        download.segments = journal["segments"]
+        return download
+
+    @property
+    def received(self):
+        with self.lock:
+            return sum(segment["done"] for segment in self.segments)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def probe(self):
+        response = self.session.get(self.url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout, allow_redirects=True)
+        try:
+            response.raise_for_status()
+            self.url = response.url
+            validator = response.headers.get("ETag")
+            if not validator or validator.startswith("W/"):
+                validator = response.headers.get("Last-Modified")
+            if response.status_code == 206 and "/" in response.headers.get("Content-Range", ""):
+                total = response.headers["Content-Range"].rsplit("/", 1)[1]
+                return (int(total) if total.isdigit() else None), validator, True
+            length = response.headers.get("Content-Length")
+            return (int(length) if length and length.isdigit() else None), validator, False
+        finally:
+            response.close()
+
+    def plan(self, ranged):
+        if not ranged or not self.total:
+            self.segments = [{"start": 0, "end": (self.total - 1) if self.total else None, "done": 0}]
+            return
+        count = max(1, min(self.max_segments, self.total // self.min_segment_size))
+        size = self.total // count
+        self.segments = []
+        for index in range(count):
+            start = index * size
+            end = self.total - 1 if index == count - 1 else start + size - 1
+            self.segments.append({"start": start, "end": end, "done": 0})
+
+    def preallocate(self):
+        with open(self.part_path, "wb") as f:
+            if self.total:
+                if hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, self.total)
+                        return
+                    except OSError:
+                        pass
+                f.truncate(self.total)
+
+    def write_journal(self):
+        with self.lock:
+            journal = {
+                "url": self.url,
+                "path": self.path,
+                "total": self.total,
+                "validator": self.validator,
+                "expected_sha256": self.expected_sha256,
+                "segments": [dict(segment) for segment in self.segments]
+            }
+        if os.path.exists(self.part_path):
+            fd = os.open(self.part_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(journal, f)
+        os.replace(tmp_path, self.journal_path)
+
+    def discard(self):
+        for path in (self.part_path, self.journal_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def fetch_segment(self, segment):
+        attempt = 0
+        while True:
+            try:
+                self._fetch_segment_once(segment)
+                return
+            except (DownloadStopped, RangeNotSatisfied):
+                raise
+            except (requests.RequestException, OSError) as e:
+                attempt += 1
+                if attempt > self.retries or self.stop_event.is_set():
+                    raise
+                logger.warning(f"Segment {segment['start']}-{segment['end']} of {self.url} failed ({str(e)}), retrying")
+                time.sleep(min(2 ** attempt, 10))
+
+    def _fetch_segment_once(self, segment):
+        end = segment["end"]
+        if end is None:
+            with self.lock:
+                segment["done"] = 0
+        offset = segment["start"] + segment["done"]
+        if end is not None and offset > end:
+            return
+        headers = {}
+        ranged = end is not None and (len(self.segments) > 1 or segment["done"] > 0)
+        if ranged:
+            headers["Range"] = f"bytes={offset}-{end}"
+            if self.validator:
+                headers["If-Range"] = self.validator
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if ranged and response.status_code != 206:
+                raise RangeNotSatisfied(f"Server ignored range request for {self.url}")
+            with open(self.part_path, "r+b", buffering=0) as f:
+                f.seek(offset)
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if self.stop_event.is_set():
+                        raise DownloadStopped()
+                    if end is not None:
+                        chunk = chunk[:end - offset + 1]
+                    f.write(chunk)
+                    offset += len(chunk)
+                    with self.lock:
+                        segment["done"] += len(chunk)
+                    for bucket in self.throttles:
+                        bucket.consume(len(chunk), self.stop_event)
+                    if end is not None and offset > end:
+                        break
+        if end is not None and offset <= end:
+            raise requests.ConnectionError(f"Connection closed at byte {offset} of segment ending at {end}")
+
+    def run(self, progress=None):
+        if self.segments and os.path.exists(self.part_path):
+            logger.info(f"Resuming {self.url} at {self.received} of {self.total} bytes")
+        else:
+            self.total, self.validator, ranged = self.probe()
+            self.plan(ranged)
+            self.preallocate()
+        self.write_journal()
+
+        try:
+            self._run_segments(progress)
+        except RangeNotSatisfied:
+            logger.warning(f"{self.url} changed on the server or lost range support, restarting")
+            self.stop_event.clear()
+            self.total, self.validator, ranged = self.probe()
+            self.plan(ranged)
+            self.preallocate()
+            self.write_journal()
+            self._run_segments(progress)
+
+        if self.segments[0]["end"] is None:
+            self.total = self.received
+        digest = self.checksum()
+        if self.expected_sha256 and digest.lower() != self.expected_sha256.lower():
+            self.discard()
+            raise ValueError(f"Checksum mismatch for {self.url}: expected {self.expected_sha256}, got {digest}")
+        os.replace(self.part_path, self.path)
+        os.remove(self.journal_path)
+        logger.info(f"Downloaded {self.url} to {self.path} ({self.total} bytes, sha256 {digest})")
+        return digest
+
+    def _run_segments(self, progress):
+        pending = [segment for segment in self.segments if segment["end"] is None or segment["start"] + segment["done"] <= segment["end"]]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = [executor.submit(self.fetch_segment, segment) for segment in pending]
+            try:
+                while True:
+                    done, not_done = wait(futures, timeout=self.journal_interval, return_when=FIRST_EXCEPTION)
+                    self.write_journal()
+                    if progress:
+                        progress(self.received, self.total or 0)
+                    for future in done:
+                        if future.exception():
+                            raise future.exception()
+                    if not not_done:
+                        break
+            except BaseException:
+                self.stop_event.set()
+                raise
+
+    def checksum(self):
+        sha256 = hashlib.sha256()
+        with open(self.part_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+class SegmentedDownloadThread(QThread):
+    progress = pyqtSignal("qint64", "qint64")
+    completed = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    paused = pyqtSignal()
+
+    def __init__(self, download):
+        super().__init__()
+        self.download = download
+        self.cancelled = False
+
+    def pause(self):
+        self.download.stop()
+
+    def cancel(self):
+        self.cancelled = True
+        self.download.stop()
+
+    def run(self):
+        self.download.stop_event.clear()
+        try:
+            digest = self.download.run(lambda received, total: self.progress.emit(received, total))
+            self.completed.emit(digest)
+        except DownloadStopped:
+            if self.cancelled:
+                self.download.discard()
+            else:
+                self.download.write_journal()
+                self.paused.emit()
+        except Exception as e:
+            logger.error(f"Failed to download {self.download.url}: {str(e)}")
+            self.failed.emit(str(e))
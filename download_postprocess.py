@@ -0,0 +1,228 @@
+import os
+import re
+import mmap
+import shutil
+import hashlib
+import logging
+import tarfile
+import zipfile
+from urllib.parse import urlsplit
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    "verify_checksum": True,
+    "auto_extract": False,
+    "move_rules_enabled": False,
+    "move_rules": {
+        ".pdf": "Documents", ".doc": "Documents", ".docx": "Documents", ".odt": "Documents", ".txt": "Documents",
+        ".jpg": "Pictures", ".jpeg": "Pictures", ".png": "Pictures", ".gif": "Pictures", ".webp": "Pictures",
+        ".mp3": "Music", ".flac": "Music", ".ogg": "Music",
+        ".mp4": "Videos", ".mkv": "Videos", ".webm": "Videos",
+        ".zip": "Archives", ".tar": "Archives", ".gz": "Archives", ".tgz": "Archives", ".xz": "Archives",
+        ".deb": "Installers", ".rpm": "Installers", ".appimage": "Installers", ".exe": "Installers", ".msi": "Installers", ".dmg": "Installers"
+    },
+    "max_extract_bytes": 8 * 1024 * 1024 * 1024
+}
+
+CHECKSUM_PATTERN = re.compile(r"(?:^|&)sha256[=:]([0-9a-fA-F]{64})(?:&|$)")
+HASH_CHUNK = 8 * 1024 * 1024
+
+class PostProcessError(Exception):
+    pass
+
+def expected_checksum(url):
+    match = CHECKSUM_PATTERN.search(urlsplit(url or "").fragment)
+    return match.group(1).lower() if match else None
+
+def sha256_file(path, report=None):
+    digest = hashlib.sha256()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        try:
+            if size == 0:
+                raise ValueError("empty file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(0, size, HASH_CHUNK):
+                    digest.update(mapped[offset:offset + HASH_CHUNK])
+                    if report:
+                        report(min(offset + HASH_CHUNK, size) * 100 // size)
+        except (ValueError, OSError):
+            f.seek(0)
+            digest = hashlib.sha256()
+            done = 0
+            for block in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(block)
+                done += len(block)
+                if report and size:
+                    report(done * 100 // size)
+    return digest.hexdigest()
+
+def unique_path(path):
+    if not os.path.exists(path):
+        return path
+    base, ext = os.path.splitext(path)
+    index = 1
+    while os.path.exists(f"{base} ({index}){ext}"):
+        index += 1
+    return f"{base} ({index}){ext}"
+
+def archive_stem(path):
+    name = os.path.basename(path)
+    for suffix in (".tar.gz", ".tar.bz2", ".tar.xz", ".tgz", ".zip", ".tar"):
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+def safe_target(root, member_name):
+    target = os.path.realpath(os.path.join(root, member_name))
+    if os.path.commonpath([root, target]) != root:
+        raise PostProcessError(f"Archive member escapes extraction folder: {member_name}")
+    return target
+
+def stage_hash(context, options, report):
+    if not context.get("sha256"):
+        context["sha256"] = sha256_file(context["path"], report)
+    return context["sha256"]
+
+def stage_verify(context, options, report):
+    expected = context.get("expected_sha256")
+    if not expected:
+        return "no checksum provided"
+    if context["sha256"] != expected:
+        raise PostProcessError(f"Checksum mismatch: expected {expected}, got {context['sha256']}")
+    return "checksum verified"
+
+def stage_extract(context, options, report):
+    path = context["path"]
+    if zipfile.is_zipfile(path):
+        return extract_zip(context, options, report)
+    if tarfile.is_tarfile(path):
+        return extract_tar(context, options, report)
+    return "not an archive"
+
+def extraction_root(path, names):
+    root = os.path.realpath(unique_path(os.path.join(os.path.dirname(path), archive_stem(path))))
+    targets = [safe_target(root, name) for name in names]
+    os.makedirs(root)
+    return root, targets
+
+def extract_zip(context, options, report):
+    with zipfile.ZipFile(context["path"]) as archive:
+        members = archive.infolist()
+        if sum(member.file_size for member in members) > options["max_extract_bytes"]:
+            raise PostProcessError("Archive expands beyond the extraction size limit")
+        root, targets = extraction_root(context["path"], [member.filename for member in members])
+        for index, (member, target) in enumerate(zip(members, targets)):
+            if member.is_dir():
+                os.makedirs(target, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.open(member) as source, open(target, "wb") as destination:
+                    shutil.copyfileobj(source, destination, 1024 * 1024)
+            report((index + 1) * 100 // max(len(members), 1))
+    context["extracted_to"] = root
+    return f"extracted {len(members)} entries to {root}"
+
+def extract_tar(context, options, report):
+    with tarfile.open(context["path"]) as archive:
+        members = [member for member in archive.getmembers() if member.isfile() or member.isdir()]
+        if sum(member.size for member in members) > options["max_extract_bytes"]:
+            raise PostProcessError("Archive expands beyond the extraction size limit")
+        root, targets = extraction_root(context["path"], [member.name for member in members])
+        for index, (member, target) in enumerate(zip(members, targets)):
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with archive.extractfile(member) as source, open(target, "wb") as destination:
+                    shutil.copyfileobj(source, destination, 1024 * 1024)
+            report((index + 1) * 100 // max(len(members), 1))
+    context["extracted_to"] = root
+    return f"extracted {len(members)} entries to {root}"
+
+def stage_move(context, options, report):
+    path = context["path"]
+    name = os.path.basename(path).lower()
+    folder = next((folder for ext, folder in options["move_rules"].items() if name.endswith(ext.lower())), None)
+    if not folder:
+        return "no matching rule"
+    directory = os.path.join(os.path.dirname(path), folder)
+    os.makedirs(directory, exist_ok=True)
+    destination = unique_path(os.path.join(directory, os.path.basename(path)))
+    shutil.move(path, destination)
+    context["path"] = destination
+    report(100)
+    return f"moved to {directory}"
+
+STAGES = {
+    "hash": ("Hashing", stage_hash),
+    "verify": ("Verifying", stage_verify),
+    "extract": ("Extracting", stage_extract),
+    "move": ("Moving", stage_move)
+}
+
+class PostProcessSignals(QObject):
+    progress = pyqtSignal(str, int)
+    stage_finished = pyqtSignal(str, str)
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str, str)
+
+class PostProcessTask(QRunnable):
+    def __init__(self, path, stages, options, sha256=None, expected_sha256=None):
+        super().__init__()
+        self.stages = stages
+        self.options = options
+        self.context = {"path": path, "sha256": sha256, "expected_sha256": expected_sha256}
+        self.signals = PostProcessSignals()
+
+    def run(self):
+        stage = None
+        try:
+            for stage in self.stages:
+                label, handler = STAGES[stage]
+                last = [-1]
+
+                def report(percent, label=label):
+                    if percent != last[0]:
+                        last[0] = percent
+                        self.signals.progress.emit(label, percent)
+
+                report(0)
+                detail = handler(self.context, self.options, report)
+                self.signals.stage_finished.emit(label, str(detail))
+            self.signals.finished.emit(dict(self.context))
+        except Exception as e:
+            logger.error(f"Post-processing of {self.context['path']} failed during {stage}: {str(e)}")
+            self.signals.failed.emit(STAGES[stage][0] if stage in STAGES else "", str(e))
+
+class PostProcessor(QObject):
+    def __init__(self, parent, options=None, max_threads=2):
+        super().__init__(parent)
+        self.options = dict(DEFAULT_OPTIONS)
+        self.options.update(options or {})
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+
+    def stages_for(self, expected_sha256):
+        stages = []
+        if self.options["verify_checksum"] or expected_sha256:
+            stages += ["hash", "verify"]
+        if self.options["auto_extract"]:
+            stages.append("extract")
+        if self.options["move_rules_enabled"]:
+            stages.append("move")
+        return stages
+
+    def submit(self, path, url=None, sha256=None):
+        expected_sha256 = expected_checksum(url)
+        stages = self.stages_for(expected_sha256)
+        if not stages or not os.path.isfile(path):
+            return None
+        task = PostProcessTask(path, stages, dict(self.options), sha256, expected_sha256)
+        self.pool.start(task)
+        return task.signals
+
+    def wait(self, timeout_ms=-1):
+        return self.pool.waitForDone(timeout_ms)
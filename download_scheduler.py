@@ -0,0 +1,254 @@
+import os
+import time
+import heapq
+import logging
+import threading
+from itertools import count
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWebEngineWidgets import QWebEngineDownloadItem
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"High": 0, "Normal": 1, "Low": 2}
+RATE_LIMITS = {"Unlimited": 0, "256 KB/s": 256 * 1024, "1 MB/s": 1024 * 1024, "5 MB/s": 5 * 1024 * 1024, "10 MB/s": 10 * 1024 * 1024}
+
+QUEUED = "queued"
+ACTIVE = "active"
+PAUSED = "paused"
+DONE = "done"
+
+class TokenBucket:
+    def __init__(self, rate=0, burst=None):
+        self.lock = threading.Lock()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        with self.lock:
+            self.rate = rate
+            self.capacity = burst or max(rate, 64 * 1024)
+            self.tokens = self.capacity
+            self.stamp = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def charge(self, amount):
+        with self.lock:
+            if self.rate <= 0:
+                return 0.0
+            self._refill()
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    def delay(self):
+        with self.lock:
+            if self.rate <= 0:
+                return 0.0
+            self._refill()
+            return max(0.0, -self.tokens / self.rate)
+
+    def consume(self, amount, stop_event=None):
+        wait = self.charge(amount)
+        if wait > 0:
+            if stop_event:
+                stop_event.wait(wait)
+            else:
+                time.sleep(wait)
+
+class DownloadJob(QObject):
+    state_changed = pyqtSignal(str)
+    done = pyqtSignal()
+
+    def __init__(self, name, priority=PRIORITIES["Normal"], rate_limit=0):
+        super().__init__()
+        self.name = name
+        self.priority = priority
+        self.bucket = TokenBucket(rate_limit)
+        self.state = QUEUED
+        self.sequence = 0
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.state_changed.emit(state)
+            if state == DONE:
+                self.done.emit()
+
+    def set_rate_limit(self, rate):
+        self.bucket.set_rate(rate)
+
+    def shape(self, global_bucket):
+        pass
+
+class WebEngineJob(DownloadJob):
+    def __init__(self, item, **kwargs):
+        super().__init__(item.suggestedFileName(), **kwargs)
+        self.item = item
+        self.last_received = item.receivedBytes()
+        self.throttled_until = 0
+        item.finished.connect(lambda: self.set_state(DONE))
+
+    def start(self):
+        self.last_received = self.item.receivedBytes()
+        self.throttled_until = 0
+        if self.item.isPaused() or self.item.state() == QWebEngineDownloadItem.DownloadInterrupted:
+            self.item.resume()
+
+    def pause(self):
+        if self.item.state() in (QWebEngineDownloadItem.DownloadRequested, QWebEngineDownloadItem.DownloadInProgress):
+            self.item.pause()
+
+    def shape(self, global_bucket):
+        now = time.monotonic()
+        if self.throttled_until:
+            if now >= self.throttled_until:
+                self.throttled_until = 0
+                self.last_received = self.item.receivedBytes()
+                self.item.resume()
+            return
+        received = self.item.receivedBytes()
+        delta = received - self.last_received
+        self.last_received = received
+        wait = max(self.bucket.charge(delta), global_bucket.charge(delta))
+        if wait > 0.05:
+            self.item.pause()
+            self.throttled_until = now + wait
+
+class SegmentedJob(DownloadJob):
+    def __init__(self, worker, global_bucket, **kwargs):
+        super().__init__(os.path.basename(worker.download.path), **kwargs)
+        self.worker = worker
+        worker.download.throttles = [self.bucket, global_bucket]
+        worker.completed.connect(lambda _: self.set_state(DONE))
+        worker.failed.connect(lambda _: self.set_state(DONE))
+        worker.finished.connect(self.on_worker_finished)
+
+    def on_worker_finished(self):
+        if self.state == ACTIVE and not self.worker.cancelled and os.path.exists(self.worker.download.journal_path):
+            self.worker.start()
+
+    def start(self):
+        if not self.worker.isRunning():
+            self.worker.start()
+
+    def pause(self):
+        if self.worker.isRunning():
+            self.worker.pause()
+
+    def cancel(self):
+        self.worker.cancel()
+        if not self.worker.isRunning():
+            self.worker.download.discard()
+        self.set_state(DONE)
+
+class DownloadScheduler(QObject):
+    def __init__(self, parent, max_active=3, global_rate=0):
+        super().__init__(parent)
+        self.max_active = max_active
+        self.global_bucket = TokenBucket(global_rate)
+        self.jobs = []
+        self.sequence = count()
+        self.shaping_timer = QTimer(self)
+        self.shaping_timer.timeout.connect(self.shape)
+
+    def submit(self, job):
+        job.sequence = next(self.sequence)
+        job.done.connect(lambda: self.on_job_done(job))
+        self.jobs.append(job)
+        job.pause()
+        job.set_state(QUEUED)
+        self.schedule()
+        return job
+
+    def active_jobs(self):
+        return [job for job in self.jobs if job.state == ACTIVE]
+
+    def schedule(self):
+        try:
+            active = self.active_jobs()
+            queued = [(job.priority, job.sequence, job) for job in self.jobs if job.state == QUEUED]
+            heapq.heapify(queued)
+            while queued and len(active) < self.max_active:
+                _, _, job = heapq.heappop(queued)
+                self._start(job)
+                active.append(job)
+            while queued and active:
+                lowest = max(active, key=lambda j: (j.priority, j.sequence))
+                if queued[0][0] >= lowest.priority:
+                    break
+                _, _, job = heapq.heappop(queued)
+                lowest.pause()
+                lowest.set_state(QUEUED)
+                active.remove(lowest)
+                self._start(job)
+                active.append(job)
+                logger.info(f"Preempted {lowest.name} for higher priority {job.name}")
+            while len(active) > self.max_active:
+                lowest = max(active, key=lambda j: (j.priority, j.sequence))
+                lowest.pause()
+                lowest.set_state(QUEUED)
+                active.remove(lowest)
+            self.update_shaping()
+        except Exception as e:
+            logger.error(f"Failed to schedule downloads: {str(e)}")
+
+    def _start(self, job):
+        job.set_state(ACTIVE)
+        job.start()
+
+    def pause(self, job):
+        if job.state in (QUEUED, ACTIVE):
+            job.pause()
+            job.set_state(PAUSED)
+            self.schedule()
+
+    def resume(self, job):
+        if job.state == PAUSED:
+            job.set_state(QUEUED)
+            self.schedule()
+
+    def pause_all(self):
+        for job in self.jobs:
+            if job.state in (QUEUED, ACTIVE):
+                job.pause()
+                job.set_state(PAUSED)
+        self.update_shaping()
+
+    def resume_all(self):
+        for job in self.jobs:
+            if job.state == PAUSED:
+                job.set_state(QUEUED)
+        self.schedule()
+
+    def set_priority(self, job, priority):
+        job.priority = priority
+        self.schedule()
+
+    def set_max_active(self, max_active):
+        self.max_active = max(1, max_active)
+        self.schedule()
+
+    def set_global_rate(self, rate):
+        self.global_bucket.set_rate(rate)
+        self.update_shaping()
+
+    def on_job_done(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+        self.schedule()
+
+    def update_shaping(self):
+        needs_shaping = any(
+            isinstance(job, WebEngineJob) and (job.bucket.rate > 0 or self.global_bucket.rate > 0)
+            for job in self.active_jobs()
+        )
+        if needs_shaping and not self.shaping_timer.isActive():
+            self.shaping_timer.start(100)
+        elif not needs_shaping and self.shaping_timer.isActive():
+            self.shaping_timer.stop()
+
+    def shape(self):
+        for job in self.active_jobs():
+            job.shape(self.global_bucket)
@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import logging
+from PyQt5.QtCore import QElapsedTimer
+
+logger = logging.getLogger(__name__)
+
+def format_rate(bytes_per_second):
+    if bytes_per_second is None:
+        return "-"
+    if bytes_per_second >= 1024 * 1024:
+        return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+    return f"{bytes_per_second / 1024:.1f} KB/s"
+
+def format_duration(seconds):
+    if seconds is None:
+        return "Calculating..."
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {(seconds % 3600) // 60}m"
+    return f"{seconds // 60}m {seconds % 60}s"
+
+def format_size(size):
+    if size is None or size < 0:
+        return "-"
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+class TransferMeter:
+    def __init__(self, received=0, half_life=3.0, refresh_interval_ms=250, warmup_ms=1000):
+        self.half_life = half_life
+        self.refresh_interval_ms = refresh_interval_ms
+        self.warmup_ms = warmup_ms
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.rate = None
+        self.received = received
+        self.total = -1
+        self.initial = received
+        self.sample_bytes = received
+        self.sample_ms = 0
+        self.active_ms = 0
+        self.active_since = 0
+        self.running = True
+        self.last_refresh = None
+
+    def update(self, received, total):
+        now = self.clock.elapsed()
+        self.received = received
+        self.total = total
+        if not self.running:
+            return False
+        elapsed_ms = now - self.sample_ms
+        if elapsed_ms >= 100:
+            instant = max(0, received - self.sample_bytes) * 1000.0 / elapsed_ms
+            if self.rate is None:
+                self.rate = instant
+            else:
+                alpha = 1.0 - 2.0 ** (-(elapsed_ms / 1000.0) / self.half_life)
+                self.rate += alpha * (instant - self.rate)
+            self.sample_bytes = received
+            self.sample_ms = now
+        if self.last_refresh is None or now - self.last_refresh >= self.refresh_interval_ms:
+            self.last_refresh = now
+            return True
+        return False
+
+    def pause(self):
+        if self.running:
+            self.active_ms += self.clock.elapsed() - self.active_since
+            self.running = False
+            self.rate = None
+
+    def resume(self, received=None):
+        if not self.running:
+            now = self.clock.elapsed()
+            self.running = True
+            self.active_since = now
+            self.sample_ms = now
+            self.sample_bytes = self.received if received is None else received
+            self.last_refresh = None
+
+    def active_seconds(self):
+        active_ms = self.active_ms
+        if self.running:
+            active_ms += self.clock.elapsed() - self.active_since
+        return active_ms / 1000.0
+
+    def average_rate(self):
+        seconds = self.active_seconds()
+        return (self.received - self.initial) / seconds if seconds > 0 else 0.0
+
+    def current_rate(self):
+        return self.rate if self.running else None
+
+    def eta(self):
+        rate = self.current_rate()
+        if not rate or self.total <= 0 or self.active_seconds() * 1000 < self.warmup_ms:
+            return None
+        return max(0, self.total - self.received) / rate
+
+class DownloadHistory:
+    def __init__(self, path="telemetry/downloads.jsonl", max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.line_count = None
+
+    def record(self, path, url, size, duration, average_rate, outcome, started=None):
+        entry = {
+            "path": path,
+            "url": url,
+            "size": size,
+            "duration": round(duration, 3),
+            "average_rate": round(average_rate, 1),
+            "outcome": outcome,
+            "started": round(started or (time.time() - duration), 3),
+            "finished": round(time.time(), 3)
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            if self.line_count is None:
+                self.line_count = sum(1 for _ in self._read_lines())
+            else:
+                self.line_count += 1
+            if self.line_count > 2 * self.max_entries:
+                self.compact()
+        except Exception as e:
+            logger.error(f"Failed to record download history: {str(e)}")
+        return entry
+
+    def _read_lines(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+    def entries(self):
+        for line in self._read_lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    def query(self, text=None, outcome=None, since=None, limit=None):
+        needle = (text or "").strip().lower()
+        results = []
+        try:
+            for entry in self.entries():
+                if outcome and entry.get("outcome") != outcome:
+                    continue
+                if since and entry.get("finished", 0) < since:
+                    continue
+                if needle and needle not in entry.get("path", "").lower() and needle not in entry.get("url", "").lower():
+                    continue
+                results.append(entry)
+        except Exception as e:
+            logger.error(f"Failed to read download history: {str(e)}")
+        results.reverse()
+        return results[:limit] if limit else results
+
+    def compact(self):
+        try:
+            kept = list(self._read_lines())[-self.max_entries:]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(kept)
+            os.replace(tmp_path, self.path)
+            self.line_count = len(kept)
+        except Exception as e:
+            logger.error(f"Failed to compact download history: {str(e)}")
+
+    def clear(self):
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.line_count = 0
+        except Exception as e:
+            logger.error(f"Failed to clear download history: {str(e)}")
@@ -0,0 +1,103 @@
+import re
+import logging
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+ALL_URLS = "<all_urls>"
+PATTERN = re.compile(r"^(\*|[a-z][a-z0-9+.-]*)://(\*|(?:\*\.)?[^/*:]+(?::\d+)?)?(/.*)$", re.IGNORECASE)
+WEB_SCHEMES = ("http", "https")
+
+class UrlPattern:
+    def __init__(self, pattern):
+        self.pattern = pattern.strip()
+        if self.pattern == ALL_URLS:
+            self.scheme, self.host, self.subdomains, self.path = "*", "*", False, None
+            return
+        match = PATTERN.match(self.pattern)
+        if not match:
+            raise ValueError(f"Invalid match pattern: {pattern}")
+        self.scheme = match.group(1).lower()
+        host = (match.group(2) or "").lower()
+        self.subdomains = host.startswith("*.")
+        self.host = host[2:] if self.subdomains else host
+        path = match.group(3)
+        self.path = None if path == "/*" else re.compile("^" + ".*".join(re.escape(part) for part in path.split("*")) + "$")
+
+    def matches(self, scheme, host, path):
+        if self.scheme == "*":
+            if scheme not in WEB_SCHEMES:
+                return False
+        elif self.scheme != scheme:
+            return False
+        if self.host != "*" and host != self.host and not (self.subdomains and host.endswith("." + self.host)):
+            return False
+        return self.path is None or bool(self.path.match(path))
+
+def split_url(url):
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return parts.scheme.lower(), (parts.hostname or "").lower(), path
+
+class ExtensionMatcher:
+    def __init__(self):
+        self.exact_hosts = defaultdict(set)
+        self.domain_hosts = defaultdict(set)
+        self.any_host = set()
+        self.includes = {}
+        self.excludes = {}
+
+    def add(self, ext_name, match_patterns, exclude_patterns):
+        self.remove(ext_name)
+        includes = self.compile(ext_name, match_patterns) if match_patterns else [UrlPattern(ALL_URLS)]
+        self.includes[ext_name] = includes
+        self.excludes[ext_name] = self.compile(ext_name, exclude_patterns)
+        for pattern in includes:
+            if pattern.host == "*":
+                self.any_host.add(ext_name)
+            elif pattern.subdomains:
+                self.domain_hosts[pattern.host].add(ext_name)
+            else:
+                self.exact_hosts[pattern.host].add(ext_name)
+
+    def compile(self, ext_name, patterns):
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(UrlPattern(pattern))
+            except ValueError as e:
+                logger.warning(f"Ignoring pattern in {ext_name}: {str(e)}")
+        return compiled
+
+    def remove(self, ext_name):
+        if self.includes.pop(ext_name, None) is None:
+            return
+        self.excludes.pop(ext_name, None)
+        self.any_host.discard(ext_name)
+        for index in (self.exact_hosts, self.domain_hosts):
+            for host in [host for host, names in index.items() if ext_name in names]:
+                index[host].discard(ext_name)
+                if not index[host]:
+                    del index[host]
+
+    def candidates(self, host):
+        names = set(self.any_host)
+        names |= self.exact_hosts.get(host, set())
+        labels = host.split(".")
+        for i in range(len(labels)):
+            names |= self.domain_hosts.get(".".join(labels[i:]), set())
+        return names
+
+    def match(self, url):
+        scheme, host, path = split_url(url)
+        matched = set()
+        for ext_name in self.candidates(host):
+            if not any(pattern.matches(scheme, host, path) for pattern in self.includes[ext_name]):
+                continue
+            if any(pattern.matches(scheme, host, path) for pattern in self.excludes[ext_name]):
+                continue
+            matched.add(ext_name)
+        return matched
@@ -0,0 +1,208 @@
+import re
+import json
+import secrets
+import logging
+from collections import defaultdict
+from PyQt5.QtCore import QObject, QFile, QIODevice, pyqtSignal, pyqtSlot
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+logger = logging.getLogger(__name__)
+
+BRIDGE_SCRIPT_NAME = "mojo-extension-bridge"
+MIN_SAMPLES = 5
+DIRECTIVE_PATTERN = re.compile(r"""(?:\s|//[^\n]*|/\*.*?\*/)*(?:"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')[ \t]*(?:;|(?=\n)|$)""", re.S)
+
+CHANNEL_JS = """
+var mojoChannel = {objects: null, pending: []};
+mojoChannel.ready = function(callback) {
+    if (mojoChannel.objects) callback(mojoChannel.objects);
+    else mojoChannel.pending.push(callback);
+};
+if (typeof qt !== "undefined" && qt.webChannelTransport) {
+    new QWebChannel(qt.webChannelTransport, function(channel) {
+        mojoChannel.objects = channel.objects;
+        mojoChannel.pending.splice(0).forEach(function(callback) { callback(channel.objects); });
+    });
+}
+"""
+
+COLLECTOR_JS = """
+(function() {
+    var recent = [], pending = [], started = {}, bridge = null, timer = null;
+    function flush() {
+        timer = null;
+        if (bridge && pending.length) {
+            bridge.report(JSON.stringify(pending));
+            pending = [];
+        }
+    }
+    function schedule() {
+        if (!timer) timer = setTimeout(flush, 1000);
+    }
+    function record(ext, start, end) {
+        if (typeof ext !== "string" || typeof start !== "number" || typeof end !== "number" || !(end >= start)) return;
+        var sample = {ext: ext, host: location.hostname, duration: end - start, start: start, end: end, long_tasks: 0, long_task_ms: 0};
+        recent.push(sample);
+        if (recent.length > 50) recent.shift();
+        pending.push(sample);
+        schedule();
+    }
+    function mark(entry) {
+        if (entry[1] === "start") {
+            started[entry[0]] = entry[2];
+        } else {
+            record(entry[0], started[entry[0]], entry[2]);
+            delete started[entry[0]];
+        }
+    }
+    var queued = Array.isArray(window.mojoExtensionTiming) ? window.mojoExtensionTiming : [];
+    Object.defineProperty(window, "mojoExtensionTiming", {value: Object.freeze({push: mark})});
+    queued.forEach(mark);
+    if (window.PerformanceObserver) {
+        try {
+            new PerformanceObserver(function(list) {
+                list.getEntries().forEach(function(entry) {
+                    var finish = entry.startTime + entry.duration;
+                    recent.forEach(function(sample) {
+                        if (sample.start < finish && sample.end > entry.startTime) {
+                            pending.push({ext: sample.ext, host: sample.host, duration: 0, long_tasks: 1, long_task_ms: entry.duration});
+                            schedule();
+                        }
+                    });
+                });
+            }).observe({entryTypes: ["longtask"]});
+        } catch (e) {}
+    }
+    mojoChannel.ready(function(objects) {
+        bridge = objects.mojoExtensionProfiler;
+        flush();
+    });
+    window.addEventListener("pagehide", flush);
+})();
+"""
+
+TIMING_MARK_JS = '(window.mojoExtensionTiming || (window.mojoExtensionTiming = [])).push([%s, "%s", performance.now()]);\n'
+
+def split_directives(js_code):
+    end = 0
+    while True:
+        match = DIRECTIVE_PATTERN.match(js_code, end)
+        if not match:
+            return js_code[:end], js_code[end:]
+        end = match.end()
+
+class ExtensionProfiler(QObject):
+    over_budget = pyqtSignal(str, float, bool)
+
+    def __init__(self, parent=None, budget_ms=50.0):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self.stats = defaultdict(lambda: defaultdict(lambda: {"runs": 0, "total_ms": 0.0, "max_ms": 0.0, "long_tasks": 0, "long_task_ms": 0.0}))
+        self.flagged = {}
+        self.tokens = {}
+        self.owners = {}
+        self.channel = QWebChannel(self)
+        self.channel.registerObject("mojoExtensionProfiler", self)
+        self.channel_library = None
+
+    def bridge_script(self, *sources):
+        if self.channel_library is None:
+            library = QFile(":/qtwebchannel/qwebchannel.js")
+            if not library.open(QIODevice.ReadOnly):
+                logger.error("Failed to load qwebchannel.js, extension bridge disabled")
+                self.channel_library = ""
+            else:
+                self.channel_library = bytes(library.readAll()).decode("utf-8")
+                library.close()
+        if not self.channel_library:
+            return None
+        script = QWebEngineScript()
+        script.setName(BRIDGE_SCRIPT_NAME)
+        script.setSourceCode("\n".join([self.channel_library, CHANNEL_JS, COLLECTOR_JS, *sources]))
+        script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+        script.setWorldId(QWebEngineScript.UserWorld)
+        script.setRunsOnSubFrames(False)
+        return script
+
+    def attach_page(self, page):
+        if page.webChannel() is not self.channel:
+            page.setWebChannel(self.channel, QWebEngineScript.UserWorld)
+
+    def token(self, ext_name):
+        if ext_name not in self.tokens:
+            token = secrets.token_hex(16)
+            self.tokens[ext_name] = token
+            self.owners[token] = ext_name
+        return self.tokens[ext_name]
+
+    def instrument(self, ext_name, js_code, world_id, prelude=""):
+        directives, body = split_directives(js_code)
+        if world_id != QWebEngineScript.UserWorld:
+            return f"{directives}\n;{prelude}{body}\n"
+        token = json.dumps(self.token(ext_name))
+        return f"{directives}\n;{prelude}{TIMING_MARK_JS % (token, 'start')}{body}\n;{TIMING_MARK_JS % (token, 'end')}"
+
+    @pyqtSlot(str)
+    def report(self, payload):
+        try:
+            for sample in json.loads(payload):
+                ext_name = self.owners.get(sample.get("ext"))
+                if not ext_name:
+                    continue
+                entry = self.stats[ext_name][str(sample.get("host") or "")]
+                duration = float(sample.get("duration", 0))
+                if duration:
+                    entry["runs"] += 1
+                    entry["total_ms"] += duration
+                    entry["max_ms"] = max(entry["max_ms"], duration)
+                entry["long_tasks"] += int(sample.get("long_tasks", 0))
+                entry["long_task_ms"] += float(sample.get("long_task_ms", 0))
+                self.check_budget(ext_name)
+        except Exception as e:
+            logger.error(f"Failed to record extension timing: {str(e)}")
+
+    def summary(self, ext_name):
+        hosts = self.stats.get(ext_name, {})
+        runs = sum(entry["runs"] for entry in hosts.values())
+        total_ms = sum(entry["total_ms"] for entry in hosts.values())
+        return {
+            "runs": runs,
+            "avg_ms": total_ms / runs if runs else 0.0,
+            "max_ms": max((entry["max_ms"] for entry in hosts.values()), default=0.0),
+            "long_tasks": sum(entry["long_tasks"] for entry in hosts.values()),
+            "long_task_ms": sum(entry["long_task_ms"] for entry in hosts.values())
+        }
+
+    def rows(self):
+        rows = []
+        for ext_name, hosts in self.stats.items():
+            for host, entry in hosts.items():
+                rows.append(dict(entry, ext=ext_name, host=host, avg_ms=entry["total_ms"] / entry["runs"] if entry["runs"] else 0.0))
+        return sorted(rows, key=lambda row: row["total_ms"] + row["long_task_ms"], reverse=True)
+
+    def check_budget(self, ext_name):
+        if self.flagged.get(ext_name) or self.budget_ms <= 0:
+            return
+        summary = self.summary(ext_name)
+        if summary["runs"] < MIN_SAMPLES:
+            return
+        if summary["avg_ms"] > self.budget_ms:
+            cost, verified = summary["avg_ms"], True
+        elif ext_name not in self.flagged:
+            cost, verified = summary["avg_ms"] + summary["long_task_ms"] / summary["runs"], False
+            if cost <= self.budget_ms:
+                return
+        else:
+            return
+        self.flagged[ext_name] = verified
+        logger.warning(f"Extension {ext_name} averages {cost:.1f} ms per page, over the {self.budget_ms:.0f} ms budget{'' if verified else ' (unverified)'}")
+        self.over_budget.emit(ext_name, cost, verified)
+
+    def forget(self, ext_name):
+        self.stats.pop(ext_name, None)
+        self.flagged.pop(ext_name, None)
+
+    def clear(self):
+        self.stats.clear()
+        self.flagged.clear()
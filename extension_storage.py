@@ -0,0 +1,280 @@
+import os
+import json
+import secrets
+import logging
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+logger = logging.getLogger(__name__)
+
+REQUEST_EVENT = "mojo-storage-request"
+CHANGE_EVENT_PREFIX = "mojo-storage:"
+SOURCE_PREFIX = "mojo-extension:"
+
+BRIDGE_JS = """
+(function() {
+    var queue = [], storage = null;
+    document.addEventListener("%(request)s", function(event) {
+        if (typeof event.detail !== "string") return;
+        if (storage) storage.page_request(event.detail);
+        else queue.push(event.detail);
+    }, true);
+    mojoChannel.ready(function(objects) {
+        storage = objects.mojoExtensionStorage;
+        if (!storage) return;
+        storage.page_changed.connect(function(ext_name, payload) {
+            document.dispatchEvent(new CustomEvent("%(prefix)s" + ext_name, {detail: payload}));
+        });
+        queue.splice(0).forEach(function(payload) { storage.page_request(payload); });
+    });
+})();
+""" % {"request": REQUEST_EVENT, "prefix": CHANGE_EVENT_PREFIX}
+
+TRANSPORTS = {
+    "direct": """
+    var channel = null, queue = [], connected = false;
+    function send(message) {
+        if (channel) channel.request(message);
+        else queue.push(message);
+    }
+    function listen() {}
+    function connect() {
+        if (connected || typeof mojoChannel === "undefined") return;
+        connected = true;
+        mojoChannel.ready(function(objects) {
+            channel = objects.mojoExtensionStorage;
+            if (!channel) return;
+            channel.changed.connect(function(name, payload) {
+                if (extensions[name]) extensions[name].apply(payload);
+            });
+            queue.splice(0).forEach(send);
+        });
+    }
+    connect();
+    setTimeout(connect, 0);
+""",
+    "page": """
+    function send(message) {
+        document.dispatchEvent(new CustomEvent("%(request)s", {detail: message}));
+    }
+    function listen(ext_name) {
+        document.addEventListener("%(prefix)s" + ext_name, function(event) { extensions[ext_name].apply(event.detail); }, true);
+    }
+""" % {"request": REQUEST_EVENT, "prefix": CHANGE_EVENT_PREFIX},
+    "none": """
+    function send() {
+        console.warn("mojo.storage changes are not saved from the application world");
+    }
+    function listen() {}
+"""
+}
+
+LIBRARY_JS = """(window.mojo || Object.defineProperty(window, "mojo", {value: (function() {
+    var extensions = {}, seeds = {};
+    function clone(value) { return value === undefined ? undefined : JSON.parse(JSON.stringify(value)); }
+%(transport)s
+    function open(token, ext_name) {
+        var cache = {}, written = {}, listeners = {};
+        function notify(key, value) {
+            (listeners[key] || []).concat(listeners["*"] || []).forEach(function(callback) {
+                try { callback(clone(value), key); } catch (e) { console.error(e); }
+            });
+        }
+        function request(op, key, value) {
+            written[key] = true;
+            send(JSON.stringify({token: token, op: op, key: key, value: value}));
+        }
+        var extension = {
+            seed: function(values) {
+                Object.keys(values).forEach(function(key) {
+                    if (key in written) return;
+                    cache[key] = clone(values[key]);
+                    notify(key, values[key]);
+                });
+            },
+            apply: function(payload) {
+                var change = JSON.parse(payload);
+                if (change.value === undefined || change.value === null) delete cache[change.key];
+                else cache[change.key] = change.value;
+                notify(change.key, change.value);
+            },
+            storage: Object.freeze({
+                get: function(key, fallback) { return key in cache ? clone(cache[key]) : fallback; },
+                set: function(key, value) { cache[key] = clone(value); request("set", String(key), value); },
+                remove: function(key) { delete cache[key]; request("remove", String(key)); },
+                keys: function() { return Object.keys(cache); },
+                subscribe: function(key, callback) {
+                    (listeners[key] = listeners[key] || []).push(callback);
+                    return function() { listeners[key] = (listeners[key] || []).filter(function(c) { return c !== callback; }); };
+                }
+            })
+        };
+        if (seeds[ext_name]) extension.seed(seeds[ext_name]);
+        return extension;
+    }
+    function caller() {
+        var limit = Error.stackTraceLimit, prepare = Error.prepareStackTrace;
+        Error.stackTraceLimit = 3;
+        Error.prepareStackTrace = undefined;
+        var frame = String(new Error().stack).split("\\n")[3] || "", found = null;
+        Error.stackTraceLimit = limit;
+        Error.prepareStackTrace = prepare;
+        Object.keys(extensions).forEach(function(ext_name) {
+            if (frame.indexOf("%(prefix)s" + ext_name + ":") !== -1 && (!found || ext_name.length > found.length)) found = ext_name;
+        });
+        return found;
+    }
+    return Object.freeze(Object.defineProperties({}, {
+        storage: {enumerable: true, get: function() {
+            var ext_name = caller();
+            if (!ext_name) throw new Error("mojo.storage is only available to extensions");
+            return extensions[ext_name].storage;
+        }},
+        register: {value: function(token, ext_name) {
+            if (!extensions[ext_name]) listen(ext_name);
+            extensions[ext_name] = open(token, ext_name);
+        }},
+        seed: {value: function(ext_name, values) {
+            seeds[ext_name] = values;
+            if (extensions[ext_name]) extensions[ext_name].seed(values);
+        }}
+    }));
+})()}).mojo)"""
+
+class ExtensionStorage(QObject):
+    changed = pyqtSignal(str, str)
+    page_changed = pyqtSignal(str, str)
+    flushed = pyqtSignal(list)
+
+    def __init__(self, parent=None, root="extension_storage", flush_interval=1000, quota=1024 * 1024):
+        super().__init__(parent)
+        self.root = root
+        self.quota = quota
+        self.data = {}
+        self.sizes = {}
+        self.tokens = {}
+        self.owners = {}
+        self.exposed = set()
+        self.dirty = set()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.flush)
+
+    def path(self, ext_name):
+        return os.path.join(self.root, f"{ext_name}.json")
+
+    def load(self, ext_name):
+        if ext_name not in self.data:
+            values = {}
+            try:
+                if os.path.exists(self.path(ext_name)):
+                    with open(self.path(ext_name), "r", encoding="utf-8") as f:
+                        values = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load storage for {ext_name}: {str(e)}")
+            self.data[ext_name] = values
+            self.sizes[ext_name] = {key: len(json.dumps(value)) for key, value in values.items()}
+        return self.data[ext_name]
+
+    def token(self, ext_name):
+        if ext_name not in self.tokens:
+            token = secrets.token_hex(16)
+            self.tokens[ext_name] = token
+            self.owners[token] = ext_name
+        return self.tokens[ext_name]
+
+    def revoke(self, ext_name):
+        self.owners.pop(self.tokens.pop(ext_name, None), None)
+
+    def library(self, world_id):
+        transport = {QWebEngineScript.UserWorld: "direct", QWebEngineScript.MainWorld: "page"}.get(world_id, "none")
+        return LIBRARY_JS % {"transport": TRANSPORTS[transport], "prefix": SOURCE_PREFIX}
+
+    def prelude(self, ext_name, world_id):
+        if world_id == QWebEngineScript.UserWorld:
+            if ext_name in self.exposed:
+                self.exposed.discard(ext_name)
+                self.revoke(ext_name)
+            token = self.token(ext_name)
+        elif world_id == QWebEngineScript.MainWorld:
+            self.exposed.add(ext_name)
+            token = self.token(ext_name)
+        else:
+            token = None
+        return f"{self.library(world_id)}.register({json.dumps(token)}, {json.dumps(ext_name)});\n"
+
+    def bootstrap(self, ext_name, world_id):
+        return f"{self.library(world_id)}.seed({json.dumps(ext_name)}, {json.dumps(self.load(ext_name))});\n"
+
+    def notify(self, ext_name, key, value):
+        payload = json.dumps({"key": key, "value": value})
+        self.changed.emit(ext_name, payload)
+        if ext_name in self.exposed:
+            self.page_changed.emit(ext_name, payload)
+
+    @pyqtSlot(str)
+    def request(self, payload):
+        self.handle(payload, page=False)
+
+    @pyqtSlot(str)
+    def page_request(self, payload):
+        self.handle(payload, page=True)
+
+    def handle(self, payload, page):
+        try:
+            message = json.loads(payload)
+            ext_name = self.owners.get(message.get("token"))
+            if not ext_name or (page and ext_name not in self.exposed):
+                logger.warning("Rejected extension storage request with an unknown token")
+                return
+            key = str(message["key"])
+            values = self.load(ext_name)
+            sizes = self.sizes[ext_name]
+            if message.get("op") == "set":
+                value = message.get("value")
+                size = len(json.dumps(value))
+                if sum(sizes.values()) - sizes.get(key, 0) + size > self.quota:
+                    logger.warning(f"Extension {ext_name} exceeded its {self.quota} byte storage quota")
+                    self.notify(ext_name, key, values.get(key))
+                    return
+                values[key] = value
+                sizes[key] = size
+            elif message.get("op") == "remove":
+                values.pop(key, None)
+                sizes.pop(key, None)
+            else:
+                return
+            self.dirty.add(ext_name)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+            self.notify(ext_name, key, values.get(key))
+        except Exception as e:
+            logger.error(f"Failed to handle extension storage request: {str(e)}")
+
+    def flush(self):
+        if not self.dirty:
+            return
+        written = []
+        os.makedirs(self.root, exist_ok=True)
+        for ext_name in sorted(self.dirty):
+            try:
+                tmp_path = f"{self.path(ext_name)}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self.data[ext_name], f)
+                os.replace(tmp_path, self.path(ext_name))
+                written.append(ext_name)
+            except Exception as e:
+                logger.error(f"Failed to persist storage for {ext_name}: {str(e)}")
+        self.dirty.difference_update(written)
+        if written:
+            self.flushed.emit(written)
+
+    def clear(self, ext_name):
+        self.data[ext_name] = {}
+        self.sizes[ext_name] = {}
+        self.dirty.add(ext_name)
+        self.flush()
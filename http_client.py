@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+class HttpResponse:
+    def __init__(self, url, status_code, headers, content, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        content_type = self.headers.get("Content-Type", "")
+        charset = "utf-8"
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset" and value:
+                charset = value.strip('"')
+        try:
+            return self.content.decode(charset, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error for {self.url}")
+
+class ResponseCache:
+    def __init__(self, root="http_cache"):
+        self.root = root
+        self.lock = threading.Lock()
+
+    def paths(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.root, digest[:2], digest[2:])
+        return f"{base}.json", f"{base}.body"
+
+    def load(self, url):
+        meta_path, body_path = self.paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                content = f.read()
+            if meta.get("url") != url or meta.get("size") != len(content):
+                return None
+            return meta, content
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {str(e)}")
+            return None
+
+    def write(self, path, data, mode):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def store(self, url, headers, content):
+        meta_path, body_path = self.paths(url)
+        meta = {
+            "url": url,
+            "fetched": time.time(),
+            "size": len(content),
+            "headers": {key: headers[key] for key in CACHED_HEADERS if key in headers}
+        }
+        try:
+            with self.lock:
+                os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+                self.write(body_path, content, "wb")
+                self.write(meta_path, json.dumps(meta), "w")
+        except Exception as e:
+            logger.error(f"Failed to cache response for {url}: {str(e)}")
+        return meta
+
+    def touch(self, url, meta):
+        meta["fetched"] = time.time()
+        try:
+            with self.lock:
+                self.write(self.paths(url)[0], json.dumps(meta), "w")
+        except Exception as e:
+            logger.error(f"Failed to refresh cache entry for {url}: {str(e)}")
+
+class HttpClient:
+    def __init__(self, cache_dir="http_cache", pool_size=8, retries=3, backoff=0.5, timeout=10, workers=4):
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries, connect=retries, read=retries, status=retries,
+            backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(("GET", "HEAD")), raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+        self.proxies = {}
+        self.cache = ResponseCache(cache_dir)
+        self.workers = workers
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def set_user_agent(self, user_agent):
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+
+    def set_proxy(self, proxy):
+        self.proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"} if proxy else {}
+        logger.info(f"HTTP client proxy set to {proxy or 'direct'}")
+
+    def stream(self, url, headers=None, timeout=None):
+        return self.session.get(url, headers=headers, timeout=timeout or self.timeout, proxies=self.proxies, stream=True)
+
+    def fetch(self, url, headers=None, cache=False, max_age=0, timeout=None):
+        headers = dict(headers or {})
+        cached = self.cache.load(url) if cache else None
+        if cached:
+            meta, content = cached
+            if max_age and time.time() - meta.get("fetched", 0) < max_age:
+                return HttpResponse(url, 200, meta["headers"], content, from_cache=True)
+            if meta["headers"].get("ETag"):
+                headers.setdefault("If-None-Match", meta["headers"]["ETag"])
+            if meta["headers"].get("Last-Modified"):
+                headers.setdefault("If-Modified-Since", meta["headers"]["Last-Modified"])
+        with self.session.get(url, headers=headers, timeout=timeout or self.timeout, proxies=self.proxies) as response:
+            if cached and response.status_code == 304:
+                self.cache.touch(url, meta)
+                return HttpResponse(url, 200, meta["headers"], content, from_cache=True)
+            result = HttpResponse(response.url, response.status_code, response.headers, response.content)
+        if cache and result.status_code == 200:
+            self.cache.store(url, result.headers, result.content)
+        return result
+
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mojo-http")
+            return self.executor.submit(fn, *args, **kwargs)
+
+    def fetch_async(self, url, **kwargs):
+        return self.submit(self.fetch, url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,123 @@
+import logging
+from bisect import bisect_left
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+logger = logging.getLogger(__name__)
+
+class PagedListModel(QAbstractListModel):
+    def __init__(self, rows, display, page_size=200, parent=None):
+        super().__init__(parent)
+        self.rows = rows
+        self.display = display
+        self.page_size = page_size
+        self.loaded = min(page_size, len(rows))
+        self.matches = None
+        self.filter_text = ""
+        self.haystacks = None
+
+    def total(self):
+        return len(self.matches) if self.matches is not None else len(self.rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < self.total()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.page_size, self.total() - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def source_row(self, row):
+        return self.matches[row] if self.matches is not None else row
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        item = self.rows[self.source_row(index.row())]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self.display(item)
+        if role == Qt.UserRole:
+            return item
+        return None
+
+    def set_filter(self, text):
+        needle = text.strip().lower()
+        self.beginResetModel()
+        try:
+            if not needle:
+                self.matches = None
+            else:
+                if self.haystacks is None:
+                    self.haystacks = [self.display(item).lower() for item in self.rows]
+                if self.matches is not None and self.filter_text and needle.startswith(self.filter_text):
+                    candidates = self.matches
+                else:
+                    candidates = range(len(self.rows))
+                haystacks = self.haystacks
+                self.matches = [i for i in candidates if needle in haystacks[i]]
+            self.filter_text = needle
+            self.loaded = min(self.page_size, self.total())
+        except Exception as e:
+            logger.error(f"Failed to filter list: {str(e)}")
+            self.matches = None
+            self.loaded = min(self.page_size, self.total())
+        finally:
+            self.endResetModel()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.haystacks = None
+        self.matches = None
+        self.loaded = min(self.page_size, len(rows))
+        self.endResetModel()
+        if self.filter_text:
+            text, self.filter_text = self.filter_text, ""
+            self.set_filter(text)
+
+    def remove_row(self, row):
+        if row < 0 or row >= self.loaded:
+            return None
+        source = self.source_row(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self.rows.pop(source)
+        if self.haystacks is not None:
+            del self.haystacks[source]
+        if self.matches is not None:
+            del self.matches[row]
+            for i in range(row, len(self.matches)):
+                self.matches[i] -= 1
+        self.loaded -= 1
+        self.endRemoveRows()
+        return item
+
+    def remove_item(self, item):
+        removed = 0
+        for source in reversed([i for i, row in enumerate(self.rows) if row == item]):
+            if self.matches is None:
+                row = source
+            else:
+                row = bisect_left(self.matches, source)
+                if row >= len(self.matches) or self.matches[row] != source:
+                    row = None
+            if row is not None and row < self.loaded:
+                self.remove_row(row)
+            else:
+                self.rows.pop(source)
+                if self.haystacks is not None:
+                    del self.haystacks[source]
+                if self.matches is not None:
+                    start = bisect_left(self.matches, source)
+                    if row is not None:
+                        del self.matches[row]
+                    for i in range(start, len(self.matches)):
+                        self.matches[i] -= 1
+            removed += 1
+        return removed
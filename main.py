@@ -2,22 +2,41 @@ import sys
 import json
 import os
 import re
+import time
+from startup import STARTUP_ORIGIN, StartupTimer, FirstPaintWatcher, DEFERRED, parse_startup_args
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QLineEdit,
     QPushButton, QHBoxLayout, QLabel, QComboBox, QDialog, QFormLayout, QTabWidget, QTextEdit, QCheckBox,
     QFileDialog, QMessageBox, QListWidget, QListWidgetItem, QToolBar, QStatusBar,
     QAction, QStyle, QSizePolicy, QSpacerItem, QScrollArea, QInputDialog, QMenu, QSystemTrayIcon,
-    QProgressBar, QDialogButtonBox
+    QProgressBar, QDialogButtonBox, QTableWidget, QTableWidgetItem, QHeaderView, QCompleter, QListView, QSpinBox
 )
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile, QWebEnginePage, QWebEngineSettings, QWebEngineDownloadItem
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
-from PyQt5.QtCore import QUrl, Qt, QSize, QTimer, QEvent, QRect, QDir
+from PyQt5.QtCore import QUrl, Qt, QSize, QTimer, QEvent, QRect, QDir, QStringListModel
 from PyQt5.QtGui import QIcon, QKeySequence, QFont, QPalette, QColor, QDesktopServices
 import requests
 
 from addon import ExtensionManager
 from MojoPrivacy import PrivacyEngine, PrivacyPage, initialize_privacy
 from data_manager import DataManager
+from tab_session import ClosedTabStack
+from telemetry import NavigationTelemetry
+from preloader import PredictiveLoader
+from omnibox import FrecencyIndex
+from list_models import PagedListModel
+from store_catalog import StoreCatalogModel, StoreItemDelegate
+from http_client import get_client
+from reader_mode import ReaderMode
+from reading_list import ReadingList, ReadingListPrefetcher, READY, SAVING
+from bookmarks import BookmarkStore, BookmarkImportWorker, BookmarkExportWorker
+from download_engine import SegmentedDownload, SegmentedDownloadThread, create_session, find_journals
+from download_stats import TransferMeter, DownloadHistory, format_rate, format_duration, format_size
+from cache_policy import CachePolicy
+from cache_accounting import CacheAccountant, CATEGORIES, CATEGORY_LABELS
+from offline_archive import OfflineArchive, ArchiveSchemeHandler, ArchiveWorker, ArchiveMaintenanceWorker, ARCHIVE_SCHEME, READER_FORMAT, register_archive_scheme
+from download_postprocess import PostProcessor, expected_checksum
+from download_scheduler import DownloadScheduler, WebEngineJob, SegmentedJob, PRIORITIES, RATE_LIMITS, QUEUED, ACTIVE, PAUSED
 
 PRIMARY_COLOR = "#3B82F6"
 SECONDARY_COLOR = "#475569"
@@ -35,15 +54,19 @@ BUTTON_BORDER_RADIUS = "5px"
 BUTTON_HOVER_COLOR = "#60A5FA"
 BUTTON_PRESSED_COLOR = "#2563EB"
 
+SEGMENTED_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+
 UI_FONT = QFont("Nunito", 13)
 FALLBACK_FONT = QFont("Arial", 13)
 
 class ExtensionsDialog(QDialog):
+    PERFORMANCE_COLUMNS = [("Extension", "ext"), ("Host", "host"), ("Runs", "runs"), ("Avg ms", "avg_ms"), ("Max ms", "max_ms"), ("Long Tasks", "long_tasks"), ("Long Task ms", "long_task_ms")]
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.setWindowTitle("Extensions")
-        self.setGeometry(300, 300, 450, 350)
+        self.setGeometry(300, 300, 640, 560)
         self.setFont(UI_FONT)
 
         layout = QVBoxLayout()
@@ -61,6 +84,46 @@ class ExtensionsDialog(QDialog):
             self.extensions_list.addItem(item)
         layout.addWidget(self.extensions_list)
 
+        self.hot_reload_checkbox = QCheckBox("Reload extensions when their files change")
+        self.hot_reload_checkbox.setStyleSheet(self.parent.get_checkbox_style())
+        self.hot_reload_checkbox.setChecked(self.parent.extension_hot_reload)
+        self.hot_reload_checkbox.toggled.connect(self.set_hot_reload)
+        layout.addWidget(self.hot_reload_checkbox)
+
+        performance_label = QLabel("Performance")
+        performance_label.setStyleSheet(self.parent.get_label_style())
+        layout.addWidget(performance_label)
+
+        self.performance_table = QTableWidget(0, len(self.PERFORMANCE_COLUMNS))
+        self.performance_table.setHorizontalHeaderLabels([title for title, _ in self.PERFORMANCE_COLUMNS])
+        self.performance_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.performance_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.performance_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.performance_table)
+
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("Budget per page:"))
+        self.budget_spinbox = QSpinBox()
+        self.budget_spinbox.setRange(0, 10000)
+        self.budget_spinbox.setSuffix(" ms")
+        self.budget_spinbox.setSpecialValueText("Off")
+        self.budget_spinbox.setStyleSheet(self.parent.get_input_style())
+        self.budget_spinbox.setValue(self.parent.extension_budget_ms)
+        self.budget_spinbox.valueChanged.connect(self.set_budget)
+        budget_layout.addWidget(self.budget_spinbox)
+        self.auto_disable_checkbox = QCheckBox("Disable extensions over budget")
+        self.auto_disable_checkbox.setStyleSheet(self.parent.get_checkbox_style())
+        self.auto_disable_checkbox.setChecked(self.parent.extension_auto_disable)
+        self.auto_disable_checkbox.toggled.connect(self.set_auto_disable)
+        budget_layout.addWidget(self.auto_disable_checkbox)
+        budget_layout.addStretch()
+        refresh_button = QPushButton("Refresh")
+        refresh_button.setStyleSheet(self.parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        refresh_button.clicked.connect(self.populate_performance)
+        budget_layout.addWidget(refresh_button)
+        layout.addLayout(budget_layout)
+        self.populate_performance()
+
         buttons_layout = QHBoxLayout()
         enable_button = QPushButton("Enable")
         enable_button.setStyleSheet(self.parent.get_button_style(PRIMARY_COLOR, BUTTON_HOVER_COLOR, BUTTON_PRESSED_COLOR))
@@ -88,6 +151,38 @@ class ExtensionsDialog(QDialog):
 
         self.setLayout(layout)
 
+    def populate_performance(self):
+        manager = self.parent.extension_manager
+        rows = manager.profiler.rows()
+        self.performance_table.setSortingEnabled(False)
+        self.performance_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.PERFORMANCE_COLUMNS):
+                value = row[key]
+                item = QTableWidgetItem()
+                if key == "ext":
+                    item.setData(Qt.DisplayRole, manager.display_names.get(value, value))
+                elif isinstance(value, float):
+                    item.setData(Qt.DisplayRole, round(value, 1))
+                else:
+                    item.setData(Qt.DisplayRole, value)
+                self.performance_table.setItem(r, c, item)
+        self.performance_table.setSortingEnabled(True)
+
+    def set_budget(self, value):
+        self.parent.extension_budget_ms = value
+        self.parent.extension_manager.profiler.budget_ms = value
+        self.parent.settings_persistence.save_settings()
+
+    def set_auto_disable(self, enabled):
+        self.parent.extension_auto_disable = enabled
+        self.parent.settings_persistence.save_settings()
+
+    def set_hot_reload(self, enabled):
+        self.parent.extension_hot_reload = enabled
+        self.parent.extension_manager.set_hot_reload(enabled)
+        self.parent.settings_persistence.save_settings()
+
     def enable_selected_extension(self):
         selected = self.extensions_list.currentItem()
         if selected and selected.checkState() != Qt.Checked:
@@ -105,88 +200,122 @@ class ExtensionsDialog(QDialog):
     def download_extension(self):
         url, ok = QInputDialog.getText(self, "Download Extension", "Enter the URL of the .js extension:")
         if ok and url:
-            ext_name = self.parent.extension_manager.download_extension(url)
-            if ext_name:
-                display_name = self.parent.extension_manager.display_names.get(ext_name, ext_name)
-                item = QListWidgetItem(display_name)
-                item.setData(Qt.UserRole, ext_name)
-                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-                item.setCheckState(Qt.Unchecked)
-                self.extensions_list.addItem(item)
-            else:
-                QMessageBox.warning(self, "Download Failed", "Failed to download the extension.", QMessageBox.Ok)
+            worker = self.parent.extension_manager.install_extensions([{"url": url}])
+
+            def on_completed(results):
+                if not self.add_installed_extensions(results):
+                    QMessageBox.warning(self, "Download Failed", "Failed to download the extension.", QMessageBox.Ok)
+
+            worker.completed.connect(on_completed)
+            self.start_install(worker)
+
+    def start_install(self, worker):
+        self.install_worker = worker
+        worker.finished.connect(lambda: setattr(self, "install_worker", None))
+        worker.start()
+
+    def add_installed_extensions(self, results):
+        manager = self.parent.extension_manager
+        listed = {self.extensions_list.item(i).data(Qt.UserRole) for i in range(self.extensions_list.count())}
+        installed = [ext_name for ext_name in results if ext_name and ext_name in manager.extensions]
+        for ext_name in installed:
+            if ext_name in listed:
+                continue
+            listed.add(ext_name)
+            item = QListWidgetItem(manager.display_names.get(ext_name, ext_name))
+            item.setData(Qt.UserRole, ext_name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.extensions_list.addItem(item)
+        return installed
 
     def fetch_store_extensions(self):
-        extensions = self.parent.extension_manager.fetch_store_extensions()
-        if not extensions:
-            QMessageBox.warning(self, "Fetch Failed", "Failed to fetch extensions from the store.", QMessageBox.Ok)
-            return
+        manager = self.parent.extension_manager
+        catalog = manager.catalog
 
         dialog = QDialog(self)
         dialog.setWindowTitle("MojoX Extension Store")
         dialog.setGeometry(300, 300, 600, 400)
         layout = QVBoxLayout()
 
-        store_list = QListWidget()
-        store_list.setSpacing(6)
-
-        for ext in extensions:
-            item_widget = QWidget()
-            item_layout = QHBoxLayout()
-            item_layout.setContentsMargins(6, 6, 6, 6)
-
-            text_widget = QWidget()
-            text_layout = QVBoxLayout()
-            name_label = QLabel(ext["name"])
-            name_label.setStyleSheet("font-weight: bold; font-size: 14px;")
-            desc_label = QLabel(ext["description"])
-            desc_label.setWordWrap(True)
-            desc_label.setStyleSheet("font-size: 12px;")
-            author_label = QLabel(f"By: {ext['author']}")
-            author_label.setStyleSheet("font-size: 10px; color: #888;")
-            text_layout.addWidget(name_label)
-            text_layout.addWidget(desc_label)
-            text_layout.addWidget(author_label)
-            text_widget.setLayout(text_layout)
-            item_layout.addWidget(text_widget)
-
-            checkbox = QCheckBox()
-            item_layout.addWidget(checkbox)
-
-            item_widget.setLayout(item_layout)
-
-            item = QListWidgetItem()
-            item.setSizeHint(item_widget.sizeHint())
-            item.setData(Qt.UserRole, ext["url"])
-            item.setData(Qt.UserRole + 1, ext["name"])
-            store_list.addItem(item)
-            store_list.setItemWidget(item, item_widget)
-
+        model = StoreCatalogModel(catalog.entries, parent=dialog)
+        filter_input = QLineEdit()
+        filter_input.setStyleSheet(self.parent.get_input_style())
+        filter_input.setPlaceholderText("Filter by name, description or author...")
+        filter_input.setClearButtonEnabled(True)
+        filter_input.textChanged.connect(model.set_filter)
+        layout.addWidget(filter_input)
+
+        store_list = QListView()
+        store_list.setUniformItemSizes(True)
+        store_list.setItemDelegate(StoreItemDelegate(store_list))
+        store_list.setModel(model)
         layout.addWidget(store_list)
 
+        catalog_label = QLabel(f"{len(catalog.entries)} add-ons" if catalog.entries else "Loading catalog...")
+        catalog_label.setStyleSheet("font-size: 11px; color: #888;")
+        layout.addWidget(catalog_label)
+
+        progress_bar = QProgressBar()
+        progress_bar.setVisible(False)
+        layout.addWidget(progress_bar)
+
         download_button = QPushButton("Download Selected")
         download_button.setStyleSheet(self.parent.get_button_style(PRIMARY_COLOR, BUTTON_HOVER_COLOR, BUTTON_PRESSED_COLOR))
-        download_button.clicked.connect(lambda: self.download_selected_extensions(store_list, dialog))
+        download_button.clicked.connect(lambda: self.download_selected_extensions(model, dialog, download_button, progress_bar))
         layout.addWidget(download_button)
 
+        def on_refreshed(changed):
+            if changed:
+                model.set_rows(list(catalog.entries))
+            catalog_label.setText(f"{len(catalog.entries)} add-ons")
+
+        def on_failed(error):
+            if catalog.entries:
+                catalog_label.setText(f"{len(catalog.entries)} add-ons (offline copy)")
+            else:
+                catalog_label.setText("Store unavailable")
+                QMessageBox.warning(dialog, "Fetch Failed", f"Failed to fetch extensions from the store: {error}", QMessageBox.Ok)
+
+        worker = manager.refresh_store_catalog()
+        if worker:
+            worker.refreshed.connect(on_refreshed)
+            worker.failed.connect(on_failed)
+
         dialog.setLayout(layout)
         dialog.exec_()
+        if worker:
+            worker.refreshed.disconnect(on_refreshed)
+            worker.failed.disconnect(on_failed)
 
-    def download_selected_extensions(self, store_list, dialog):
-        for i in range(store_list.count()):
-            item = store_list.item(i)
-            checkbox = store_list.itemWidget(item).findChild(QCheckBox)
-            if checkbox and checkbox.isChecked():
-                url = item.data(Qt.UserRole)
-                ext_name = self.parent.extension_manager.download_extension(url)
-                if ext_name:
-                    display_name = self.parent.extension_manager.display_names.get(ext_name, ext_name)
-                    list_item = QListWidgetItem(display_name)
-                    list_item.setData(Qt.UserRole, ext_name)
-                    list_item.setFlags(list_item.flags() | Qt.ItemIsUserCheckable)
-                    list_item.setCheckState(Qt.Unchecked)
-                    self.extensions_list.addItem(list_item)
-        dialog.accept()
+    def download_selected_extensions(self, model, dialog, download_button, progress_bar):
+        items = model.checked_entries()
+        if not items:
+            return
+        for item in items:
+            model.set_status(item["url"], "Queued")
+        download_button.setEnabled(False)
+        progress_bar.setRange(0, len(items))
+        progress_bar.setValue(0)
+        progress_bar.setVisible(True)
+        worker = self.parent.extension_manager.install_extensions(items)
+
+        def on_status(index, status):
+            model.set_status(items[index]["url"], status)
+            if status == "Installed" or status.startswith("Failed"):
+                progress_bar.setValue(progress_bar.value() + 1)
+
+        def on_completed(results):
+            installed = self.add_installed_extensions(results)
+            download_button.setEnabled(True)
+            if len(installed) == len(items):
+                dialog.accept()
+            else:
+                QMessageBox.warning(dialog, "Download Failed", f"Installed {len(installed)} of {len(items)} extensions.", QMessageBox.Ok)
+
+        worker.item_status.connect(on_status)
+        worker.completed.connect(on_completed)
+        self.start_install(worker)
 
     def close_dialog(self):
         for i in range(self.extensions_list.count()):
@@ -246,6 +375,8 @@ class SettingsDialog(QDialog):
         self.layout.setSpacing(12)
         self.setLayout(self.layout)
 
+        self.parent.cache_accountant.totals_changed.connect(self.show_cache_totals)
+        self.show_cache_totals(self.parent.cache_accountant.totals)
         self.update_cache_size()
         self.apply_theme()
 
@@ -384,11 +515,31 @@ class SettingsDialog(QDialog):
         self.preload_pages.setStyleSheet(self.parent.get_checkbox_style())
         layout.addRow(self.preload_pages)
 
+        self.segmented_downloads = QCheckBox("Use Parallel Connections for Large Downloads")
+        self.segmented_downloads.setStyleSheet(self.parent.get_checkbox_style())
+        layout.addRow(self.segmented_downloads)
+
+        self.verify_downloads = QCheckBox("Verify Download Checksums")
+        self.verify_downloads.setStyleSheet(self.parent.get_checkbox_style())
+        layout.addRow(self.verify_downloads)
+
+        self.extract_downloads = QCheckBox("Extract Downloaded Archives")
+        self.extract_downloads.setStyleSheet(self.parent.get_checkbox_style())
+        layout.addRow(self.extract_downloads)
+
+        self.sort_downloads = QCheckBox("Sort Downloads into Folders by Type")
+        self.sort_downloads.setStyleSheet(self.parent.get_checkbox_style())
+        layout.addRow(self.sort_downloads)
+
         self.cache_size_limit = QComboBox()
         self.cache_size_limit.setStyleSheet(self.parent.get_input_style())
         self.cache_size_limit.addItems(["50 MB", "100 MB", "250 MB", "500 MB", "Unlimited"])
         layout.addRow(QLabel("Cache Size Limit:").setStyleSheet(self.parent.get_label_style()), self.cache_size_limit)
 
+        self.cache_breakdown_label = QLabel("Calculating...")
+        self.cache_breakdown_label.setStyleSheet(self.parent.get_label_style())
+        layout.addRow(QLabel("Disk Usage:"), self.cache_breakdown_label)
+
     def setup_about_tab(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(15, 15, 15, 15)
@@ -415,22 +566,26 @@ class SettingsDialog(QDialog):
         self.apply_theme(temp_theme)
 
     def update_cache_size(self):
+        self.parent.cache_accountant.refresh()
+
+    def show_cache_totals(self, totals):
         try:
-            profile = QWebEngineProfile.defaultProfile()
-            size_mb = self.get_directory_size(profile.cachePath()) / (1024 * 1024)
-            self.cache_size_label.setText(f"Cache Size: {size_mb:.2f} MB")
+            total = sum(categories["total"] for categories in totals.values())
+            self.cache_size_label.setText(f"Cache Size: {total / (1024 * 1024):.2f} MB")
+            lines = []
+            for profile, categories in sorted(totals.items()):
+                parts = ", ".join(f"{CATEGORY_LABELS[c]} {categories[c] / (1024 * 1024):.1f} MB" for c in CATEGORIES if categories[c])
+                lines.append(f"{profile}: {parts or 'empty'}")
+            self.cache_breakdown_label.setText("\n".join(lines) or "No on-disk profile data")
         except Exception as e:
             self.cache_size_label.setText(f"Cache Size: Error ({str(e)})")
 
-    def get_directory_size(self, directory):
-        total_size = 0
+    def done(self, result):
         try:
-            for dirpath, _, filenames in os.walk(directory):
-                for f in filenames:
-                    total_size += os.path.getsize(os.path.join(dirpath, f))
-        except Exception:
+            self.parent.cache_accountant.totals_changed.disconnect(self.show_cache_totals)
+        except TypeError:
             pass
-        return total_size
+        super().done(result)
 
     def clear_cookies(self):
         try:
@@ -481,6 +636,12 @@ class SettingsDialog(QDialog):
             self.parent.statusBar().showMessage("Proxy disabled", 5000)
             
         self.parent.privacy_engine.save_privacy_settings()
+        self.parent.download_postprocessing.update({
+            "verify_checksum": self.verify_downloads.isChecked(),
+            "auto_extract": self.extract_downloads.isChecked(),
+            "move_rules_enabled": self.sort_downloads.isChecked()
+        })
+        self.parent.post_processor.options.update(self.parent.download_postprocessing)
         self.parent.apply_settings(
             self.home_page_input.text(),
             self.search_engine_dropdown.currentText(),
@@ -491,7 +652,8 @@ class SettingsDialog(QDialog):
             self.new_tab_behavior.currentText(),
             self.hardware_acceleration.isChecked(),
             self.preload_pages.isChecked(),
-            self.cache_size_limit.currentText()
+            self.cache_size_limit.currentText(),
+            self.segmented_downloads.isChecked()
         )
         self.accept()
 
@@ -550,8 +712,9 @@ class DownloadDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Downloads")
-        self.setGeometry(300, 300, 500, 400)
+        self.setGeometry(300, 300, 720, 400)
         self.active_downloads = 0
+        self.pending_postprocessing = 0
         self.parent_browser = parent
         self.layout = QVBoxLayout()
         self.downloads_layout = QVBoxLayout()
@@ -564,6 +727,33 @@ class DownloadDialog(QDialog):
         self.layout.addWidget(self.scroll_area)
 
         self.button_layout = QHBoxLayout()
+        scheduler = parent.download_scheduler
+        self.max_active_spin = QSpinBox()
+        self.max_active_spin.setRange(1, 10)
+        self.max_active_spin.setValue(scheduler.max_active)
+        self.max_active_spin.setStyleSheet(parent.get_input_style())
+        self.max_active_spin.valueChanged.connect(self.set_max_active)
+        self.rate_limit_dropdown = QComboBox()
+        self.rate_limit_dropdown.setStyleSheet(parent.get_input_style())
+        self.rate_limit_dropdown.addItems(list(RATE_LIMITS))
+        self.rate_limit_dropdown.setCurrentText(next((k for k, v in RATE_LIMITS.items() if v == scheduler.global_bucket.rate), "Unlimited"))
+        self.rate_limit_dropdown.currentTextChanged.connect(self.set_global_rate)
+        self.pause_all_button = QPushButton("Pause All")
+        self.pause_all_button.setStyleSheet(parent.get_button_style("#F59E0B", "#FBBF24", "#D97706"))
+        self.pause_all_button.clicked.connect(scheduler.pause_all)
+        self.resume_all_button = QPushButton("Resume All")
+        self.resume_all_button.setStyleSheet(parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        self.resume_all_button.clicked.connect(scheduler.resume_all)
+        self.history_button = QPushButton("History")
+        self.history_button.setStyleSheet(parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        self.history_button.clicked.connect(lambda: DownloadHistoryDialog(parent).exec_())
+        self.button_layout.addWidget(QLabel("Active:"))
+        self.button_layout.addWidget(self.max_active_spin)
+        self.button_layout.addWidget(QLabel("Limit:"))
+        self.button_layout.addWidget(self.rate_limit_dropdown)
+        self.button_layout.addWidget(self.pause_all_button)
+        self.button_layout.addWidget(self.resume_all_button)
+        self.button_layout.addWidget(self.history_button)
         self.close_button = QPushButton("Close")
         self.close_button.setStyleSheet(parent.get_button_style(PRIMARY_COLOR, BUTTON_HOVER_COLOR, BUTTON_PRESSED_COLOR))
         self.close_button.clicked.connect(self.close)
@@ -580,100 +770,616 @@ class DownloadDialog(QDialog):
             "QProgressBar::chunk { background-color: #3B82F6; border-radius: 3px; }"
         )
 
-    def add_download(self, download):
+    def set_max_active(self, value):
+        self.parent_browser.download_scheduler.set_max_active(value)
+        self.parent_browser.max_active_downloads = value
+        self.parent_browser.settings_persistence.save_settings()
+
+    def set_global_rate(self, text):
+        rate = RATE_LIMITS.get(text, 0)
+        self.parent_browser.download_scheduler.set_global_rate(rate)
+        self.parent_browser.download_rate_limit = rate
+        self.parent_browser.settings_persistence.save_settings()
+
+    def create_row(self, name, job, path, url, received=0):
         self.active_downloads += 1
+        row = {"path": path, "url": url, "meter": TransferMeter(received)}
+        if job and job.state != ACTIVE:
+            row["meter"].pause()
         download_widget = QWidget()
         download_layout = QHBoxLayout()
-        label = QLabel(download.suggestedFileName())
-        label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        progress = QProgressBar()
-        progress.setMaximum(100)
-        progress.setMinimumWidth(120)
-        progress.setMaximumWidth(220)
-        speed_label = QLabel("0 KB/s")
-        speed_label.setMinimumWidth(70)
-        time_label = QLabel("Calculating...")
-        time_label.setMinimumWidth(100)
-        cancel_button = QPushButton("Cancel")
-        pause_button = QPushButton("Pause")
-        pause_button.setStyleSheet(self.parent_browser.get_button_style("#F59E0B", "#FBBF24", "#D97706"))
-        download_layout.addWidget(label)
-        download_layout.addWidget(progress)
-        download_layout.addWidget(speed_label)
-        download_layout.addWidget(time_label)
-        download_layout.addWidget(pause_button)
-        download_layout.addWidget(cancel_button)
+        row["label"] = QLabel(name)
+        row["label"].setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        row["progress"] = QProgressBar()
+        row["progress"].setMaximum(100)
+        row["progress"].setMinimumWidth(120)
+        row["progress"].setMaximumWidth(220)
+        row["speed"] = QLabel("0 KB/s")
+        row["speed"].setMinimumWidth(70)
+        row["time"] = QLabel("Queued" if job and job.state == QUEUED else "Calculating...")
+        row["time"].setMinimumWidth(100)
+        row["pause"] = QPushButton("Pause")
+        row["pause"].setStyleSheet(self.parent_browser.get_button_style("#F59E0B", "#FBBF24", "#D97706"))
+        row["options"] = QPushButton("⋮")
+        row["options"].setFixedWidth(32)
+        row["cancel"] = QPushButton("Cancel")
+        row["cancel"].setObjectName("Cancel")
+        download_layout.addWidget(row["label"])
+        download_layout.addWidget(row["progress"])
+        download_layout.addWidget(row["speed"])
+        download_layout.addWidget(row["time"])
+        download_layout.addWidget(row["pause"])
+        download_layout.addWidget(row["options"])
+        download_layout.addWidget(row["cancel"])
         download_widget.setLayout(download_layout)
         self.downloads_layout.addWidget(download_widget)
-        
-        last_received = [0]
-        start_time = QTimer()
-        start_time.start()
-        
-        def update_speed(received, total):
-            elapsed_time = start_time.elapsed() / 1000
-            speed = (received - last_received[0]) / 1024
-            speed_label.setText(f"{speed:.1f} KB/s")
-            last_received[0] = received
-            progress.setValue(int((received / total) * 100))
-            if speed > 0:
-                remaining_time = (total - received) / (speed * 1024)
-                time_label.setText(f"{int(remaining_time // 60)}m {int(remaining_time % 60)}s remaining")
+        row["widget"] = download_widget
+
+        if job:
+            scheduler = self.parent_browser.download_scheduler
+            row["pause"].clicked.connect(lambda: scheduler.resume(job) if job.state == PAUSED else scheduler.pause(job))
+            job.state_changed.connect(lambda state: self.on_job_state_changed(state, row))
+            menu = QMenu(row["options"])
+            priority_menu = menu.addMenu("Priority")
+            for label, priority in PRIORITIES.items():
+                priority_menu.addAction(label, lambda p=priority: scheduler.set_priority(job, p))
+            limit_menu = menu.addMenu("Speed Limit")
+            for label, rate in RATE_LIMITS.items():
+                limit_menu.addAction(label, lambda r=rate: job.set_rate_limit(r))
+            row["options"].setMenu(menu)
+        else:
+            row["pause"].hide()
+            row["options"].hide()
+        return row
+
+    def on_job_state_changed(self, state, row):
+        if state == ACTIVE:
+            row["meter"].resume()
+        elif state in (QUEUED, PAUSED):
+            row["meter"].pause()
+        if state == QUEUED:
+            row["pause"].setText("Pause")
+            row["time"].setText("Queued")
+            row["speed"].setText("0 KB/s")
+        elif state == PAUSED:
+            row["pause"].setText("Resume")
+            row["time"].setText("Paused")
+            row["speed"].setText("0 KB/s")
+        elif state == ACTIVE:
+            row["pause"].setText("Pause")
+            row["time"].setText("Calculating...")
+
+    def finish_row(self, row, status, tooltip=None, size=None):
+        if row.get("finished"):
+            return
+        row["finished"] = True
+        self.active_downloads -= 1
+        meter = row["meter"]
+        meter.pause()
+        self.parent_browser.download_history.record(
+            row["path"], row["url"], size if size is not None else meter.received,
+            meter.active_seconds(), meter.average_rate(), status.lower()
+        )
+        row["speed"].setText(format_rate(meter.average_rate()))
+        row["label"].setText(f"{row['label'].text()} - {status}")
+        if tooltip:
+            row["label"].setToolTip(tooltip)
+        row["time"].setText("")
+        row["pause"].hide()
+        row["options"].hide()
+        row["cancel"].hide()
+        self.close_when_idle()
+
+    def close_when_idle(self):
+        if self.active_downloads == 0 and self.pending_postprocessing == 0:
+            QTimer.singleShot(1000, self.close)
+
+    def post_process(self, row, sha256=None):
+        signals = self.parent_browser.post_processor.submit(row["path"], row["url"], sha256)
+        if not signals:
+            return
+        self.pending_postprocessing += 1
+        row["postprocess"] = signals
+        row["time"].setText("Waiting...")
+        details = []
+
+        def on_stage_finished(stage, detail):
+            details.append(f"{stage}: {detail}")
+            row["label"].setToolTip("\n".join(details))
+
+        def on_finished(context):
+            self.pending_postprocessing -= 1
+            row["path"] = context["path"]
+            row["time"].setText("Verified" if context.get("expected_sha256") else "Processed")
+            self.close_when_idle()
+
+        def on_failed(stage, error):
+            self.pending_postprocessing -= 1
+            row["time"].setText(f"{stage} failed")
+            details.append(f"{stage}: {error}")
+            row["label"].setToolTip("\n".join(details))
+            self.parent_browser.statusBar().showMessage(f"{os.path.basename(row['path'])}: {error}", 8000)
+
+        signals.progress.connect(lambda stage, percent: row["time"].setText(f"{stage} {percent}%"))
+        signals.stage_finished.connect(on_stage_finished)
+        signals.finished.connect(on_finished)
+        signals.failed.connect(on_failed)
+
+    def update_row(self, row, received, total):
+        meter = row["meter"]
+        if not meter.update(received, total):
+            return
+        row["speed"].setText(format_rate(meter.current_rate()))
+        if total > 0:
+            row["progress"].setMaximum(100)
+            row["progress"].setValue(int((received / total) * 100))
+        else:
+            row["progress"].setMaximum(0)
+        eta = meter.eta()
+        row["time"].setText(f"{format_duration(eta)} remaining" if eta is not None else "Calculating...")
+
+    def add_download(self, download, job=None):
+        row = self.create_row(download.suggestedFileName(), job, download.path(), download.url().toString(), download.receivedBytes())
+
+        def on_finished():
+            state = download.state()
+            if state == QWebEngineDownloadItem.DownloadCompleted:
+                row["progress"].setMaximum(100)
+                row["progress"].setValue(100)
+                self.finish_row(row, "Completed", size=download.receivedBytes())
+                if not download.isSavePageDownload():
+                    self.post_process(row)
+            elif state == QWebEngineDownloadItem.DownloadCancelled:
+                self.finish_row(row, "Cancelled", size=download.receivedBytes())
             else:
-                time_label.setText("Calculating...")
+                self.finish_row(row, "Failed", download.interruptReasonString(), size=download.receivedBytes())
+
+        download.downloadProgress.connect(lambda received, total: self.update_row(row, received, total))
+        download.finished.connect(on_finished)
+        row["cancel"].clicked.connect(download.cancel)
+
+    def add_segmented_download(self, job):
+        worker = job.worker
+        segmented = worker.download
+        row = self.create_row(job.name, job, segmented.path, segmented.url, segmented.received)
+
+        def on_completed(digest):
+            row["progress"].setMaximum(100)
+            row["progress"].setValue(100)
+            self.finish_row(row, "Completed", f"SHA-256: {digest}", size=segmented.total)
+            self.post_process(row, digest)
+
+        worker.progress.connect(lambda received, total: self.update_row(row, received, total))
+        worker.completed.connect(on_completed)
+        worker.failed.connect(lambda error: self.finish_row(row, "Failed", error, size=segmented.received))
+        row["cancel"].clicked.connect(lambda: (job.cancel(), self.finish_row(row, "Cancelled", size=segmented.received)))
+
+class SortKeyItem(QTableWidgetItem):
+    def __lt__(self, other):
+        key, other_key = self.data(Qt.UserRole), other.data(Qt.UserRole)
+        if key is None or other_key is None:
+            return super().__lt__(other)
+        return key < other_key
+
+class DownloadHistoryDialog(QDialog):
+    COLUMNS = [("File", "path"), ("Size", "size"), ("Duration", "duration"), ("Avg Rate", "average_rate"), ("Outcome", "outcome"), ("Finished", "finished")]
 
-        download.downloadProgress.connect(update_speed)
-        download.finished.connect(lambda: self.on_download_finished(download, download_widget))
-        download.stateChanged.connect(lambda state: self.on_state_changed(state, download_widget, pause_button))
-        cancel_button.clicked.connect(download.cancel)
-        pause_button.clicked.connect(lambda: download.pause() if download.state() == QWebEngineDownloadItem.DownloadInProgress else download.resume())
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Download History")
+        self.setGeometry(300, 300, 800, 450)
+        self.setFont(UI_FONT)
 
-    def on_download_finished(self, download, widget):
-        self.active_downloads -= 1
-        if download.state() == QWebEngineDownloadItem.DownloadCompleted:
-            widget.findChild(QLabel).setText(f"{download.suggestedFileName()} - Completed")
-            widget.findChild(QPushButton).hide()
-        if self.active_downloads == 0:
-            QTimer.singleShot(1000, self.close)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(12)
+
+        filter_layout = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setStyleSheet(self.parent.get_input_style())
+        self.filter_input.setPlaceholderText("Filter by file or URL...")
+        self.filter_input.textChanged.connect(self.populate)
+        self.outcome_dropdown = QComboBox()
+        self.outcome_dropdown.setStyleSheet(self.parent.get_input_style())
+        self.outcome_dropdown.addItems(["All", "Completed", "Cancelled", "Failed"])
+        self.outcome_dropdown.currentTextChanged.connect(self.populate)
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(self.outcome_dropdown)
+        layout.addLayout(filter_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("Close")
+        close_button.setStyleSheet(self.parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+        self.populate()
+
+    def populate(self, *_):
+        outcome = self.outcome_dropdown.currentText()
+        entries = self.parent.download_history.query(
+            self.filter_input.text(), None if outcome == "All" else outcome.lower(), limit=1000
+        )
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(entries))
+        for r, entry in enumerate(entries):
+            for c, (_, key) in enumerate(self.COLUMNS):
+                value = entry.get(key)
+                item = SortKeyItem()
+                if key == "path":
+                    item.setData(Qt.DisplayRole, os.path.basename(value or ""))
+                    item.setToolTip(f"{value}\n{entry.get('url', '')}")
+                elif key == "size":
+                    item.setData(Qt.DisplayRole, format_size(value))
+                    item.setData(Qt.UserRole, value or 0)
+                elif key == "duration":
+                    item.setData(Qt.DisplayRole, format_duration(value))
+                    item.setData(Qt.UserRole, value or 0)
+                elif key == "average_rate":
+                    item.setData(Qt.DisplayRole, format_rate(value))
+                    item.setData(Qt.UserRole, value or 0)
+                elif key == "finished":
+                    item.setData(Qt.DisplayRole, time.strftime("%Y-%m-%d %H:%M", time.localtime(value or 0)))
+                    item.setData(Qt.UserRole, value or 0)
+                else:
+                    item.setData(Qt.DisplayRole, value)
+                self.table.setItem(r, c, item)
+        self.table.setSortingEnabled(True)
+
+class OfflineArchiveDialog(QDialog):
+    COLUMNS = [("Title", "title"), ("URL", "url"), ("Saved", "saved"), ("Format", "format"), ("Resources", "resources")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.archive = parent.offline_archive
+        self.setWindowTitle("Offline Pages")
+        self.setGeometry(300, 300, 800, 450)
+        self.setFont(UI_FONT)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(12)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setStyleSheet(self.parent.get_input_style())
+        self.filter_input.setPlaceholderText("Filter by title or URL...")
+        self.filter_input.textChanged.connect(self.populate)
+        layout.addWidget(self.filter_input)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.doubleClicked.connect(self.open_page)
+        layout.addWidget(self.table)
+
+        self.usage_label = QLabel()
+        self.usage_label.setStyleSheet(self.parent.get_label_style())
+        layout.addWidget(self.usage_label)
+
+        button_layout = QHBoxLayout()
+        for text, handler, colors in (
+            ("Open", self.open_page, (PRIMARY_COLOR, BUTTON_HOVER_COLOR, BUTTON_PRESSED_COLOR)),
+            ("Import...", self.import_page, (SECONDARY_COLOR, "#6B7280", "#374151")),
+            ("Delete", self.delete_page, ("#EF4444", "#F87171", "#DC2626")),
+            ("Close", self.accept, (SECONDARY_COLOR, "#6B7280", "#374151"))
+        ):
+            button = QPushButton(text)
+            button.setStyleSheet(self.parent.get_button_style(*colors))
+            button.clicked.connect(handler)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.usage = None
+        self.populate()
+        self.refresh()
+
+    def refresh(self, page_ids=()):
+        self.parent.maintain_archive(page_ids, self.on_maintained, measure=True)
+
+    def on_maintained(self, removed, usage):
+        self.usage = usage
+        self.populate()
+
+    def populate(self, *_):
+        needle = self.filter_input.text().strip().lower()
+        pages = [
+            page for page in self.archive.list_pages()
+            if page["format"] != READER_FORMAT and (not needle or needle in page["title"].lower() or needle in page["url"].lower())
+        ]
+        self.table.setRowCount(len(pages))
+        for r, page in enumerate(pages):
+            for c, (_, key) in enumerate(self.COLUMNS):
+                value = page[key]
+                if key == "saved":
+                    value = time.strftime("%Y-%m-%d %H:%M", time.localtime(value))
+                elif key == "resources":
+                    value = str(len(value))
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, page["id"])
+                self.table.setItem(r, c, item)
+        usage = format_size(self.usage) if self.usage is not None else "..."
+        self.usage_label.setText(f"{len(self.archive.pages)} pages, {usage} on disk")
+
+    def selected_page_id(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        return item.data(Qt.UserRole) if item else None
+
+    def open_page(self, *_):
+        page_id = self.selected_page_id()
+        if page_id:
+            self.parent.add_new_tab(self.archive.page_url(page_id))
+
+    def import_page(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Saved Page", self.parent.download_path, "Web Pages (*.mhtml *.mht *.html *.htm)")
+        if path:
+            self.parent.archive_file(path, None, None, self.refresh)
+
+    def delete_page(self):
+        page_id = self.selected_page_id()
+        if page_id and QMessageBox.question(self, "Confirm", "Delete this offline page?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
+            self.refresh([page_id])
+
+class ReadingListDialog(QDialog):
+    COLUMNS = [("Title", "title"), ("URL", "url"), ("Added", "added"), ("Status", "status"), ("Size", "size")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.reading_list = parent.reading_list
+        self.prefetcher = parent.reading_list_prefetcher
+        self.setWindowTitle("Reading List")
+        self.setGeometry(300, 300, 800, 450)
+        self.setFont(UI_FONT)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(12)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.doubleClicked.connect(self.open_item)
+        layout.addWidget(self.table)
+
+        self.prefetch_checkbox = QCheckBox("Save queued articles in the background while idle")
+        self.prefetch_checkbox.setStyleSheet(self.parent.get_checkbox_style())
+        self.prefetch_checkbox.setChecked(self.parent.reading_list_prefetch)
+        self.prefetch_checkbox.toggled.connect(self.set_prefetch)
+        layout.addWidget(self.prefetch_checkbox)
+
+        self.metered_checkbox = QCheckBox("Also save on metered (mobile) connections")
+        self.metered_checkbox.setStyleSheet(self.parent.get_checkbox_style())
+        self.metered_checkbox.setChecked(self.parent.reading_list_metered)
+        self.metered_checkbox.toggled.connect(self.set_metered)
+        layout.addWidget(self.metered_checkbox)
+
+        button_layout = QHBoxLayout()
+        for text, handler, colors in (
+            ("Open", self.open_item, (PRIMARY_COLOR, BUTTON_HOVER_COLOR, BUTTON_PRESSED_COLOR)),
+            ("Save Now", self.save_now, (ACCENT_COLOR, "#FBBF24", "#D97706")),
+            ("Delete", self.delete_item, ("#EF4444", "#F87171", "#DC2626")),
+            ("Close", self.accept, (SECONDARY_COLOR, "#6B7280", "#374151"))
+        ):
+            button = QPushButton(text)
+            button.setStyleSheet(self.parent.get_button_style(*colors))
+            button.clicked.connect(handler)
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+        self.prefetcher.item_changed.connect(self.populate)
+        self.populate()
+
+    def populate(self, *_):
+        items = self.reading_list.list_items()
+        self.table.setRowCount(len(items))
+        for r, entry in enumerate(items):
+            for c, (_, key) in enumerate(self.COLUMNS):
+                value = entry[key]
+                if key == "added":
+                    value = time.strftime("%Y-%m-%d %H:%M", time.localtime(value))
+                elif key == "size":
+                    value = format_size(value) if value else ""
+                elif key == "status" and entry["error"] and value != READY:
+                    value = f"{value}: {entry['error']}"
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, entry["id"])
+                self.table.setItem(r, c, item)
+
+    def selected_item(self):
+        item = self.table.item(self.table.currentRow(), 0)
+        return self.reading_list.get(item.data(Qt.UserRole)) if item else None
+
+    def open_item(self, *_):
+        entry = self.selected_item()
+        if not entry:
+            return
+        if entry["status"] == READY and entry["page_id"] in self.parent.offline_archive.pages:
+            self.parent.add_new_tab(self.parent.offline_archive.page_url(entry["page_id"]))
+        else:
+            self.parent.add_new_tab(QUrl(entry["url"]))
+
+    def save_now(self):
+        entry = self.selected_item()
+        if entry and entry["status"] not in (READY, SAVING):
+            self.prefetcher.save_now(entry["id"])
+
+    def delete_item(self):
+        entry = self.selected_item()
+        if entry and QMessageBox.question(self, "Confirm", "Remove this article from the reading list?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
+            self.prefetcher.remove(entry["id"])
+
+    def set_prefetch(self, enabled):
+        self.parent.reading_list_prefetch = enabled
+        self.parent.settings_persistence.save_settings()
+
+    def set_metered(self, enabled):
+        self.parent.reading_list_metered = enabled
+        self.parent.settings_persistence.save_settings()
+
+    def done(self, result):
+        self.prefetcher.item_changed.disconnect(self.populate)
+        super().done(result)
+
+class TelemetryDialog(QDialog):
+    COLUMNS = [
+        ("Host", "host"), ("Day", "day"), ("Config", "context"), ("Samples", "samples"),
+        ("Load p50", "load_p50"), ("Load p95", "load_p95"),
+        ("TTFB p50", "ttfb_p50"), ("TTFB p95", "ttfb_p95"),
+        ("DCL p50", "dom_content_loaded_p50"), ("DCL p95", "dom_content_loaded_p95"),
+        ("DNS p95", "dns_p95"), ("Connect p95", "connect_p95"), ("Transfer p50", "transfer_size_p50")
+    ]
 
-    def on_state_changed(self, state, widget, pause_button):
-        if state == QWebEngineDownloadItem.DownloadCancelled:
-            self.active_downloads -= 1
-            widget.findChild(QLabel).setText(f"{widget.findChild(QLabel).text()} - Cancelled")
-            widget.findChild(QPushButton, "Cancel").hide()
-            if self.active_downloads == 0:
-                QTimer.singleShot(1000, self.close)
-        elif state == QWebEngineDownloadItem.DownloadInterrupted:
-            pause_button.setText("Resume")
-        elif state == QWebEngineDownloadItem.DownloadInProgress:
-            pause_button.setText("Pause")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Page Load Timing")
+        self.setGeometry(300, 300, 900, 450)
+        self.setFont(UI_FONT)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(12)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setStyleSheet(self.parent.get_input_style())
+        self.filter_input.setPlaceholderText("Filter by host...")
+        self.filter_input.textChanged.connect(self.populate)
+        layout.addWidget(self.filter_input)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in self.COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("Close")
+        close_button.setStyleSheet(self.parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+        self.rows = self.parent.telemetry.aggregate()
+        self.populate()
+
+    def populate(self, text=""):
+        needle = (text or "").strip().lower()
+        rows = [row for row in self.rows if needle in row["host"].lower()]
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, (_, key) in enumerate(self.COLUMNS):
+                value = row[key]
+                item = QTableWidgetItem()
+                if key == "transfer_size_p50":
+                    item.setData(Qt.DisplayRole, f"{value / 1024:.1f} KB")
+                elif isinstance(value, (int, float)) and key != "samples":
+                    item.setData(Qt.DisplayRole, round(float(value), 1))
+                else:
+                    item.setData(Qt.DisplayRole, value)
+                self.table.setItem(r, c, item)
+        self.table.setSortingEnabled(True)
 
 class MojoBrowser(QMainWindow):
     DEFAULT_HOME_PAGE = "https://mojox.org/search"
 
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__()
+        self.startup = startup or StartupTimer()
+        self.deferred_started = False
         self.setWindowTitle("Mojo Browser")
         self.setGeometry(100, 100, 1280, 800)
         self.setFont(UI_FONT)
         self.setWindowIcon(QIcon("icons/Mojo.ico"))
 
-        self.data_manager = DataManager()
-        self.settings_persistence = SettingsPersistence(self)
-        self.extension_manager = ExtensionManager(self)
-        self.privacy_engine = initialize_privacy(self)
+        with self.startup.phase("settings"):
+            self.data_manager = DataManager()
+            self.settings_persistence = SettingsPersistence(self)
+        with self.startup.phase("extensions"):
+            self.extension_manager = ExtensionManager(self)
+        with self.startup.phase("privacy"):
+            self.privacy_engine = initialize_privacy(self)
+        with self.startup.phase("services"):
+            self._initialize_services()
+        with self.startup.phase("settings_apply"):
+            self._initialize_settings()
+        with self.startup.phase("ui"):
+            self._initialize_ui()
+            self._initialize_timers()
+
+        self.first_paint_watcher = FirstPaintWatcher(self)
+        self.first_paint_watcher.painted.connect(self.on_first_paint)
+        QTimer.singleShot(2000, self.start_deferred_services)
+
+    def _initialize_services(self):
         self.profiles = {"Default": QWebEngineProfile.defaultProfile()}
         self.downloads = {}
+        self.download_scheduler = DownloadScheduler(self, self.max_active_downloads, self.download_rate_limit)
+        self.download_history = DownloadHistory()
+        self.post_processor = PostProcessor(self, self.download_postprocessing)
+        self.segmented_download_threads = []
+        self.download_session = None
         self.private_profile = None
         self.download_dialog = None
-
-        self._initialize_settings()
-        self._initialize_ui()
-        self._initialize_timers()
+        self.closed_tabs = ClosedTabStack()
+        self.telemetry = NavigationTelemetry(self)
+        self.omnibox_index = FrecencyIndex()
+        self.reader_mode = ReaderMode()
+        self.cache_policy = CachePolicy()
+        self.cache_accountant = CacheAccountant(self, paused=True)
+        self.offline_archive = OfflineArchive()
+        self.archive_handler = ArchiveSchemeHandler(self.offline_archive, self)
+        self.archive_workers = []
+        self.pending_archive_saves = {}
+        self.prepare_profile("Default", QWebEngineProfile.defaultProfile())
+        self.preloader = PredictiveLoader(self)
+        self.reading_list = ReadingList()
+        self.reading_list_prefetcher = ReadingListPrefetcher(self, self.reading_list, self.offline_archive)
+
+    def on_first_paint(self):
+        self.startup.mark("first_paint")
+        QTimer.singleShot(0, self.start_deferred_services)
+
+    def start_deferred_services(self):
+        if self.deferred_started:
+            return
+        self.deferred_started = True
+        self.startup.stage = DEFERRED
+        with self.startup.phase("omnibox_index"):
+            self.build_omnibox_index()
+        with self.startup.phase("preloader_history"):
+            self.preloader.load_history(self.history)
+        if self.privacy_engine:
+            with self.startup.phase("privacy_background"):
+                self.privacy_engine.start_background_tasks()
+        with self.startup.phase("extension_watch"):
+            self.extension_manager.set_hot_reload(self.extension_hot_reload)
+            self.extension_manager.refresh_store_catalog()
+        with self.startup.phase("cache_accounting"):
+            self.cache_accountant.resume()
+        self.startup.finish()
 
     def _initialize_settings(self):
-        self.extension_manager.load_extensions()
-        self.settings_persistence.load_settings()
+        self.extension_manager.profiler.budget_ms = self.extension_budget_ms
+        self.cache_policy.set_limit(self.cache_size_limit)
 
     def _initialize_ui(self):
         self.central_widget = QWidget(self)
@@ -696,10 +1402,6 @@ class MojoBrowser(QMainWindow):
         self.setup_shortcuts()
 
     def _initialize_timers(self):
-        self.cache_timer = QTimer(self)
-        self.cache_timer.timeout.connect(self.update_cache_size_periodic)
-        self.cache_timer.start(30000)
-
         self.performance_timer = QTimer(self)
         self.performance_timer.timeout.connect(self.optimize_performance)
         self.performance_timer.start(60000)
@@ -719,7 +1421,6 @@ class MojoBrowser(QMainWindow):
             if browser and browser != current_browser:
                 browser.page().setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
                 browser.page().setBackgroundColor(QColor(DARK_MODE_BACKGROUND if self.theme == "Dark" else LIGHT_MODE_BACKGROUND))
-        QWebEngineProfile.defaultProfile().clearHttpCache()  
 
     def create_tool_bar(self):
         self.tool_bar = QToolBar("Navigation", self)
@@ -752,6 +1453,13 @@ class MojoBrowser(QMainWindow):
         self.address_bar.setMinimumWidth(320)
         self.address_bar.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.address_bar.returnPressed.connect(self.load_page)
+        self.address_bar.textEdited.connect(self.update_omnibox_suggestions)
+        self.omnibox_model = QStringListModel(self)
+        self.omnibox_completer = QCompleter(self.omnibox_model, self)
+        self.omnibox_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.omnibox_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.omnibox_completer.activated[str].connect(self.open_omnibox_suggestion)
+        self.address_bar.setCompleter(self.omnibox_completer)
         self.address_bar.setClearButtonEnabled(True)
         self.tool_bar.addWidget(self.address_bar)
 
@@ -767,6 +1475,9 @@ class MojoBrowser(QMainWindow):
             (None, "emblem-favorite", "Bookmark", "Bookmark page", self.settings_persistence.add_bookmark),
             (None, "bookmarks", "Bookmarks", "View bookmarks", self.settings_persistence.view_bookmarks),
             (None, "document-open-recent", "History", "View history", self.settings_persistence.view_history),
+            (None, "document-save", "Offline Pages", "View pages saved for offline reading", self.open_offline_archive),
+            (None, "format-justify-left", "Reading List", "View articles saved to the reading list", self.open_reading_list),
+            (None, "utilities-system-monitor", "Load Timing", "View page load timing", self.open_telemetry),
             ("settings.png", "preferences-system", "Settings", "Open settings", self.open_settings),
             ("exten.png", "applications-other", "Extensions", "Manage extensions", self.open_extensions),
         ]
@@ -788,6 +1499,24 @@ class MojoBrowser(QMainWindow):
         profile_action.triggered.connect(self.switch_profile)
         self.tool_bar.addAction(profile_action)
 
+    def build_omnibox_index(self):
+        now = time.time()
+        records = [(url, None, now - (len(self.history) - i), False) for i, url in enumerate(self.history)]
+        records.extend((b["url"], b["title"], None, True) for b in self.bookmark_store.bookmarks())
+        self.omnibox_index.clear()
+        self.omnibox_index.load(records)
+
+    def update_omnibox_suggestions(self, text):
+        suggestions = self.omnibox_index.query(text) if text.strip() else []
+        self.omnibox_model.setStringList([entry.url for entry in suggestions])
+        if suggestions:
+            self.omnibox_completer.complete()
+        self.preloader.on_address_edited(text)
+
+    def open_omnibox_suggestion(self, url):
+        self.address_bar.setText(url)
+        self.load_page()
+
     def get_toolbar_style(self):
         theme = self.theme
         return (
@@ -824,6 +1553,33 @@ class MojoBrowser(QMainWindow):
         dialog = ExtensionsDialog(self)
         dialog.exec_()
 
+    def prepare_profile(self, name, profile):
+        self.cache_policy.configure(profile)
+        self.cache_accountant.add_profile(name, profile)
+        profile.installUrlSchemeHandler(ARCHIVE_SCHEME.encode(), self.archive_handler)
+        profile.downloadRequested.connect(self.handle_download)
+        self.extension_manager.register_profile(profile)
+
+    def open_offline_archive(self):
+        dialog = OfflineArchiveDialog(self)
+        dialog.exec_()
+
+    def open_reading_list(self):
+        dialog = ReadingListDialog(self)
+        dialog.exec_()
+
+    def save_to_reading_list(self, browser=None):
+        browser = browser or self.tabs.currentWidget()
+        if not browser or browser.url().scheme() not in ("http", "https"):
+            self.statusBar().showMessage("Only web pages can be saved to the reading list", 3000)
+            return
+        item = self.reading_list_prefetcher.add(browser.url().toString(), browser.page().title())
+        self.statusBar().showMessage(f"Added to reading list: {item['title']}", 3000)
+
+    def open_telemetry(self):
+        dialog = TelemetryDialog(self)
+        dialog.exec_()
+
     def create_tabs(self):
         self.tabs = QTabWidget()
         self.tabs.setTabsClosable(True)
@@ -914,10 +1670,10 @@ class MojoBrowser(QMainWindow):
             else (LIGHT_MODE_ACCENT, LIGHT_MODE_TEXT, "#E5E7EB")
         )
         return (
-            f"QListWidget {{ background-color: {list_background}; color: {list_text_color}; "
+            f"QListWidget, QListView {{ background-color: {list_background}; color: {list_text_color}; "
             f"border: 1px solid {'#4B5563' if theme == 'Dark' else '#D1D5DB'}; border-radius: {BORDER_RADIUS}; padding: 10px; font-size: 14px; }}"
-            "QListWidget::item { padding: 10px; }"
-            f"QListWidget::item:selected {{ background-color: {list_selected_background}; }}"
+            "QListWidget::item, QListView::item { padding: 10px; }"
+            f"QListWidget::item:selected, QListView::item:selected {{ background-color: {list_selected_background}; }}"
         )
 
     def adjust_color(self, hex_color, amount):
@@ -925,19 +1681,19 @@ class MojoBrowser(QMainWindow):
         r, g, b = [min(max(c + amount, 0), 255) for c in (r, g, b)]
         return f"#{r:02x}{g:02x}{b:02x}"
 
-    def add_new_tab(self, url=None):
+    def add_new_tab(self, url=None, closed_tab=None):
         browser = QWebEngineView(self) if self.settings_persistence.privacy_settings["private_browsing"] else QWebEngineView()
         if self.settings_persistence.privacy_settings["private_browsing"]:
             if not self.private_profile:
-                self.private_profile = QWebEngineProfile("PrivateProfile", self)
-                self.private_profile.setCachePath("")
-                self.private_profile.setPersistentStoragePath("")
+                self.private_profile = QWebEngineProfile(self)
+                self.prepare_profile("Private", self.private_profile)
             page = PrivacyPage(self.private_profile, browser)
             page.setPrivacyEngine(self.privacy_engine)
             browser.setPage(page)
         else:
             page = PrivacyPage(QWebEngineProfile.defaultProfile(), browser)
             page.setPrivacyEngine(self.privacy_engine)
+            page.setNavigationHook(self.preloader.try_swap)
             browser.setPage(page)
 
         self.apply_webengine_settings(browser)
@@ -952,14 +1708,17 @@ class MojoBrowser(QMainWindow):
             else:
                 url = QUrl(self.home_page)
                 
-        browser.setUrl(url)
-        i = self.tabs.addTab(browser, "New Tab")
+        if closed_tab:
+            closed_tab.restore(browser)
+        else:
+            browser.setUrl(url)
+        i = self.tabs.addTab(browser, closed_tab.title if closed_tab and closed_tab.title else "New Tab")
         self.tabs.setCurrentIndex(i)
         browser.urlChanged.connect(lambda u, b=browser: (self.update_tab_title(b, u), self.update_history(u), self.update_address_bar(i)))
         browser.loadStarted.connect(lambda: self.statusBar().showMessage("Loading..."))
         browser.loadProgress.connect(lambda p: self.statusBar().showMessage(f"Loading... {p}%"))
-        browser.loadFinished.connect(lambda ok, b=browser: (self.load_finished(ok, b), self.extension_manager.inject_extensions(b)))
-        browser.titleChanged.connect(lambda title, b=browser: self.update_tab_title(b, title))
+        browser.loadFinished.connect(lambda ok, b=browser: self.load_finished(ok, b))
+        browser.titleChanged.connect(lambda title, b=browser: (self.update_tab_title(b, title), self.omnibox_index.set_title(b.url().toString(), title)))
         browser.iconChanged.connect(lambda icon, b=browser: self.update_tab_icon(b, icon))
         
         browser.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -968,6 +1727,10 @@ class MojoBrowser(QMainWindow):
         browser.settings().setAttribute(QWebEngineSettings.ErrorPageEnabled, False)  
         browser.settings().setAttribute(QWebEngineSettings.FullScreenSupportEnabled, False)  
 
+        if closed_tab:
+            self.tabs.setTabIcon(i, closed_tab.icon())
+        return browser
+
     def update_tab_icon(self, browser, icon):
         index = self.tabs.indexOf(browser)
         if index >= 0:
@@ -976,6 +1739,8 @@ class MojoBrowser(QMainWindow):
     def close_tab(self, index):
         browser = self.tabs.widget(index)
         if browser:
+            profile = browser.page().profile()
+            self.closed_tabs.push(browser, private=profile is self.private_profile or profile.isOffTheRecord())
             browser.deleteLater()  
         if self.tabs.count() > 1:
             self.tabs.removeTab(index)
@@ -1081,6 +1846,7 @@ class MojoBrowser(QMainWindow):
             ("Ctrl+Tab", lambda: self.tabs.setCurrentIndex((self.tabs.currentIndex() + 1) % self.tabs.count())),
             ("Ctrl+Shift+T", self.reopen_last_tab),
             ("Ctrl+Shift+R", self.toggle_reader_mode),
+            ("Ctrl+Shift+L", self.save_to_reading_list),
         ]
         for key, func in shortcuts:
             shortcut = QAction(self)
@@ -1089,7 +1855,10 @@ class MojoBrowser(QMainWindow):
             self.addAction(shortcut)
 
     def reopen_last_tab(self):
-        if self.history:
+        closed_tab = self.closed_tabs.pop()
+        if closed_tab:
+            self.add_new_tab(QUrl(closed_tab.url), closed_tab=closed_tab)
+        elif self.history:
             self.add_new_tab(QUrl(self.history[-1]))
 
     def tab_context_menu(self, pos):
@@ -1128,6 +1897,25 @@ class MojoBrowser(QMainWindow):
             self.statusBar().showMessage("Failed to load page", 3000)
         else:
             self.statusBar().showMessage("Page loaded successfully", 1000)
+            self.telemetry.collect(browser)
+            if browser is self.tabs.currentWidget():
+                self.preloader.on_page_loaded(browser)
+
+    def swap_in_page(self, browser, page):
+        if self.tabs.indexOf(browser) < 0:
+            page.deleteLater()
+            return
+        old_page = browser.page()
+        page.setParent(browser)
+        page.setNavigationHook(self.preloader.try_swap)
+        browser.setPage(page)
+        self.apply_webengine_settings(browser)
+        if old_page is not page:
+            old_page.deleteLater()
+        self.update_tab_title(browser, page.title() or page.url().toString())
+        self.update_history(page.url())
+        self.update_address_bar(self.tabs.indexOf(browser))
+        self.load_finished(True, browser)
 
     def open_settings(self):
         self.settings_dialog = SettingsDialog(self)
@@ -1148,11 +1936,15 @@ class MojoBrowser(QMainWindow):
         self.settings_dialog.hardware_acceleration.setChecked(self.hardware_acceleration)
         self.settings_dialog.preload_pages.setChecked(self.preload_pages)
         self.settings_dialog.cache_size_limit.setCurrentText(self.cache_size_limit)
+        self.settings_dialog.segmented_downloads.setChecked(self.segmented_downloads)
+        self.settings_dialog.verify_downloads.setChecked(self.post_processor.options["verify_checksum"])
+        self.settings_dialog.extract_downloads.setChecked(self.post_processor.options["auto_extract"])
+        self.settings_dialog.sort_downloads.setChecked(self.post_processor.options["move_rules_enabled"])
         self.settings_dialog.exec_()
 
     def apply_settings(self, home_page, search_engine, theme, javascript_enabled, 
                       block_popups, block_mixed_content, new_tab_behavior, 
-                      hardware_acceleration, preload_pages, cache_size_limit):
+                      hardware_acceleration, preload_pages, cache_size_limit, segmented_downloads):
         self.home_page = home_page or self.home_page
         self.search_engine = search_engine
         self.theme = theme if theme != "System" else ("Dark" if QApplication.palette().color(QPalette.Window).lightness() < 128 else "Light")
@@ -1163,6 +1955,10 @@ class MojoBrowser(QMainWindow):
         self.hardware_acceleration = hardware_acceleration
         self.preload_pages = preload_pages
         self.cache_size_limit = cache_size_limit
+        self.cache_policy.set_limit(cache_size_limit)
+        self.segmented_downloads = segmented_downloads
+        if not preload_pages:
+            self.preloader.cancel_all()
         
         self.apply_styles()
         self.settings_persistence.save_settings()
@@ -1174,24 +1970,27 @@ class MojoBrowser(QMainWindow):
                     browser.page().profile().setHttpUserAgent("MojoBrowser/0.2 (Privacy Enhanced)")
 
     def apply_webengine_settings(self, browser):
-        settings = browser.settings()
+        self.apply_page_settings(browser.page())
+
+    def apply_page_settings(self, page):
+        settings = page.settings()
         settings.setAttribute(QWebEngineSettings.JavascriptEnabled, self.javascript_enabled)
         settings.setAttribute(QWebEngineSettings.JavascriptCanOpenWindows, not self.block_popups)
         settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, not self.block_mixed_content)
         settings.setAttribute(QWebEngineSettings.Accelerated2dCanvasEnabled, self.hardware_acceleration)
         settings.setAttribute(QWebEngineSettings.WebGLEnabled, self.hardware_acceleration)
         
-        profile = browser.page().profile()
+        profile = page.profile()
+        self.extension_manager.attach_page(page)
         profile.setUrlRequestInterceptor(self.privacy_engine)
         self.privacy_engine.apply_proxy(profile)
-        
-        profile.setHttpCacheMaximumSize(50 * 1024 * 1024)  
-        profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)  
 
     def update_history(self, url):
         url_str = url.toString()
         if url_str and (not self.history or url_str != self.history[-1]):
             self.history.append(url_str)
+            self.preloader.record_visit(url_str)
+            self.omnibox_index.record_visit(url_str)
             if len(self.history) > 50:
                 self.history.pop(0)
             self.settings_persistence.save_history()
@@ -1199,12 +1998,9 @@ class MojoBrowser(QMainWindow):
     def clear_history_data(self):
         self.history.clear()
         self.settings_persistence.save_history()
+        self.build_omnibox_index()
         QMessageBox.information(self, "History Cleared", "Browsing history has been cleared.", QMessageBox.Ok)
 
-    def update_cache_size_periodic(self):
-        if hasattr(self, 'settings_dialog') and self.settings_dialog.isVisible():
-            self.settings_dialog.update_cache_size()
-
     def optimize_performance(self):
         current_browser = self.tabs.currentWidget()
         for i in range(self.tabs.count()):
@@ -1217,19 +2013,81 @@ class MojoBrowser(QMainWindow):
         self.download_path = QDir.homePath() + "/Downloads"
         if not os.path.exists(self.download_path):
             os.makedirs(self.download_path)
-        profile = QWebEngineProfile.defaultProfile()
-        profile.downloadRequested.connect(self.handle_download)
         QWebEngineProfile.defaultProfile().setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies) 
+        QTimer.singleShot(0, self.resume_segmented_downloads)
+
+    def show_download_dialog(self):
+        if not self.download_dialog or not self.download_dialog.isVisible():
+            self.download_dialog = DownloadDialog(self)
+            self.download_dialog.show()
+        return self.download_dialog
 
     def handle_download(self, download):
+        if download.isSavePageDownload():
+            download.accept()
+            self.downloads[download] = download
+            archive_save = self.pending_archive_saves.pop(os.path.abspath(download.path()), None)
+            if archive_save:
+                download.finished.connect(lambda: self.on_archive_download_finished(download, *archive_save))
+            else:
+                self.show_download_dialog().add_download(download)
+            return
         suggested_path = os.path.join(self.download_path, download.suggestedFileName())
+        if self.should_segment_download(download):
+            download.cancel()
+            url = download.url().toString()
+            self.start_segmented_download(SegmentedDownload(url, suggested_path, session=self.get_download_session(), expected_sha256=expected_checksum(url)))
+            return
         download.setPath(suggested_path)
         download.accept()
-        if not self.download_dialog or not self.download_dialog.isVisible():
-            self.download_dialog = DownloadDialog(self)
-            self.download_dialog.show()
         self.downloads[download] = download
-        self.download_dialog.add_download(download)
+        job = WebEngineJob(download)
+        self.show_download_dialog().add_download(download, job)
+        self.download_scheduler.submit(job)
+
+    def should_segment_download(self, download):
+        return (
+            self.segmented_downloads
+            and not download.isSavePageDownload()
+            and download.url().scheme() in ("http", "https")
+            and download.totalBytes() >= SEGMENTED_DOWNLOAD_THRESHOLD
+        )
+
+    def get_download_session(self):
+        if not self.download_session:
+            self.download_session = create_session(user_agent=QWebEngineProfile.defaultProfile().httpUserAgent())
+        proxy = self.privacy_engine.proxy_settings
+        if proxy:
+            proxy_url = f"http://{proxy.hostName()}:{proxy.port()}"
+            self.download_session.proxies = {"http": proxy_url, "https": proxy_url}
+        else:
+            self.download_session.proxies = {}
+        return self.download_session
+
+    def start_segmented_download(self, segmented_download):
+        worker = SegmentedDownloadThread(segmented_download)
+        self.segmented_download_threads.append(worker)
+        worker.finished.connect(lambda: self.release_segmented_download(worker))
+        job = SegmentedJob(worker, self.download_scheduler.global_bucket)
+        self.show_download_dialog().add_segmented_download(job)
+        self.download_scheduler.submit(job)
+
+    def release_segmented_download(self, worker):
+        if worker.cancelled or not os.path.exists(worker.download.journal_path):
+            if worker in self.segmented_download_threads:
+                self.segmented_download_threads.remove(worker)
+
+    def resume_segmented_downloads(self):
+        if not self.segmented_downloads:
+            return
+        journals = find_journals(self.download_path)
+        for journal_path in journals:
+            try:
+                self.start_segmented_download(SegmentedDownload.from_journal(journal_path, session=self.get_download_session()))
+            except Exception as e:
+                self.statusBar().showMessage(f"Could not resume {os.path.basename(journal_path)}: {str(e)}", 5000)
+        if journals:
+            self.statusBar().showMessage(f"Resuming {len(journals)} interrupted download(s)", 5000)
 
     def suspend_inactive_tabs(self):
         current_browser = self.tabs.currentWidget()
@@ -1246,151 +2104,14 @@ class MojoBrowser(QMainWindow):
                 QMessageBox.warning(self, "JavaScript Disabled", "Reader Mode requires JavaScript.", QMessageBox.Ok)
             return
 
-        if getattr(browser, 'reader_mode_active', False):
-            browser.page().runJavaScript("""
-            var orig = document.getElementById('original-content');
-            if (orig) {
-                document.body.innerHTML = orig.innerHTML;
-                document.body.removeAttribute('style');
-                orig.remove();
-                window.scrollTo(0, window.readerScroll || 0);
-            }
-            """)
-            browser.reader_mode_active = False
-            self.statusBar().showMessage("Reader Mode Off", 2000)
-            return
-
-        browser.page().runJavaScript("""
-        var orig = document.createElement('div');
-        orig.id = 'original-content';
-        orig.style.display = 'none';
-        orig.innerHTML = document.body.innerHTML;
-        document.body.appendChild(orig);
-        window.readerScroll = window.scrollY;
-        """)
-
-        reader_js = """
-        (function() {
-            function getContent() {
-                const tags = ['article','main','[role="main"]','.content','.post','.article-body',
-                    '.story-body','.entry-content','#main-content','.post-content','.article__content',
-                    '[itemprop="articleBody"]','.zn-body__paragraph','.storytext','.post-body',
-                    '#article-content','.entry','.wp-post-content','.articleBody','.article-content',
-                    '.td-post-content'];
-                let best = null, max = 0;
-                for (let i = 0; i < tags.length; i++) {
-                    const els = document.querySelectorAll(tags[i]);
-                    for (let j = 0; j < els.length; j++) {
-                        const el = els[j], len = el.textContent.length, ps = el.getElementsByTagName('p').length;
-                        const score = len + ps * 60;
-                        if (score > max && len > 100) {
-                            best = el;
-                            max = score;
-                        }
-                    }
-                }
-                if (!best) {
-                    const ps = document.getElementsByTagName('p'), div = document.createElement('div');
-                    let count = 0;
-                    for (let i = 0; i < ps.length && count < 20; i++) {
-                        if (ps[i].textContent.length > 40) {
-                            div.appendChild(ps[i].cloneNode(true));
-                            count++;
-                        }
-                    }
-                    return count > 1 ? div : document.body.cloneNode(true);
-                }
-                return best.cloneNode(true);
-            }
-
-            const content = getContent(), remove = ['script','style','nav','header','footer','aside',
-                'form','button','input','select','textarea','[class*="ad"]','[id*="ad"]',
-                '[class*="banner"]','[id*="banner"]','[class*="sidebar"]','[role="complementary"]',
-                '[aria-hidden="true"]','[class*="comment"]','[id*="comment"]','[class*="widget"]',
-                '[id*="widget"]','.social-share','.related-posts','.author-bio'];
-            for (let i = 0; i < remove.length; i++) {
-                const els = content.querySelectorAll(remove[i]);
-                for (let j = els.length - 1; j >= 0; j--) els[j].remove();
-            }
-
-            const media = content.querySelectorAll('img,video,picture');
-            for (let i = 0, m = 0; i < media.length && m < 8; i++) {
-                const el = media[i];
-                if (el.tagName === 'IMG' || el.tagName === 'PICTURE') {
-                    const img = el.tagName === 'PICTURE' ? el.querySelector('img') : el;
-                    if (img) {
-                        img.src = img.src || img.getAttribute('data-src') || '';
-                        img.srcset = '';
-                    }
-                } else if (el.tagName === 'VIDEO') el.controls = true;
-                m++;
-                if (m === 8) while (++i < media.length) media[i].remove();
-            }
-
-            const title = document.querySelector('h1,h2,[class*="title"],[id*="title"],.headline,' +
-                '.post-title,[itemprop="headline"],.entry-title,.article-header') || document.createElement('h1');
-            title.textContent = title.textContent.trim() || document.title.split(/[-|–]/)[0].trim();
-
-            const div = document.createElement('div');
-            div.id = 'reader-content';
-            div.appendChild(title.cloneNode(true));
-            div.appendChild(content);
-
-            document.body.innerHTML = '';
-            document.body.style.cssText = 'background:#f7fafc;margin:0;padding:0';
-            document.body.appendChild(div);
-
-            const css = document.createElement('style');
-            css.textContent = '#reader-content{margin:30px auto;padding:20px;background:#fff;max-width:900px;}' +
-                'h1{font-size:32px;margin:0 0 20px;color:#111827;}' +
-                'p{font-size:17px;margin:0 0 15px;color:#1f2a44;line-height:1.7;}' +
-                'h2,h3,h4,h5,h6{color:#374151;margin:20px 0 10px;}' +
-                'h2{font-size:26px;}h3{font-size:22px;}' +
-                'img,video{max-width:100%;margin:15px auto;display:block;}' +
-                'a{color:#2563eb;text-decoration:none;}' +
-                'a:hover{color:#2563eb;text-decoration:none;}' +
-                'blockquote{margin:15px 0;padding:10px 15px;border-left:4px solid #e5e7eb;background:#f9fafb;color:#4b5563;}' +
-                'pre{background:#f4f4f5;padding:10px;overflow-x:auto;}';
-            document.head.appendChild(css);
-
-            window.scrollTo(0, 0);
-
-            const controls = document.createElement('div');
-            controls.id = 'reader-controls';
-            controls.style.cssText = 'position:fixed;top:10px;right:10px;background:#fff;padding:10px;border-radius:5px;box-shadow:0 0 10px rgba(0,0,0,0.1);z-index:1000;';
-            controls.innerHTML = `
-                <label for="font-size">Font Size:</label>
-                <input type="range" id="font-size" name="font-size" min="12" max="36" value="17">
-                <label for="font-family">Font:</label>
-                <select id="font-family" name="font-family">
-                    <option value="Arial">Arial</option>
-                    <option value="Georgia">Georgia</option>
-                    <option value="Times New Roman">Times New Roman</option>
-                    <option value="Verdana">Verdana</option>
-                </select>
-                <label for="bg-color">Background:</label>
-                <input type="color" id="bg-color" name="bg-color" value="#f7fafc">
-            `;
-            document.body.appendChild(controls);
-
-            document.getElementById('font-size').addEventListener('input', function() {
-                document.querySelector('#reader-content').style.fontSize = this.value + 'px';
-            });
+        def on_toggled(active):
+            if active is None:
+                self.statusBar().showMessage("Reader Mode is not available on this page", 2000)
+                return
+            browser.reader_mode_active = active
+            self.statusBar().showMessage("Reader Mode On" if active else "Reader Mode Off", 2000)
 
-            document.getElementById('font-family').addEventListener('change', function() {
-                document.querySelector('#reader-content').style.fontFamily = this.value;
-            });
-
-            document.getElementById('bg-color').addEventListener('input', function() {
-                document.querySelector('#reader-content').style.backgroundColor = this.value;
-            });
-        })();
-        """
-        browser.page().runJavaScript(reader_js, lambda _: setattr(browser, 'reader_mode_active', True))
-        self.statusBar().showMessage("Reader Mode On", 2000)
-        browser.page().runJavaScript(reader_js)
-        browser.reader_mode_active = True
-        self.statusBar().showMessage("Reader Mode Enabled", 2000)
+        self.reader_mode.toggle(browser.page(), on_toggled)
 
     def switch_profile(self):
         profile_name, ok = QInputDialog.getItem(self, "Switch Profile", "Select Profile:", list(self.profiles.keys()) + ["New Profile"], 0, False)
@@ -1400,6 +2121,7 @@ class MojoBrowser(QMainWindow):
             profile_name, ok = QInputDialog.getText(self, "New Profile", "Profile Name:")
             if ok and profile_name and profile_name not in self.profiles:
                 self.profiles[profile_name] = QWebEngineProfile(profile_name, self)
+                self.prepare_profile(profile_name, self.profiles[profile_name])
         if profile_name in self.profiles:
             browser = self.tabs.currentWidget()
             if browser:
@@ -1418,13 +2140,65 @@ class MojoBrowser(QMainWindow):
         menu.addAction("Forward", self.browser_forward)
         menu.addAction("Reload", self.browser_reload)
         menu.addAction("Copy URL", lambda: QApplication.clipboard().setText(browser.url().toString()))
-        menu.addAction("Save Page As...", lambda: browser.page().save(f"{self.download_path}/page.html", QWebEngineDownloadItem.SingleHtmlSaveFormat))
+        menu.addAction("Save Page As...", lambda: self.save_page_as(browser))
+        menu.addAction("Save Page Offline", lambda: self.save_page_offline(browser))
+        menu.addAction("Save to Reading List", lambda: self.save_to_reading_list(browser))
         menu.exec_(browser.mapToGlobal(pos))
 
+    def save_page_as(self, browser):
+        page = browser.page()
+        name = re.sub(r'[\\/:*?"<>|]+', "_", page.title()).strip() or "page"
+        formats = [
+            ("Web Page, Single File (*.mhtml)", QWebEngineDownloadItem.MimeHtmlSaveFormat, ".mhtml"),
+            ("Web Page, Complete (*.html)", QWebEngineDownloadItem.CompleteHtmlSaveFormat, ".html"),
+            ("Web Page, HTML Only (*.html)", QWebEngineDownloadItem.SingleHtmlSaveFormat, ".html")
+        ]
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Save Page As", os.path.join(self.download_path, f"{name}.mhtml"), ";;".join(label for label, _, _ in formats)
+        )
+        if not path:
+            return
+        _, save_format, extension = next((f for f in formats if f[0] == selected), formats[0])
+        if not os.path.splitext(path)[1]:
+            path += extension
+        page.save(path, save_format)
+
+    def save_page_offline(self, browser):
+        incoming = os.path.abspath(os.path.join(self.offline_archive.root, "incoming"))
+        os.makedirs(incoming, exist_ok=True)
+        path = os.path.join(incoming, f"{int(time.time() * 1000)}.mhtml")
+        self.pending_archive_saves[path] = (browser.url().toString(), browser.page().title())
+        browser.page().save(path, QWebEngineDownloadItem.MimeHtmlSaveFormat)
+        self.statusBar().showMessage("Saving page for offline reading...", 2000)
+
+    def on_archive_download_finished(self, download, url, title):
+        if download.state() != QWebEngineDownloadItem.DownloadCompleted:
+            self.statusBar().showMessage(f"Failed to save page offline: {download.interruptReasonString()}", 3000)
+            return
+        self.archive_file(download.path(), url, title, remove_source=True)
+
+    def archive_file(self, path, url, title, on_saved=None, remove_source=False):
+        worker = ArchiveWorker(self.offline_archive, path, url, title, remove_source)
+        worker.saved.connect(lambda record: self.statusBar().showMessage(f"Saved offline: {record['title']}", 3000))
+        if on_saved:
+            worker.saved.connect(lambda _: on_saved())
+        worker.failed.connect(lambda error: QMessageBox.warning(self, "Error", f"Failed to save page offline: {error}", QMessageBox.Ok))
+        worker.finished.connect(lambda: self.archive_workers.remove(worker))
+        self.archive_workers.append(worker)
+        worker.start()
+
+    def maintain_archive(self, page_ids=(), on_done=None, measure=False):
+        worker = ArchiveMaintenanceWorker(self.offline_archive, page_ids, measure)
+        if on_done:
+            worker.completed.connect(on_done)
+        worker.finished.connect(lambda: self.archive_workers.remove(worker))
+        self.archive_workers.append(worker)
+        worker.start()
+
 class SettingsPersistence:
     def __init__(self, parent):
         self.parent = parent
-        self.data_manager = DataManager()
+        self.data_manager = parent.data_manager
         self.privacy_settings = self.data_manager.get_browser_settings().get("privacy_settings", {
             "do_not_track": True,
             "block_third_party_cookies": True,
@@ -1449,6 +2223,15 @@ class SettingsPersistence:
         self.parent.hardware_acceleration = settings.get("hardware_acceleration", True)
         self.parent.preload_pages = settings.get("preload_pages", False)
         self.parent.cache_size_limit = settings.get("cache_size_limit", "250 MB")
+        self.parent.segmented_downloads = settings.get("segmented_downloads", False)
+        self.parent.max_active_downloads = settings.get("max_active_downloads", 3)
+        self.parent.download_rate_limit = settings.get("download_rate_limit", 0)
+        self.parent.download_postprocessing = settings.get("download_postprocessing", {})
+        self.parent.extension_hot_reload = settings.get("extension_hot_reload", True)
+        self.parent.extension_budget_ms = settings.get("extension_budget_ms", 50)
+        self.parent.extension_auto_disable = settings.get("extension_auto_disable", False)
+        self.parent.reading_list_prefetch = settings.get("reading_list_prefetch", True)
+        self.parent.reading_list_metered = settings.get("reading_list_metered", False)
         self.privacy_settings.update(settings.get("privacy_settings", {}))
 
     def save_settings(self):
@@ -1463,27 +2246,78 @@ class SettingsPersistence:
             "hardware_acceleration": self.parent.hardware_acceleration,
             "preload_pages": self.parent.preload_pages,
             "cache_size_limit": self.parent.cache_size_limit,
+            "segmented_downloads": self.parent.segmented_downloads,
+            "max_active_downloads": self.parent.max_active_downloads,
+            "download_rate_limit": self.parent.download_rate_limit,
+            "download_postprocessing": self.parent.download_postprocessing,
+            "extension_hot_reload": self.parent.extension_hot_reload,
+            "extension_budget_ms": self.parent.extension_budget_ms,
+            "extension_auto_disable": self.parent.extension_auto_disable,
+            "reading_list_prefetch": self.parent.reading_list_prefetch,
+            "reading_list_metered": self.parent.reading_list_metered,
             "privacy_settings": self.privacy_settings
         })
 
     def load_bookmarks(self):
-        self.parent.bookmarks = self.data_manager.get_bookmarks()
-
-    def save_bookmarks(self):
-        self.data_manager.set_bookmarks(self.parent.bookmarks)
+        self.parent.bookmark_store = BookmarkStore(data_manager=self.data_manager)
+        self.bookmark_worker = None
 
     def add_bookmark(self):
         browser = self.parent.tabs.currentWidget()
         if not browser:
             return
         current_url = browser.url().toString()
-        title, ok = QInputDialog.getText(self.parent, "Add Bookmark", "Bookmark name:", text=browser.page().title())
-        if ok and current_url not in [b["url"] for b in self.parent.bookmarks]:
-            self.parent.bookmarks.append({"url": current_url, "title": title})
-            self.save_bookmarks()
-            QMessageBox.information(self.parent, "Bookmark Added", f"Bookmarked: {title}", QMessageBox.Ok)
-        else:
+        store = self.parent.bookmark_store
+        if current_url in store:
             QMessageBox.information(self.parent, "Bookmark Exists", "This URL is already bookmarked.", QMessageBox.Ok)
+            return
+
+        dialog = QDialog(self.parent)
+        dialog.setWindowTitle("Add Bookmark")
+        dialog.setFont(UI_FONT)
+        layout = QFormLayout()
+        title_input = QLineEdit(browser.page().title())
+        title_input.setStyleSheet(self.parent.get_input_style())
+        folder_combo = QComboBox()
+        folder_combo.setEditable(True)
+        folder_combo.addItems([path for _, path in store.folders()])
+        folder_combo.setStyleSheet(self.parent.get_input_style())
+        tags_input = QLineEdit()
+        tags_input.setStyleSheet(self.parent.get_input_style())
+        tags_input.setPlaceholderText("Comma separated")
+        layout.addRow("Name:", title_input)
+        layout.addRow("Folder:", folder_combo)
+        layout.addRow("Tags:", tags_input)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        dialog.setLayout(layout)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        title = title_input.text().strip() or current_url
+        folder_id = store.ensure_folder_path(folder_combo.currentText())
+        tags = [t.strip() for t in tags_input.text().split(",") if t.strip()]
+        store.add_bookmark(current_url, title, folder_id, tags)
+        self.parent.omnibox_index.set_bookmarked(current_url, True, title)
+        QMessageBox.information(self.parent, "Bookmark Added", f"Bookmarked: {title}", QMessageBox.Ok)
+
+    def create_list_view(self, model, layout, open_handler):
+        filter_input = QLineEdit()
+        filter_input.setStyleSheet(self.parent.get_input_style())
+        filter_input.setPlaceholderText("Filter...")
+        filter_input.setClearButtonEnabled(True)
+        filter_input.textChanged.connect(model.set_filter)
+        layout.addWidget(filter_input)
+
+        list_view = QListView()
+        list_view.setStyleSheet(self.parent.get_list_style())
+        list_view.setUniformItemSizes(True)
+        list_view.setModel(model)
+        list_view.doubleClicked.connect(lambda _: open_handler(list_view))
+        layout.addWidget(list_view)
+        return list_view
 
     def view_bookmarks(self):
         dialog = QDialog(self.parent)
@@ -1494,13 +2328,12 @@ class SettingsPersistence:
         layout.setContentsMargins(15, 15, 15, 15)
         layout.setSpacing(12)
 
-        bookmarks_list = QListWidget()
-        bookmarks_list.setStyleSheet(self.parent.get_list_style())
-        for bookmark in self.parent.bookmarks:
-            item = QListWidgetItem(f"{bookmark['title']} - {bookmark['url']}")
-            item.setData(Qt.UserRole, bookmark["url"])
-            bookmarks_list.addItem(item)
-        layout.addWidget(bookmarks_list)
+        store = self.parent.bookmark_store
+        model = PagedListModel(store.bookmarks(), store.describe, parent=dialog)
+        bookmarks_list = self.create_list_view(model, layout, self.open_selected_bookmark)
+        import_progress = QProgressBar()
+        import_progress.setVisible(False)
+        layout.addWidget(import_progress)
 
         buttons_layout = QHBoxLayout()
         open_button = QPushButton("Open")
@@ -1509,9 +2342,17 @@ class SettingsPersistence:
         delete_button = QPushButton("Delete")
         delete_button.setStyleSheet(self.parent.get_button_style("#EF4444", "#F87171", "#DC2626"))
         delete_button.clicked.connect(lambda: self.delete_selected_bookmark(bookmarks_list))
+        import_button = QPushButton("Import...")
+        import_button.setStyleSheet(self.parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        import_button.clicked.connect(lambda: self.import_bookmarks(dialog, model, import_progress))
+        export_button = QPushButton("Export...")
+        export_button.setStyleSheet(self.parent.get_button_style(SECONDARY_COLOR, "#6B7280", "#374151"))
+        export_button.clicked.connect(lambda: self.export_bookmarks(dialog))
         buttons_layout.addWidget(open_button)
         buttons_layout.addWidget(delete_button)
         buttons_layout.addStretch()
+        buttons_layout.addWidget(import_button)
+        buttons_layout.addWidget(export_button)
         layout.addLayout(buttons_layout)
 
         close_button = QPushButton("Close")
@@ -1522,10 +2363,57 @@ class SettingsPersistence:
         dialog.setLayout(layout)
         dialog.exec_()
 
+    def import_bookmarks(self, dialog, model, progress_bar):
+        if self.bookmark_worker and self.bookmark_worker.isRunning():
+            QMessageBox.information(dialog, "Bookmarks Busy", "A bookmark import or export is already running.", QMessageBox.Ok)
+            return
+        path, _ = QFileDialog.getOpenFileName(dialog, "Import Bookmarks", QDir.homePath(), "Bookmark Files (*.html *.htm);;All Files (*)")
+        if not path:
+            return
+        store = self.parent.bookmark_store
+        session = store.begin_import(store.ensure_folder_path("Imported"))
+        worker = BookmarkImportWorker(path)
+
+        def apply_batch(events):
+            added = session.apply(events)
+            self.parent.omnibox_index.load([(b["url"], b["title"], None, True) for b in added])
+
+        def update_progress(done, total):
+            progress_bar.setMaximum(total)
+            progress_bar.setValue(done)
+
+        def finish():
+            count = session.finish()
+            progress_bar.setVisible(False)
+            model.set_rows(store.bookmarks())
+            self.parent.statusBar().showMessage(f"Imported {count} bookmarks ({session.skipped} duplicates skipped)", 5000)
+
+        worker.batch.connect(apply_batch)
+        worker.progress.connect(update_progress)
+        worker.failed.connect(lambda error: QMessageBox.warning(dialog, "Import Failed", f"Could not import bookmarks: {error}", QMessageBox.Ok))
+        worker.finished.connect(finish)
+        progress_bar.setValue(0)
+        progress_bar.setVisible(True)
+        self.bookmark_worker = worker
+        worker.start()
+
+    def export_bookmarks(self, dialog):
+        if self.bookmark_worker and self.bookmark_worker.isRunning():
+            QMessageBox.information(dialog, "Bookmarks Busy", "A bookmark import or export is already running.", QMessageBox.Ok)
+            return
+        path, _ = QFileDialog.getSaveFileName(dialog, "Export Bookmarks", os.path.join(QDir.homePath(), "bookmarks.html"), "Bookmark Files (*.html)")
+        if not path:
+            return
+        worker = BookmarkExportWorker(path, self.parent.bookmark_store.export_entries())
+        worker.failed.connect(lambda error: QMessageBox.warning(dialog, "Export Failed", f"Could not export bookmarks: {error}", QMessageBox.Ok))
+        worker.finished.connect(lambda: self.parent.statusBar().showMessage(f"Bookmarks exported to {path}", 5000))
+        self.bookmark_worker = worker
+        worker.start()
+
     def open_selected_bookmark(self, bookmarks_list):
-        selected = bookmarks_list.currentItem()
-        if selected:
-            url = selected.data(Qt.UserRole)
+        selected = bookmarks_list.currentIndex()
+        if selected.isValid():
+            url = selected.data(Qt.UserRole)["url"]
             browser = self.parent.tabs.currentWidget()
             if browser:
                 browser.setUrl(QUrl(url))
@@ -1533,12 +2421,12 @@ class SettingsPersistence:
                 self.parent.add_new_tab(QUrl(url))
 
     def delete_selected_bookmark(self, bookmarks_list):
-        selected = bookmarks_list.currentItem()
-        if selected:
-            url = selected.data(Qt.UserRole)
-            self.parent.bookmarks = [b for b in self.parent.bookmarks if b["url"] != url]
-            self.save_bookmarks()
-            bookmarks_list.takeItem(bookmarks_list.row(selected))
+        selected = bookmarks_list.currentIndex()
+        if selected.isValid():
+            bookmark = bookmarks_list.model().remove_row(selected.row())
+            if bookmark:
+                self.parent.bookmark_store.remove(bookmark["id"])
+                self.parent.omnibox_index.set_bookmarked(bookmark["url"], False)
 
     def load_history(self):
         self.parent.history = self.data_manager.get_history()
@@ -1555,13 +2443,8 @@ class SettingsPersistence:
         layout.setContentsMargins(15, 15, 15, 15)
         layout.setSpacing(12)
 
-        history_list = QListWidget()
-        history_list.setStyleSheet(self.parent.get_list_style())
-        for url in self.parent.history:
-            item = QListWidgetItem(url)
-            item.setData(Qt.UserRole, url)
-            history_list.addItem(item)
-        layout.addWidget(history_list)
+        model = PagedListModel(self.parent.history, str, parent=dialog)
+        history_list = self.create_list_view(model, layout, self.open_selected_history)
 
         buttons_layout = QHBoxLayout()
         open_button = QPushButton("Open")
@@ -1584,8 +2467,8 @@ class SettingsPersistence:
         dialog.exec_()
 
     def open_selected_history(self, history_list):
-        selected = history_list.currentItem()
-        if selected:
+        selected = history_list.currentIndex()
+        if selected.isValid():
             url = selected.data(Qt.UserRole)
             browser = self.parent.tabs.currentWidget()
             if browser:
@@ -1594,24 +2477,36 @@ class SettingsPersistence:
                 self.parent.add_new_tab(QUrl(url))
 
     def delete_selected_history(self, history_list):
-        selected = history_list.currentItem()
-        if selected:
-            url = selected.data(Qt.UserRole)
-            self.parent.history = [h for h in self.parent.history if h != url]
-            self.save_history()
-            history_list.takeItem(history_list.row(selected))
+        selected = history_list.currentIndex()
+        if selected.isValid():
+            model = history_list.model()
+            url = model.remove_row(selected.row())
+            if url:
+                model.remove_item(url)
+                self.save_history()
+                self.parent.omnibox_index.forget_visits(url)
 
     def clear_all_private_data(self):
         QWebEngineProfile.defaultProfile().clearHttpCache()
         QWebEngineProfile.defaultProfile().clearAllVisitedLinks()
-        self.parent.bookmarks.clear()
+        self.parent.bookmark_store.clear()
         self.parent.history.clear()
-        self.save_bookmarks()
+        self.parent.closed_tabs.clear()
+        self.parent.omnibox_index.clear()
+        self.parent.reader_mode.clear()
+        self.parent.reading_list_prefetcher.clear()
+        self.parent.download_history.clear()
+        self.parent.telemetry.clear()
         self.save_history()
         QMessageBox.information(self.parent, "Data Cleared", "All private data has been cleared.", QMessageBox.Ok)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    options, qt_argv = parse_startup_args(sys.argv)
+    startup = StartupTimer(STARTUP_ORIGIN, options.startup_budget)
+    startup.record("imports", 0)
+    startup_start = startup.elapsed_ms()
+    register_archive_scheme()
+    app = QApplication(qt_argv)
     app.setStyle("Fusion")
     app.setFont(UI_FONT)
 
@@ -1623,7 +2518,12 @@ if __name__ == "__main__":
     palette.setColor(QPalette.Button, QColor(PRIMARY_COLOR))
     palette.setColor(QPalette.ButtonText, QColor(TEXT_COLOR))
     app.setPalette(palette)
-
-    browser = MojoBrowser()
-    browser.show()
+    app.aboutToQuit.connect(get_client().close)
+    startup.record("application", startup_start)
+    if options.startup_report:
+        startup.completed.connect(lambda: print(startup.report(options.startup_report), flush=True))
+
+    browser = MojoBrowser(startup)
+    with startup.phase("show"):
+        browser.show()
     sys.exit(app.exec_())
@@ -0,0 +1,342 @@
+import os
+import re
+import gzip
+import json
+import time
+import email
+import codecs
+import hashlib
+import logging
+import mimetypes
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from email import policy
+from PyQt5.QtCore import QBuffer, QIODevice, QThread, QUrl, pyqtSignal
+from PyQt5.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEME = "mojo-archive"
+MHTML_FORMAT = "mhtml"
+COMPLETE_FORMAT = "complete"
+READER_FORMAT = "reader"
+ARTICLE_ENTRY = "index.html"
+TEXT_TYPES = ("text/html", "text/css", "image/svg+xml")
+
+def register_archive_scheme():
+    scheme = QWebEngineUrlScheme(ARCHIVE_SCHEME.encode())
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalScheme)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+def archive_url(page_id, key):
+    return f"{ARCHIVE_SCHEME}://{page_id}/{key}"
+
+class OfflineArchive:
+    def __init__(self, root="archive", level=None):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.index_path = os.path.join(root, "index.json")
+        self.codec = "zst" if zstandard else "gz"
+        self.level = level if level is not None else (10 if zstandard else 6)
+        self.lock = threading.RLock()
+        self.pending = Counter()
+        self.pages = {}
+        self.patterns = {}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.pages = json.load(f).get("pages", {})
+        except Exception as e:
+            logger.error(f"Failed to load offline archive index: {str(e)}")
+            self.pages = {}
+
+    def save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "pages": self.pages}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def blob_path(self, digest, codec):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest[2:]}.{codec}")
+
+    @contextmanager
+    def pinned(self):
+        pins = []
+        try:
+            yield pins
+        finally:
+            with self.lock:
+                self.pending.subtract(pins)
+                for digest in set(pins):
+                    if self.pending[digest] <= 0:
+                        del self.pending[digest]
+
+    def put_blob(self, data, pins=None):
+        digest = hashlib.sha256(data).hexdigest()
+        if pins is not None:
+            with self.lock:
+                self.pending[digest] += 1
+            pins.append(digest)
+        if any(os.path.exists(self.blob_path(digest, codec)) for codec in ("zst", "gz")):
+            return digest, False
+        path = self.blob_path(digest, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.codec == "zst":
+            compressed = zstandard.ZstdCompressor(level=self.level).compress(data)
+        else:
+            compressed = gzip.compress(data, self.level)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest, True
+
+    def get_blob(self, digest):
+        path = self.blob_path(digest, "zst")
+        if os.path.exists(path):
+            if not zstandard:
+                raise RuntimeError("zstandard is required to read this archived resource")
+            with open(path, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read())
+        with gzip.open(self.blob_path(digest, "gz"), "rb") as f:
+            return f.read()
+
+    def ingest(self, path, url, title=None):
+        if path.lower().endswith((".mhtml", ".mht")):
+            return self.ingest_mhtml(path, url, title)
+        return self.ingest_complete(path, url, title)
+
+    def ingest_mhtml(self, path, url, title=None):
+        with open(path, "rb") as f:
+            message = email.message_from_binary_file(f, policy=policy.default)
+        snapshot_location = message.get("Snapshot-Content-Location")
+        resources, locations = {}, {}
+        entry = None
+        stored = 0
+        with self.pinned() as pins:
+            for part in message.walk():
+                if part.is_multipart():
+                    continue
+                data = part.get_payload(decode=True) or b""
+                digest, added = self.put_blob(data, pins)
+                stored += added
+                key = f"r/{len(resources)}"
+                mime = part.get_content_type()
+                charset = part.get_content_charset()
+                resources[key] = [digest, f"{mime}; charset={charset}" if charset else mime]
+                location = part.get("Content-Location")
+                if location:
+                    locations[location] = key
+                content_id = part.get("Content-ID")
+                if content_id:
+                    locations[f"cid:{content_id.strip('<>')}"] = key
+                if entry is None and mime == "text/html" and (not snapshot_location or location == snapshot_location):
+                    entry = key
+            if entry is None:
+                entry = next((key for key, (_, mime) in resources.items() if mime.startswith("text/html")), None)
+            if entry is None:
+                raise ValueError("MHTML file contains no HTML document")
+            return self.add_page(url or snapshot_location or path, title or message.get("Subject"), MHTML_FORMAT, entry, resources, locations, stored)
+
+    def ingest_complete(self, path, url, title=None):
+        base = os.path.dirname(os.path.abspath(path))
+        files = [os.path.abspath(path)]
+        resource_dir = os.path.splitext(os.path.abspath(path))[0] + "_files"
+        for dirpath, _, filenames in os.walk(resource_dir):
+            files.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+        resources = {}
+        stored = 0
+        with self.pinned() as pins:
+            for file_path in files:
+                with open(file_path, "rb") as f:
+                    digest, added = self.put_blob(f.read(), pins)
+                stored += added
+                key = os.path.relpath(file_path, base).replace(os.sep, "/")
+                resources[key] = [digest, mimetypes.guess_type(file_path)[0] or "application/octet-stream"]
+            entry = os.path.basename(path)
+            return self.add_page(url or path, title, COMPLETE_FORMAT, entry, resources, {}, stored)
+
+    def ingest_article(self, url, title, html, images):
+        with self.pinned() as pins:
+            digest, added = self.put_blob(html.encode("utf-8"), pins)
+            resources = {ARTICLE_ENTRY: [digest, "text/html; charset=utf-8"]}
+            stored = int(added)
+            for key, mime, data in images:
+                digest, added = self.put_blob(data, pins)
+                stored += added
+                resources[key] = [digest, mime]
+            return self.add_page(url, title, READER_FORMAT, ARTICLE_ENTRY, resources, {}, stored)
+
+    def add_page(self, url, title, page_format, entry, resources, locations, stored):
+        saved = time.time()
+        page_id = hashlib.sha256(f"{url}\n{saved}".encode()).hexdigest()[:16]
+        record = {
+            "id": page_id,
+            "url": url,
+            "title": title or url,
+            "saved": round(saved, 3),
+            "format": page_format,
+            "entry": entry,
+            "resources": resources,
+            "locations": locations,
+            "new_blobs": stored
+        }
+        with self.lock:
+            self.pages[page_id] = record
+            self.save_index()
+        logger.info(f"Archived {url} as {page_id}: {len(resources)} resources, {stored} new blobs")
+        return record
+
+    def list_pages(self, url=None):
+        with self.lock:
+            pages = [page for page in self.pages.values() if url is None or page["url"] == url]
+        return sorted(pages, key=lambda page: page["saved"], reverse=True)
+
+    def latest(self, url):
+        pages = self.list_pages(url)
+        return pages[0] if pages else None
+
+    def page_url(self, page_id):
+        page = self.pages.get(page_id)
+        return QUrl(archive_url(page_id, page["entry"])) if page else None
+
+    def resolve(self, page_id, key):
+        page = self.pages.get(page_id)
+        if not page or key not in page["resources"]:
+            return None
+        digest, mime = page["resources"][key]
+        data = self.get_blob(digest)
+        if page["locations"] and mime.split(";")[0] in TEXT_TYPES:
+            data = self.rewrite(page, data)
+        return mime, data
+
+    def rewrite(self, page, data):
+        replacements = {}
+        for location, key in page["locations"].items():
+            target = archive_url(page["id"], key).encode()
+            replacements[location.encode()] = target
+            replacements[location.replace("&", "&amp;").encode()] = target
+        pattern = self.patterns.get(page["id"])
+        if pattern is None:
+            pattern = re.compile(b"|".join(re.escape(location) for location in sorted(replacements, key=len, reverse=True)))
+            self.patterns[page["id"]] = pattern
+        return pattern.sub(lambda match: replacements[match.group(0)], data)
+
+    def delete(self, page_id):
+        with self.lock:
+            if self.pages.pop(page_id, None) is None:
+                return 0
+            self.patterns.pop(page_id, None)
+            self.save_index()
+            return self.collect_garbage()
+
+    def collect_garbage(self):
+        with self.lock:
+            referenced = {digest for page in self.pages.values() for digest, _ in page["resources"].values()}
+            removed = 0
+            for dirpath, _, filenames in os.walk(self.blob_dir):
+                for name in filenames:
+                    digest = os.path.basename(dirpath) + name.split(".")[0]
+                    if name.endswith(".tmp") or digest in self.pending:
+                        continue
+                    if digest not in referenced:
+                        try:
+                            os.remove(os.path.join(dirpath, name))
+                            removed += 1
+                        except OSError as e:
+                            logger.warning(f"Failed to remove archived blob {name}: {str(e)}")
+            return removed
+
+    def disk_usage(self):
+        total = 0
+        for dirpath, _, filenames in os.walk(self.blob_dir):
+            for name in filenames:
+                total += os.path.getsize(os.path.join(dirpath, name))
+        return total
+
+class ArchiveSchemeHandler(QWebEngineUrlSchemeHandler):
+    def __init__(self, archive, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        try:
+            resolved = self.archive.resolve(url.host(), url.path().lstrip("/"))
+        except Exception as e:
+            logger.error(f"Failed to serve {url.toString()}: {str(e)}")
+            job.fail(QWebEngineUrlRequestJob.RequestFailed)
+            return
+        if resolved is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+        mime, data = resolved
+        content_type, _, params = mime.partition(";")
+        content_type = content_type.strip()
+        charset = params.strip()[len("charset="):] if params.strip().lower().startswith("charset=") else None
+        if charset and content_type in TEXT_TYPES:
+            try:
+                data = codecs.BOM_UTF8 + data.decode(charset, errors="replace").lstrip("\ufeff").encode("utf-8")
+            except LookupError:
+                logger.warning(f"Unknown charset {charset} for {url.toString()}")
+        buffer = QBuffer(job)
+        buffer.setData(data)
+        buffer.open(QIODevice.ReadOnly)
+        job.reply(content_type.encode(), buffer)
+
+class ArchiveWorker(QThread):
+    saved = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, archive, path, url, title=None, remove_source=False):
+        super().__init__()
+        self.archive = archive
+        self.path = path
+        self.url = url
+        self.title = title
+        self.remove_source = remove_source
+
+    def run(self):
+        try:
+            record = self.archive.ingest(self.path, self.url, self.title)
+            self.saved.emit(record)
+        except Exception as e:
+            logger.error(f"Failed to archive {self.url}: {str(e)}")
+            self.failed.emit(str(e))
+        finally:
+            if self.remove_source:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+class ArchiveMaintenanceWorker(QThread):
+    completed = pyqtSignal(int, object)
+
+    def __init__(self, archive, page_ids=(), measure=False):
+        super().__init__()
+        self.archive = archive
+        self.page_ids = list(page_ids)
+        self.measure = measure
+
+    def run(self):
+        removed, usage = 0, None
+        try:
+            for page_id in self.page_ids:
+                removed += self.archive.delete(page_id)
+            if self.measure:
+                usage = self.archive.disk_usage()
+        except Exception as e:
+            logger.error(f"Failed to maintain offline archive: {str(e)}")
+        self.completed.emit(removed, usage)
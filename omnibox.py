@@ -0,0 +1,273 @@
+import re
+import sys
+import math
+import time
+import heapq
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+FRECENCY_EPOCH = 1704067200
+FRECENCY_HALF_LIFE = 30 * 24 * 3600
+BOOKMARK_BONUS = 2.0
+MAX_POPS = 4000
+
+def normalize_url(url):
+    return re.sub(r"^([a-z][a-z0-9+.-]*://)?(www\.)?", "", url.strip().lower())
+
+def log2_add(a, b):
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1.0 + 2.0 ** (low - high))
+
+def visit_weight(timestamp):
+    return (timestamp - FRECENCY_EPOCH) / FRECENCY_HALF_LIFE
+
+class OmniboxEntry:
+    __slots__ = ("id", "url", "title", "visit_score", "visits", "bookmarked", "base_score", "keys", "haystack", "frecency")
+
+    def __init__(self, entry_id, url, title=""):
+        self.id = entry_id
+        self.url = url
+        self.title = title
+        self.visit_score = -math.inf
+        self.visits = 0
+        self.bookmarked = False
+        self.base_score = visit_weight(time.time())
+        self.keys = ()
+        self.haystack = ""
+        self.frecency = -math.inf
+
+    def compute_frecency(self):
+        score = self.visit_score if self.visits else self.base_score
+        if self.bookmarked:
+            score += BOOKMARK_BONUS
+        return score
+
+class SortedRun:
+    def __init__(self, keys, entries):
+        self.keys = keys
+        self.tombstones = 0
+        self.size = 1
+        while self.size < len(keys):
+            self.size *= 2
+        tree = [-math.inf] * (2 * self.size)
+        for position, (_, entry_id) in enumerate(keys):
+            tree[self.size + position] = entries[entry_id].frecency
+        for node in range(self.size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+        self.tree = tree
+
+    def __len__(self):
+        return len(self.keys)
+
+    def set_leaf(self, position, value):
+        tree = self.tree
+        node = position + self.size
+        tree[node] = value
+        node >>= 1
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+            node >>= 1
+
+    def canonical_nodes(self, prefix):
+        lo = bisect.bisect_left(self.keys, (prefix,))
+        hi = bisect.bisect_left(self.keys, (prefix + "\uffff",), lo)
+        nodes = []
+        left, right = lo + self.size, hi + self.size
+        while left < right:
+            if left & 1:
+                nodes.append(left)
+                left += 1
+            if right & 1:
+                right -= 1
+                nodes.append(right)
+            left >>= 1
+            right >>= 1
+        return nodes
+
+class FrecencyIndex:
+    def __init__(self):
+        self.entries = {}
+        self.url_ids = {}
+        self.next_id = 0
+        self.runs = []
+        self.positions = {}
+        self.staged = []
+        self.bulk = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self, records):
+        self.bulk = True
+        try:
+            for url, title, timestamp, bookmarked in records:
+                if timestamp is not None:
+                    self.record_visit(url, title, timestamp)
+                if bookmarked:
+                    self.set_bookmarked(url, True, title)
+        finally:
+            self.bulk = False
+            self._flush()
+
+    def record_visit(self, url, title=None, timestamp=None):
+        entry = self._get_or_create(url, title)
+        entry.visits += 1
+        entry.visit_score = log2_add(entry.visit_score, visit_weight(timestamp or time.time()))
+        if title and title != entry.title:
+            self._reindex(entry, title)
+        self._rescore(entry)
+
+    def set_title(self, url, title):
+        entry = self.entries.get(self.url_ids.get(url))
+        if entry and title and title != entry.title:
+            self._reindex(entry, title)
+
+    def set_bookmarked(self, url, bookmarked, title=None):
+        entry = self.entries.get(self.url_ids.get(url))
+        if not entry:
+            if not bookmarked:
+                return
+            entry = self._get_or_create(url, title)
+        elif title and title != entry.title:
+            self._reindex(entry, title)
+        if entry.bookmarked != bookmarked:
+            entry.bookmarked = bookmarked
+            self._rescore(entry)
+        if not entry.bookmarked and not entry.visits:
+            self.remove(url)
+
+    def forget_visits(self, url):
+        entry = self.entries.get(self.url_ids.get(url))
+        if not entry:
+            return
+        entry.visits = 0
+        entry.visit_score = -math.inf
+        if entry.bookmarked:
+            self._rescore(entry)
+        else:
+            self.remove(url)
+
+    def remove(self, url):
+        entry_id = self.url_ids.pop(url, None)
+        if entry_id is None:
+            return
+        self._drop_keys(self.entries[entry_id])
+        del self.entries[entry_id]
+        del self.positions[entry_id]
+
+    def clear(self):
+        self.entries.clear()
+        self.url_ids.clear()
+        self.positions.clear()
+        self.runs = []
+        self.staged = []
+
+    def query(self, text, limit=8):
+        tokens = normalize_url(text).split()
+        if not tokens:
+            return []
+        anchor = max(tokens, key=len)
+        others = [t for t in tokens if t is not anchor]
+
+        heap = []
+        for run in self.runs:
+            for node in run.canonical_nodes(anchor):
+                heap.append((-run.tree[node], node, id(run), run))
+        heapq.heapify(heap)
+
+        results = []
+        seen = set()
+        pops = 0
+        while heap and pops < MAX_POPS and len(results) < limit:
+            score, node, _, run = heapq.heappop(heap)
+            pops += 1
+            if score == math.inf:
+                break
+            if node < run.size:
+                heapq.heappush(heap, (-run.tree[2 * node], 2 * node, id(run), run))
+                heapq.heappush(heap, (-run.tree[2 * node + 1], 2 * node + 1, id(run), run))
+                continue
+            entry_id = run.keys[node - run.size][1]
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            entry = self.entries[entry_id]
+            if all(t in entry.haystack for t in others):
+                results.append(entry)
+        return results
+
+    def _get_or_create(self, url, title):
+        entry_id = self.url_ids.get(url)
+        if entry_id is not None:
+            return self.entries[entry_id]
+        entry = OmniboxEntry(self.next_id, url)
+        self.next_id += 1
+        self.entries[entry.id] = entry
+        self.url_ids[url] = entry.id
+        self.positions[entry.id] = {}
+        self._reindex(entry, title or "")
+        return entry
+
+    def _make_keys(self, url, title):
+        keys = {normalize_url(url)}
+        for word in re.findall(r"\w{2,}", title.lower())[:6]:
+            keys.add(sys.intern(word))
+        return tuple(keys)
+
+    def _reindex(self, entry, title):
+        self._drop_keys(entry)
+        entry.title = title
+        entry.keys = self._make_keys(entry.url, title)
+        entry.haystack = f"{normalize_url(entry.url)} {title.lower()}"
+        entry.frecency = entry.compute_frecency()
+        self.staged.extend((key, entry.id) for key in entry.keys)
+        if not self.bulk:
+            self._flush()
+
+    def _drop_keys(self, entry):
+        positions = self.positions[entry.id]
+        if self.staged and len(positions) < len(entry.keys):
+            self._flush()
+        for run, position in positions.values():
+            run.set_leaf(position, -math.inf)
+            run.tombstones += 1
+        positions.clear()
+        entry.keys = ()
+
+    def _rescore(self, entry):
+        entry.frecency = entry.compute_frecency()
+        for run, position in self.positions[entry.id].values():
+            run.set_leaf(position, entry.frecency)
+
+    def _flush(self):
+        if self.staged:
+            self.staged.sort()
+            self._push_run(self.staged)
+            self.staged = []
+        while len(self.runs) > 1 and len(self.runs[-2]) - self.runs[-2].tombstones <= 2 * len(self.runs[-1]):
+            newer = self.runs.pop()
+            older = self.runs.pop()
+            self._push_run(self._live_keys(older) + self._live_keys(newer))
+
+    def _live_keys(self, run):
+        live = []
+        for position, (key, entry_id) in enumerate(run.keys):
+            positions = self.positions.get(entry_id)
+            if positions and positions.get(key) == (run, position):
+                live.append((key, entry_id))
+        return live
+
+    def _push_run(self, keys):
+        keys.sort()
+        run = SortedRun(keys, self.entries)
+        for position, (key, entry_id) in enumerate(keys):
+            self.positions[entry_id][key] = (run, position)
+        self.runs.append(run)
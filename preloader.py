@@ -0,0 +1,186 @@
+import time
+import html
+import logging
+from collections import Counter, OrderedDict, defaultdict
+from urllib.parse import urlsplit
+from PyQt5.QtCore import QObject, QTimer, QUrl
+from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineSettings
+from MojoPrivacy import PrivacyPage
+
+logger = logging.getLogger(__name__)
+
+PRECONNECT_HTML = '<!DOCTYPE html><html><head><link rel="dns-prefetch" href="%(origin)s"><link rel="preconnect" href="%(origin)s"></head></html>'
+
+def available_memory_mb():
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except Exception:
+        pass
+    return None
+
+class PredictiveLoader(QObject):
+    def __init__(self, browser, max_prerenders=1, min_available_mb=512, prerender_ttl=300, preconnect_ttl=60):
+        super().__init__(browser)
+        self.browser = browser
+        self.max_prerenders = max_prerenders
+        self.min_available_mb = min_available_mb
+        self.prerender_ttl = prerender_ttl
+        self.preconnect_ttl = preconnect_ttl
+        self.transitions = defaultdict(Counter)
+        self.prerenders = OrderedDict()
+        self.preconnected = OrderedDict()
+        self.preconnect_page = None
+        self.last_url = None
+        self.pending_text = ""
+
+        self.typing_timer = QTimer(self)
+        self.typing_timer.setSingleShot(True)
+        self.typing_timer.timeout.connect(self.preconnect_suggestion)
+
+        self.memory_timer = QTimer(self)
+        self.memory_timer.timeout.connect(self.check_memory_pressure)
+        self.memory_timer.start(10000)
+
+    def load_history(self, history):
+        for url in history:
+            self.record_visit(url)
+
+    @property
+    def enabled(self):
+        return bool(self.browser.preload_pages) and not self.browser.settings_persistence.privacy_settings.get("private_browsing", False)
+
+    def record_visit(self, url):
+        if self.last_url and self.last_url != url:
+            self.transitions[self.last_url][url] += 1
+        self.last_url = url
+
+    def predict_next(self, url):
+        candidates = self.transitions.get(url)
+        if not candidates:
+            return None
+        next_url, _ = candidates.most_common(1)[0]
+        return next_url
+
+    def top_suggestion(self, text):
+        suggestions = self.browser.omnibox_index.query(text, limit=1)
+        return suggestions[0].url if suggestions else None
+
+    def on_address_edited(self, text):
+        if not self.enabled:
+            return
+        self.pending_text = text
+        self.typing_timer.start(150)
+
+    def preconnect_suggestion(self):
+        url = self.top_suggestion(self.pending_text)
+        if url:
+            self.preconnect(url)
+
+    def preconnect(self, url):
+        try:
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                return
+            origin = f"{parts.scheme}://{parts.netloc}"
+            now = time.monotonic()
+            if now - self.preconnected.get(origin, 0) < self.preconnect_ttl:
+                return
+            view = self.browser.tabs.currentWidget()
+            if not view:
+                return
+            self.preconnect_page_for(view.page().profile()).setHtml(PRECONNECT_HTML % {"origin": html.escape(origin)}, QUrl(f"{origin}/"))
+            self.preconnected[origin] = now
+            self.preconnected.move_to_end(origin)
+            while len(self.preconnected) > 32:
+                self.preconnected.popitem(last=False)
+            logger.info(f"Preconnecting to {origin}")
+        except Exception as e:
+            logger.error(f"Failed to preconnect to {url}: {str(e)}")
+
+    def preconnect_page_for(self, profile):
+        if self.preconnect_page is None or self.preconnect_page.profile() is not profile:
+            if self.preconnect_page is not None:
+                self.preconnect_page.deleteLater()
+            self.preconnect_page = QWebEnginePage(profile, self)
+            self.preconnect_page.settings().setAttribute(QWebEngineSettings.JavascriptEnabled, False)
+        return self.preconnect_page
+
+    def on_page_loaded(self, view):
+        if not self.enabled:
+            return
+        next_url = self.predict_next(view.url().toString())
+        if next_url and next_url != view.url().toString():
+            self.prerender(next_url, view.page().profile())
+
+    def prerender(self, url, profile):
+        if url in self.prerenders or self.under_memory_pressure():
+            return
+        try:
+            while len(self.prerenders) >= self.max_prerenders:
+                self.cancel(next(iter(self.prerenders)))
+            page = PrivacyPage(profile)
+            page.setPrivacyEngine(self.browser.privacy_engine)
+            self.browser.apply_page_settings(page)
+            page.renderProcessTerminated.connect(lambda *args, u=url: self.cancel(u))
+            self.prerenders[url] = {"page": page, "created": time.monotonic(), "ready": False}
+            page.loadFinished.connect(lambda ok, u=url: self.on_prerender_finished(u, ok))
+            page.load(QUrl(url))
+            logger.info(f"Prerendering {url}")
+        except Exception as e:
+            logger.error(f"Failed to prerender {url}: {str(e)}")
+
+    def on_prerender_finished(self, url, ok):
+        entry = self.prerenders.get(url)
+        if not entry:
+            return
+        if ok:
+            entry["ready"] = True
+        else:
+            self.cancel(url)
+
+    def take(self, url):
+        entry = self.prerenders.get(url)
+        if not entry or not entry["ready"] or time.monotonic() - entry["created"] > self.prerender_ttl:
+            return None
+        del self.prerenders[url]
+        page = entry["page"]
+        page.loadFinished.disconnect()
+        page.renderProcessTerminated.disconnect()
+        return page
+
+    def try_swap(self, page, url):
+        prerendered = self.take(url.toString())
+        if not prerendered:
+            return False
+        view = page.view()
+        if not view:
+            prerendered.deleteLater()
+            return False
+        QTimer.singleShot(0, lambda: self.browser.swap_in_page(view, prerendered))
+        return True
+
+    def cancel(self, url):
+        entry = self.prerenders.pop(url, None)
+        if entry:
+            entry["page"].deleteLater()
+            logger.info(f"Cancelled prerender of {url}")
+
+    def cancel_all(self):
+        for url in list(self.prerenders):
+            self.cancel(url)
+
+    def under_memory_pressure(self):
+        available = available_memory_mb()
+        return available is not None and available < self.min_available_mb
+
+    def check_memory_pressure(self):
+        now = time.monotonic()
+        for url, entry in list(self.prerenders.items()):
+            if now - entry["created"] > self.prerender_ttl:
+                self.cancel(url)
+        if self.prerenders and self.under_memory_pressure():
+            logger.warning("Memory pressure detected, cancelling prerenders")
+            self.cancel_all()
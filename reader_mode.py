@@ -0,0 +1,322 @@
+import json
+import logging
+from collections import OrderedDict
+from urllib.parse import urldefrag
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+logger = logging.getLogger(__name__)
+
+READER_CACHE_SIZE = 32
+MAX_ARTICLE_SIZE = 2 * 1024 * 1024
+
+READER_CSS = (
+    "#mojo-reader-content{margin:30px auto;padding:20px;background:#fff;max-width:900px;}"
+    "#mojo-reader-content h1{font-size:32px;margin:0 0 20px;color:#111827;}"
+    "#mojo-reader-content p{font-size:17px;margin:0 0 15px;color:#1f2a44;line-height:1.7;}"
+    "#mojo-reader-content h2,#mojo-reader-content h3,#mojo-reader-content h4,#mojo-reader-content h5,#mojo-reader-content h6{color:#374151;margin:20px 0 10px;}"
+    "#mojo-reader-content h2{font-size:26px;}#mojo-reader-content h3{font-size:22px;}"
+    "#mojo-reader-content img,#mojo-reader-content video{max-width:100%;margin:15px auto;display:block;}"
+    "#mojo-reader-content a{color:#2563eb;text-decoration:none;}"
+    "#mojo-reader-content blockquote{margin:15px 0;padding:10px 15px;border-left:4px solid #e5e7eb;background:#f9fafb;color:#4b5563;}"
+    "#mojo-reader-content pre{background:#f4f4f5;padding:10px;overflow-x:auto;}"
+)
+
+EXTRACTOR_JS = """
+    var SKIP = {script: 1, style: 1, noscript: 1, template: 1, iframe: 1, svg: 1, canvas: 1, object: 1, embed: 1};
+    var BOILERPLATE = {nav: 1, header: 1, footer: 1, aside: 1, form: 1, button: 1, input: 1, select: 1, textarea: 1, dialog: 1};
+    var PARAGRAPHS = {p: 1, pre: 1, blockquote: 1, td: 1};
+    var POSITIVE = /article|body|content|entry|main|page|post|story|text|blog/i;
+    var NEGATIVE = /(^|[-_ ])(ads?|advert|banner|comments?|combx|contact|footer|footnote|masthead|meta|related|share|social|sidebar|sponsor|widget|promo|popup|cookie)([-_ ]|$)/i;
+    var MAX_MEDIA = 8;
+
+    function hints(el) {
+        return (typeof el.className === "string" ? el.className : "") + " " + (el.id || "");
+    }
+
+    function hidden(el) {
+        return el.hasAttribute("hidden") || el.getAttribute("aria-hidden") === "true";
+    }
+
+    function initialScore(el) {
+        var score = 0, name = el.localName, text = hints(el);
+        if (name === "article" || name === "main" || el.getAttribute("role") === "main" || el.getAttribute("itemprop") === "articleBody") score += 25;
+        else if (name === "div") score += 5;
+        else if (name === "pre" || name === "td" || name === "blockquote") score += 3;
+        else if (name === "ol" || name === "ul" || name === "form") score -= 3;
+        else if (/^h[1-6]$|^th$/.test(name)) score -= 5;
+        if (POSITIVE.test(text)) score += 25;
+        if (NEGATIVE.test(text)) score -= 25;
+        return score;
+    }
+
+    function extract() {
+        var order = [], boiler = [], stack = [document.body], flags = [false];
+        while (stack.length) {
+            var el = stack.pop(), inBoiler = flags.pop();
+            order.push(el);
+            boiler.push(inBoiler);
+            for (var child = el.lastElementChild; child; child = child.previousElementSibling) {
+                if (SKIP[child.localName] || hidden(child)) continue;
+                stack.push(child);
+                flags.push(inBoiler || !!BOILERPLATE[child.localName]);
+            }
+        }
+
+        var info = new Map(), paragraphs = [];
+        for (var i = order.length - 1; i >= 0; i--) {
+            var node = order[i], text = 0, links = 0, commas = 0, own = 0;
+            for (var c = node.firstChild; c; c = c.nextSibling) {
+                if (c.nodeType === 3) {
+                    var value = c.nodeValue.trim();
+                    own += value.length;
+                    commas += value.split(",").length - 1;
+                } else if (c.nodeType === 1) {
+                    var sub = info.get(c);
+                    if (sub) {
+                        text += sub.text;
+                        links += sub.links;
+                        commas += sub.commas;
+                    }
+                }
+            }
+            text += own;
+            if (node.localName === "a") links = text;
+            info.set(node, {text: text, links: links, commas: commas});
+            if (!boiler[i] && text >= 25 && (PARAGRAPHS[node.localName] || own >= 80)) paragraphs.push(node);
+        }
+
+        var scores = new Map();
+        function addScore(el, value) {
+            if (!el || el === document.documentElement || !info.has(el)) return;
+            scores.set(el, (scores.has(el) ? scores.get(el) : initialScore(el)) + value);
+        }
+        for (var p = 0; p < paragraphs.length; p++) {
+            var para = paragraphs[p], data = info.get(para);
+            var score = 1 + data.commas + Math.min(Math.floor(data.text / 100), 3);
+            var parent = para.parentElement;
+            addScore(parent, score);
+            if (parent) {
+                addScore(parent.parentElement, score / 2);
+                if (parent.parentElement) addScore(parent.parentElement.parentElement, score / 3);
+            }
+        }
+
+        var best = null, max = 0;
+        scores.forEach(function(score, el) {
+            var data = info.get(el);
+            if (data.text <= 100) return;
+            var final = score * (1 - data.links / data.text);
+            if (final > max) {
+                best = el;
+                max = final;
+            }
+        });
+
+        var content;
+        if (best) {
+            content = best.cloneNode(true);
+        } else {
+            content = document.createElement("div");
+            for (var j = 0, count = 0; j < paragraphs.length && count < 20; j++) {
+                if (info.get(paragraphs[j]).text > 40 && paragraphs[j].localName === "p") {
+                    content.appendChild(paragraphs[j].cloneNode(true));
+                    count++;
+                }
+            }
+            if (count < 2) content = document.body.cloneNode(true);
+        }
+        return clean(content);
+    }
+
+    function clean(root) {
+        var stack = [root], media = 0;
+        while (stack.length) {
+            var el = stack.pop();
+            for (var child = el.firstElementChild; child; ) {
+                var next = child.nextElementSibling, name = child.localName;
+                if (SKIP[name] || BOILERPLATE[name] || hidden(child) || NEGATIVE.test(hints(child))) {
+                    child.remove();
+                } else if (name === "img" || name === "picture" || name === "video") {
+                    if (++media > MAX_MEDIA) {
+                        child.remove();
+                    } else {
+                        var img = name === "picture" ? child.querySelector("img") : (name === "img" ? child : null);
+                        if (img) {
+                            img.src = img.getAttribute("src") || img.getAttribute("data-src") || "";
+                            img.removeAttribute("srcset");
+                        }
+                        if (name === "video") child.controls = true;
+                        stack.push(child);
+                    }
+                } else {
+                    stack.push(child);
+                }
+                child = next;
+            }
+            for (var a = el.attributes.length - 1; a >= 0; a--) {
+                var attr = el.attributes[a].name;
+                if (attr.lastIndexOf("on", 0) === 0 || attr === "style") el.removeAttribute(attr);
+            }
+        }
+        return root;
+    }
+
+    function title() {
+        var heading = document.querySelector("h1, [itemprop=headline], .entry-title, .post-title, .headline");
+        var text = heading ? heading.textContent.trim() : "";
+        return text || document.title.split(/[-|\\u2013]/)[0].trim();
+    }
+"""
+
+READER_JS = """
+(function(cached, css) {
+%s
+    var state = window.__mojoReader;
+    if (state && state.active) {
+        state.restore();
+        return {active: false};
+    }
+    if (!document.body) return null;
+    if (!state) state = window.__mojoReader = {active: false, view: null};
+
+    function build(articleTitle, content) {
+        var view = document.createElement("div");
+        var heading = document.createElement("h1");
+        heading.textContent = articleTitle;
+        view.id = "mojo-reader-content";
+        view.appendChild(heading);
+        view.appendChild(content);
+
+        var controls = document.createElement("div");
+        controls.style.cssText = "position:fixed;top:10px;right:10px;background:#fff;padding:10px;border-radius:5px;box-shadow:0 0 10px rgba(0,0,0,0.1);z-index:1000;";
+        controls.innerHTML =
+            '<label>Font Size: <input type="range" min="12" max="36" value="17"></label> ' +
+            '<label>Font: <select><option>Arial</option><option>Georgia</option><option>Times New Roman</option><option>Verdana</option></select></label> ' +
+            '<label>Background: <input type="color" value="#f7fafc"></label>';
+        var inputs = controls.querySelectorAll("input, select");
+        inputs[0].addEventListener("input", function() { view.style.fontSize = this.value + "px"; });
+        inputs[1].addEventListener("change", function() { view.style.fontFamily = this.value; });
+        inputs[2].addEventListener("input", function() { view.style.backgroundColor = this.value; });
+
+        var style = document.createElement("style");
+        style.textContent = css;
+        return {view: view, controls: controls, style: style};
+    }
+
+    var article = null;
+    if (!state.view) {
+        var content, articleTitle;
+        if (cached) {
+            content = document.createElement("div");
+            content.innerHTML = cached.html;
+            content = clean(content);
+            articleTitle = cached.title;
+        } else {
+            content = extract();
+            articleTitle = title();
+            article = {title: articleTitle, html: content.outerHTML};
+        }
+        var parts = build(articleTitle, content);
+        state.view = parts.view;
+        state.controls = parts.controls;
+        state.style = parts.style;
+    }
+
+    var body = document.body;
+    state.scroll = window.scrollY;
+    state.bodyStyle = body.getAttribute("style");
+    state.original = document.createDocumentFragment();
+    while (body.firstChild) state.original.appendChild(body.firstChild);
+    body.style.cssText = "background:#f7fafc;margin:0;padding:0";
+    body.appendChild(state.view);
+    body.appendChild(state.controls);
+    (document.head || document.documentElement).appendChild(state.style);
+    window.scrollTo(0, 0);
+    state.active = true;
+
+    state.restore = function() {
+        state.view.remove();
+        state.controls.remove();
+        state.style.remove();
+        body.appendChild(state.original);
+        state.original = null;
+        if (state.bodyStyle === null) body.removeAttribute("style");
+        else body.setAttribute("style", state.bodyStyle);
+        window.scrollTo(0, state.scroll || 0);
+        state.active = false;
+    };
+    return {active: true, article: article};
+})(%%s, %%s);
+""" % EXTRACTOR_JS
+
+ARTICLE_JS = """
+(function() {
+%s
+    if (!document.body) return null;
+    var content = extract(), images = [];
+    var embedded = content.querySelectorAll("video, audio, source, track");
+    for (var i = embedded.length - 1; i >= 0; i--) embedded[i].remove();
+    var imgs = content.querySelectorAll("img");
+    for (var j = 0; j < imgs.length; j++) {
+        var src = imgs[j].src;
+        if (!/^https?:/i.test(src)) {
+            imgs[j].remove();
+            continue;
+        }
+        imgs[j].setAttribute("src", "img/" + images.length);
+        images.push(src);
+    }
+    return {title: title(), html: content.outerHTML, images: images};
+})();
+""" % EXTRACTOR_JS
+
+class ReaderMode:
+    def __init__(self, max_entries=READER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.articles = OrderedDict()
+
+    def key(self, url):
+        return urldefrag(url)[0]
+
+    def get(self, url):
+        key = self.key(url)
+        article = self.articles.get(key)
+        if article is not None:
+            self.articles.move_to_end(key)
+        return article
+
+    def put(self, url, article):
+        if not article or len(article.get("html", "")) > MAX_ARTICLE_SIZE:
+            return
+        key = self.key(url)
+        self.articles[key] = {"title": str(article.get("title", "")), "html": str(article["html"])}
+        self.articles.move_to_end(key)
+        while len(self.articles) > self.max_entries:
+            self.articles.popitem(last=False)
+
+    def forget(self, url):
+        self.articles.pop(self.key(url), None)
+
+    def clear(self):
+        self.articles.clear()
+
+    def toggle(self, page, callback=None):
+        url = page.url().toString()
+        cacheable = not page.profile().isOffTheRecord()
+        cached = self.get(url) if cacheable else None
+        script = READER_JS % (json.dumps(cached), json.dumps(READER_CSS))
+        page.runJavaScript(script, QWebEngineScript.ApplicationWorld, lambda result: self.on_toggled(url, cacheable, result, callback))
+
+    def on_toggled(self, url, cacheable, result, callback):
+        try:
+            if not isinstance(result, dict):
+                active = None
+            else:
+                active = bool(result.get("active"))
+                if cacheable and result.get("article"):
+                    self.put(url, result["article"])
+        except Exception as e:
+            logger.error(f"Failed to handle reader mode result for {url}: {str(e)}")
+            active = None
+        if callback:
+            callback(active)
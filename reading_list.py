@@ -0,0 +1,355 @@
+import os
+import html
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QThread, QTimer, QEvent, QUrl, pyqtSignal
+from PyQt5.QtNetwork import QNetworkConfiguration, QNetworkConfigurationManager
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEngineScript
+from PyQt5.QtWidgets import QApplication
+from MojoPrivacy import PrivacyPage
+from offline_archive import ArchiveMaintenanceWorker
+from http_client import get_client
+from preloader import available_memory_mb
+from reader_mode import ARTICLE_JS, READER_CSS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+SAVING = "saving"
+READY = "ready"
+FAILED = "failed"
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 300
+MAX_IMAGE_SIZE = 5 * 1024 * 1024
+IMAGE_TIMEOUT = 30
+IMAGE_WORKERS = 4
+INPUT_EVENTS = (QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Wheel, QEvent.TouchBegin)
+METERED_BEARERS = (QNetworkConfiguration.Bearer2G, QNetworkConfiguration.Bearer3G, QNetworkConfiguration.Bearer4G)
+
+def article_document(title, body):
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>"
+        f"<style>body{{background:#f7fafc;margin:0;padding:0}}{READER_CSS}</style>"
+        f"</head><body><div id=\"mojo-reader-content\"><h1>{html.escape(title)}</h1>{body}</div></body></html>"
+    )
+
+class ReadingList:
+    def __init__(self, path="reading_list.json"):
+        self.path = path
+        self.items = {}
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.items = {item["id"]: item for item in json.load(f).get("items", [])}
+            for item in self.items.values():
+                if item["status"] == SAVING:
+                    item["status"] = QUEUED
+        except Exception as e:
+            logger.error(f"Failed to load reading list: {str(e)}")
+            self.items = {}
+
+    def save(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "items": list(self.items.values())}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save reading list: {str(e)}")
+
+    def add(self, url, title=None):
+        item_id = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        if item_id in self.items:
+            return self.items[item_id]
+        item = {
+            "id": item_id,
+            "url": url,
+            "title": title or url,
+            "added": round(time.time(), 3),
+            "status": QUEUED,
+            "attempts": 0,
+            "error": None,
+            "page_id": None,
+            "size": 0
+        }
+        self.items[item_id] = item
+        self.save()
+        return item
+
+    def get(self, item_id):
+        return self.items.get(item_id)
+
+    def update(self, item_id, **fields):
+        item = self.items.get(item_id)
+        if item:
+            item.update(fields)
+            self.save()
+        return item
+
+    def remove(self, item_id):
+        item = self.items.pop(item_id, None)
+        if item:
+            self.save()
+        return item
+
+    def list_items(self):
+        return sorted(self.items.values(), key=lambda item: item["added"], reverse=True)
+
+    def pending(self):
+        now = time.time()
+        items = [
+            item for item in self.items.values()
+            if item["status"] == QUEUED or (item["status"] == FAILED and item["attempts"] < MAX_ATTEMPTS and item.get("retry_at", 0) <= now)
+        ]
+        return sorted(items, key=lambda item: (item["attempts"], item["added"]))
+
+class ArticleSaveWorker(QThread):
+    saved = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, archive, url, title, body, images):
+        super().__init__()
+        self.archive = archive
+        self.url = url
+        self.title = title
+        self.body = body
+        self.images = images
+
+    def fetch_image(self, client, url, deadline):
+        if time.monotonic() > deadline:
+            raise TimeoutError("Timed out downloading images")
+        with client.stream(url, timeout=IMAGE_TIMEOUT) as response:
+            response.raise_for_status()
+            mime = response.headers.get("Content-Type", "").split(";")[0].strip()
+            if not mime.startswith("image/"):
+                raise ValueError(f"Unexpected content type {mime or 'unknown'}")
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data += chunk
+                if len(data) > MAX_IMAGE_SIZE:
+                    raise ValueError("Image exceeds the maximum size")
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Timed out downloading images")
+        return mime, bytes(data)
+
+    def run(self):
+        try:
+            client = get_client()
+            deadline = time.monotonic() + IMAGE_TIMEOUT * 2
+            with ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="mojo-article") as executor:
+                futures = [executor.submit(self.fetch_image, client, url, deadline) for url in self.images]
+            images = []
+            for index, future in enumerate(futures):
+                try:
+                    mime, data = future.result()
+                    images.append((f"img/{index}", mime, data))
+                except Exception as e:
+                    logger.warning(f"Skipping image {self.images[index]} for {self.url}: {str(e)}")
+            document = article_document(self.title, self.body)
+            record = self.archive.ingest_article(self.url, self.title, document, images)
+            record = dict(record, size=len(document.encode("utf-8")) + sum(len(data) for _, _, data in images))
+            self.saved.emit(record)
+        except Exception as e:
+            logger.error(f"Failed to store article {self.url}: {str(e)}")
+            self.failed.emit(str(e))
+
+class ReadingListPrefetcher(QObject):
+    item_changed = pyqtSignal(str)
+
+    def __init__(self, browser, reading_list, archive, max_concurrent=2, idle_seconds=30, load_timeout=45, min_available_mb=512):
+        super().__init__(browser)
+        self.browser = browser
+        self.reading_list = reading_list
+        self.archive = archive
+        self.max_concurrent = max_concurrent
+        self.idle_seconds = idle_seconds
+        self.load_timeout = load_timeout
+        self.min_available_mb = min_available_mb
+        self.active = {}
+        self.workers = []
+        self.last_input = time.monotonic()
+        self.filtering = False
+        self.network_manager = QNetworkConfigurationManager(self)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.timeout.connect(self.pump)
+        self.idle_timer.start(5000)
+
+    @property
+    def enabled(self):
+        return bool(self.browser.reading_list_prefetch) and not self.browser.settings_persistence.privacy_settings.get("private_browsing", False)
+
+    def eventFilter(self, obj, event):
+        if event.type() in INPUT_EVENTS:
+            self.last_input = time.monotonic()
+        return False
+
+    def watch_input(self, enabled):
+        app = QApplication.instance()
+        if not app or enabled == self.filtering:
+            return
+        if enabled:
+            self.last_input = time.monotonic()
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+        self.filtering = enabled
+
+    def is_idle(self):
+        if time.monotonic() - self.last_input < self.idle_seconds:
+            return False
+        available = available_memory_mb()
+        return available is None or available >= self.min_available_mb
+
+    def is_metered(self):
+        try:
+            return self.network_manager.defaultConfiguration().bearerTypeFamily() in METERED_BEARERS
+        except Exception:
+            return False
+
+    def can_prefetch(self):
+        if not self.enabled or not self.is_idle():
+            return False
+        return self.browser.reading_list_metered or not self.is_metered()
+
+    def add(self, url, title=None):
+        item = self.reading_list.add(url, title)
+        self.item_changed.emit(item["id"])
+        return item
+
+    def pump(self):
+        pending = self.reading_list.pending() if self.enabled else []
+        self.watch_input(bool(pending))
+        if not pending or not self.can_prefetch():
+            return
+        for item in pending:
+            if len(self.active) >= self.max_concurrent:
+                break
+            if item["id"] not in self.active:
+                self.start(item)
+
+    def start(self, item):
+        item_id = item["id"]
+        if item_id in self.active:
+            return
+        try:
+            page = PrivacyPage(QWebEngineProfile.defaultProfile(), self)
+            page.setPrivacyEngine(self.browser.privacy_engine)
+            self.browser.apply_page_settings(page)
+            page.setAudioMuted(True)
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda: self.fail(item_id, "Timed out loading page"))
+            self.active[item_id] = {"page": page, "timer": timer, "worker": None, "extracting": False}
+            page.loadFinished.connect(lambda ok: self.on_loaded(item_id, ok))
+            page.renderProcessTerminated.connect(lambda *args: self.fail(item_id, "Renderer terminated"))
+            self.reading_list.update(item_id, status=SAVING, attempts=item["attempts"] + 1, error=None)
+            self.item_changed.emit(item_id)
+            timer.start(self.load_timeout * 1000)
+            page.load(QUrl(item["url"]))
+            logger.info(f"Prefetching reading list item {item['url']}")
+        except Exception as e:
+            logger.error(f"Failed to prefetch {item['url']}: {str(e)}")
+            self.fail(item_id, str(e))
+
+    def on_loaded(self, item_id, ok):
+        entry = self.active.get(item_id)
+        if not entry or entry["extracting"]:
+            return
+        if not ok:
+            self.fail(item_id, "Failed to load page")
+            return
+        entry["extracting"] = True
+        entry["page"].runJavaScript(ARTICLE_JS, QWebEngineScript.ApplicationWorld, lambda result: self.on_extracted(item_id, result))
+
+    def on_extracted(self, item_id, result):
+        entry = self.active.get(item_id)
+        item = self.reading_list.get(item_id)
+        if not entry or not item:
+            return
+        if not isinstance(result, dict) or not result.get("html"):
+            self.fail(item_id, "No article content found")
+            return
+        title = result.get("title") or entry["page"].title() or item["title"]
+        self.release_page(entry)
+        worker = ArticleSaveWorker(self.archive, item["url"], title, result["html"], [str(url) for url in result.get("images") or []])
+        worker.saved.connect(lambda record: self.on_saved(item_id, record))
+        worker.failed.connect(lambda error: self.fail(item_id, error))
+        entry["worker"] = worker
+        self.workers.append(worker)
+        worker.finished.connect(lambda: self.workers.remove(worker))
+        worker.start()
+
+    def on_saved(self, item_id, record):
+        item = self.reading_list.get(item_id)
+        if item is None:
+            self.delete_pages([record["id"]])
+        else:
+            if item["page_id"]:
+                self.delete_pages([item["page_id"]])
+            self.reading_list.update(item_id, status=READY, title=record["title"], page_id=record["id"], size=record["size"], error=None)
+            logger.info(f"Saved reading list item {item['url']}")
+        self.finish(item_id)
+
+    def fail(self, item_id, error):
+        if item_id not in self.active:
+            return
+        if self.reading_list.get(item_id):
+            attempts = self.reading_list.get(item_id)["attempts"]
+            self.reading_list.update(item_id, status=FAILED, error=error, retry_at=round(time.time() + RETRY_DELAY * attempts, 3))
+        logger.warning(f"Failed to prefetch reading list item {item_id}: {error}")
+        self.finish(item_id)
+
+    def release_page(self, entry):
+        entry["timer"].stop()
+        if entry["page"]:
+            entry["page"].loadFinished.disconnect()
+            entry["page"].renderProcessTerminated.disconnect()
+            entry["page"].deleteLater()
+            entry["page"] = None
+
+    def finish(self, item_id):
+        entry = self.active.pop(item_id, None)
+        if entry:
+            self.release_page(entry)
+            entry["timer"].deleteLater()
+        self.item_changed.emit(item_id)
+        QTimer.singleShot(0, self.pump)
+
+    def save_now(self, item_id):
+        item = self.reading_list.get(item_id)
+        if item and item["status"] != READY:
+            self.reading_list.update(item_id, status=QUEUED, attempts=0, retry_at=0)
+            self.start(item)
+
+    def clear(self):
+        page_ids = [self.forget(item_id) for item_id in list(self.reading_list.items)]
+        self.delete_pages([page_id for page_id in page_ids if page_id])
+
+    def remove(self, item_id):
+        page_id = self.forget(item_id)
+        if page_id:
+            self.delete_pages([page_id])
+
+    def forget(self, item_id):
+        entry = self.active.get(item_id)
+        if entry and entry["worker"] is None:
+            self.finish(item_id)
+        item = self.reading_list.remove(item_id)
+        self.item_changed.emit(item_id)
+        return item["page_id"] if item else None
+
+    def delete_pages(self, page_ids):
+        if not page_ids:
+            return
+        worker = ArchiveMaintenanceWorker(self.archive, page_ids)
+        self.workers.append(worker)
+        worker.finished.connect(lambda: self.workers.remove(worker))
+        worker.start()
@@ -0,0 +1,100 @@
+import json
+import time
+import logging
+import argparse
+from contextlib import contextmanager
+from PyQt5.QtCore import QObject, QEvent, pyqtSignal
+
+STARTUP_ORIGIN = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+FIRST_PAINT_BUDGET_MS = 1000
+CRITICAL = "critical"
+DEFERRED = "deferred"
+
+def parse_startup_args(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--startup-report", nargs="?", const="text", choices=("text", "json"))
+    parser.add_argument("--startup-budget", type=float, default=FIRST_PAINT_BUDGET_MS)
+    options, remaining = parser.parse_known_args(argv[1:])
+    return options, argv[:1] + remaining
+
+class StartupTimer(QObject):
+    completed = pyqtSignal()
+
+    def __init__(self, origin=None, budget_ms=FIRST_PAINT_BUDGET_MS, parent=None):
+        super().__init__(parent)
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.budget_ms = budget_ms
+        self.stage = CRITICAL
+        self.phases = []
+        self.marks = {}
+        self.done = False
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def record(self, name, start_ms, end_ms=None):
+        end_ms = self.elapsed_ms() if end_ms is None else end_ms
+        self.phases.append({"stage": self.stage, "name": name, "start_ms": round(start_ms, 1), "duration_ms": round(end_ms - start_ms, 1)})
+
+    @contextmanager
+    def phase(self, name):
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = round(self.elapsed_ms(), 1)
+        return self.marks[name]
+
+    def over_budget(self):
+        first_paint = self.marks.get("first_paint")
+        return first_paint is not None and first_paint > self.budget_ms
+
+    def finish(self):
+        if self.done:
+            return
+        self.done = True
+        self.mark("deferred_complete")
+        first_paint = self.marks.get("first_paint")
+        if self.over_budget():
+            logger.warning(f"First paint at {first_paint:.0f} ms exceeded the {self.budget_ms:.0f} ms startup budget")
+        logger.info(f"Startup complete: first paint {first_paint} ms, deferred work done at {self.marks['deferred_complete']} ms")
+        self.completed.emit()
+
+    def to_dict(self):
+        return {"budget_ms": self.budget_ms, "over_budget": self.over_budget(), "marks": dict(self.marks), "phases": list(self.phases)}
+
+    def report(self, output="text"):
+        if output == "json":
+            return json.dumps(self.to_dict(), indent=2)
+        lines = [f"Startup report (first paint budget {self.budget_ms:.0f} ms)", f"  {'stage':<10}{'phase':<24}{'start ms':>10}{'duration ms':>13}"]
+        for phase in self.phases:
+            lines.append(f"  {phase['stage']:<10}{phase['name']:<24}{phase['start_ms']:>10.1f}{phase['duration_ms']:>13.1f}")
+        first_paint = self.marks.get("first_paint")
+        if first_paint is None:
+            lines.append("  first paint: not observed")
+        else:
+            lines.append(f"  first paint: {first_paint:.1f} ms ({'OVER BUDGET' if self.over_budget() else 'within budget'})")
+        if "deferred_complete" in self.marks:
+            lines.append(f"  deferred work complete: {self.marks['deferred_complete']:.1f} ms")
+        return "\n".join(lines)
+
+class FirstPaintWatcher(QObject):
+    painted = pyqtSignal()
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.widget = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.widget and event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            self.painted.emit()
+        return False
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import logging
+from PyQt5.QtCore import Qt, QThread, QSize, pyqtSignal
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from list_models import PagedListModel
+from http_client import get_client
+
+logger = logging.getLogger(__name__)
+
+CATALOG_TTL = 6 * 3600
+
+class StoreCatalog:
+    def __init__(self, url, cache_path="extension_store/catalog.json", ttl=CATALOG_TTL):
+        self.url = url
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.etag = None
+        self.last_modified = None
+        self.fetched = 0
+        self.entries = []
+        self.load_cached()
+
+    def load_cached(self):
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("url") == self.url:
+                    self.etag = cached.get("etag")
+                    self.last_modified = cached.get("last_modified")
+                    self.fetched = cached.get("fetched", 0)
+                    self.entries = cached.get("entries", [])
+        except Exception as e:
+            logger.error(f"Failed to load cached store catalog: {str(e)}")
+        return self.entries
+
+    def seed(self, entries):
+        if self.entries or not entries:
+            return
+        try:
+            self.entries = self.validate(entries)
+        except ValueError as e:
+            logger.warning(f"Ignoring cached store catalog: {str(e)}")
+            return
+        self.fetched = 0
+        self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "url": self.url,
+                    "etag": self.etag,
+                    "last_modified": self.last_modified,
+                    "fetched": self.fetched,
+                    "entries": self.entries
+                }, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Failed to cache store catalog: {str(e)}")
+
+    def is_stale(self):
+        return not self.entries or time.time() - self.fetched > self.ttl
+
+    def validate(self, entries):
+        if not isinstance(entries, list):
+            raise ValueError("Store catalog is not a list")
+        valid = []
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("name") and entry.get("url"):
+                valid.append({
+                    "name": str(entry["name"]),
+                    "url": str(entry["url"]),
+                    "description": str(entry.get("description", "")),
+                    "author": str(entry.get("author", "")),
+                    "sha256": entry.get("sha256")
+                })
+        return valid
+
+    def refresh(self, client=None):
+        headers = {}
+        if self.entries and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.entries and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        response = (client or get_client()).fetch(self.url, headers=headers)
+        if response.status_code == 304:
+            self.fetched = time.time()
+            self.save()
+            return False
+        response.raise_for_status()
+        self.entries = self.validate(response.json())
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.fetched = time.time()
+        self.save()
+        logger.info(f"Fetched store catalog with {len(self.entries)} entries")
+        return True
+
+class CatalogRefreshWorker(QThread):
+    refreshed = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, catalog, client=None):
+        super().__init__()
+        self.catalog = catalog
+        self.client = client
+
+    def run(self):
+        try:
+            self.refreshed.emit(self.catalog.refresh(self.client))
+        except Exception as e:
+            logger.error(f"Failed to refresh store catalog: {str(e)}")
+            self.failed.emit(str(e))
+
+def describe_entry(entry):
+    return f"{entry['name']} {entry['description']} {entry['author']}"
+
+class StoreCatalogModel(PagedListModel):
+    StatusRole = Qt.UserRole + 1
+
+    def __init__(self, entries, page_size=100, parent=None):
+        super().__init__(list(entries), describe_entry, page_size, parent)
+        self.checked = set()
+        self.statuses = {}
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded:
+            return None
+        entry = self.rows[self.source_row(index.row())]
+        if role == Qt.DisplayRole:
+            return entry["name"]
+        if role == Qt.ToolTipRole:
+            return entry["description"]
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if entry["url"] in self.checked else Qt.Unchecked
+        if role == self.StatusRole:
+            return self.statuses.get(entry["url"], "")
+        return super().data(index, role)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        url = self.rows[self.source_row(index.row())]["url"]
+        if value == Qt.Checked:
+            self.checked.add(url)
+        else:
+            self.checked.discard(url)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def checked_entries(self):
+        return [entry for entry in self.rows if entry["url"] in self.checked]
+
+    def set_status(self, url, status):
+        self.statuses[url] = status
+        for row in range(self.loaded):
+            if self.rows[self.source_row(row)]["url"] == url:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [self.StatusRole])
+                break
+
+class StoreItemDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        entry = index.data(Qt.UserRole)
+        if not entry:
+            return super().paint(painter, option, index)
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+        rect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, widget).adjusted(4, 4, -4, -4)
+
+        painter.save()
+        metrics = option.fontMetrics
+        line = metrics.height()
+        status = index.data(StoreCatalogModel.StatusRole)
+        status_width = 0
+        if status:
+            status = metrics.elidedText(status, Qt.ElideRight, rect.width() // 3)
+            status_width = metrics.horizontalAdvance(status) + 8
+            painter.drawText(rect, Qt.AlignRight | Qt.AlignTop, status)
+        name_font = QFont(option.font)
+        name_font.setBold(True)
+        painter.setFont(name_font)
+        name = painter.fontMetrics().elidedText(entry["name"], Qt.ElideRight, rect.width() - status_width)
+        painter.drawText(rect.x(), rect.y() + line, name)
+        painter.setFont(option.font)
+        painter.drawText(rect.x(), rect.y() + 2 * line, metrics.elidedText(entry["description"], Qt.ElideRight, rect.width()))
+        painter.setOpacity(0.6)
+        painter.drawText(rect.x(), rect.y() + 3 * line, metrics.elidedText(f"By: {entry['author']}", Qt.ElideRight, rect.width()))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), option.fontMetrics.height() * 3 + 14)
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import base64
+import logging
+from collections import deque
+from PyQt5.QtCore import QByteArray, QDataStream, QIODevice, QBuffer, QUrl
+from PyQt5.QtGui import QIcon, QPixmap
+
+logger = logging.getLogger(__name__)
+
+class ClosedTab:
+    def __init__(self, url, title, history_data, scroll_x=0.0, scroll_y=0.0, icon_data=b"", private=False):
+        self.url = url
+        self.title = title
+        self.history_data = history_data
+        self.scroll_x = scroll_x
+        self.scroll_y = scroll_y
+        self.icon_data = icon_data
+        self.private = private
+
+    def memory_size(self):
+        return len(self.history_data) + len(self.icon_data) + 2 * (len(self.url) + len(self.title))
+
+    def icon(self):
+        pixmap = QPixmap()
+        if self.icon_data and pixmap.loadFromData(self.icon_data, "PNG"):
+            return QIcon(pixmap)
+        return QIcon()
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "title": self.title,
+            "history": base64.b64encode(self.history_data).decode("ascii"),
+            "scroll": [self.scroll_x, self.scroll_y],
+            "icon": base64.b64encode(self.icon_data).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        scroll_x, scroll_y = data.get("scroll", [0.0, 0.0])
+        return cls(
+            data.get("url", ""),
+            data.get("title", ""),
+            base64.b64decode(data.get("history", "")),
+            scroll_x,
+            scroll_y,
+            base64.b64decode(data.get("icon", ""))
+        )
+
+    @classmethod
+    def capture(cls, browser, private=False):
+        history_bytes = QByteArray()
+        stream = QDataStream(history_bytes, QIODevice.WriteOnly)
+        stream << browser.history()
+
+        icon_bytes = QByteArray()
+        icon = browser.icon()
+        if not icon.isNull():
+            buffer = QBuffer(icon_bytes)
+            buffer.open(QIODevice.WriteOnly)
+            icon.pixmap(16, 16).save(buffer, "PNG")
+            buffer.close()
+
+        position = browser.page().scrollPosition()
+        return cls(
+            browser.url().toString(),
+            browser.title(),
+            bytes(history_bytes),
+            position.x(),
+            position.y(),
+            bytes(icon_bytes),
+            private
+        )
+
+    def restore(self, browser):
+        if self.history_data:
+            stream = QDataStream(QByteArray(self.history_data), QIODevice.ReadOnly)
+            stream >> browser.history()
+        else:
+            browser.setUrl(QUrl(self.url))
+
+        if self.scroll_x or self.scroll_y:
+            def restore_scroll(ok):
+                browser.loadFinished.disconnect(restore_scroll)
+                if ok:
+                    browser.page().runJavaScript(f"window.scrollTo({self.scroll_x}, {self.scroll_y});")
+            browser.loadFinished.connect(restore_scroll)
+
+class ClosedTabStack:
+    def __init__(self, spill_dir="closed_tabs", max_entries=25, memory_limit=4 * 1024 * 1024, max_spilled=100):
+        self.spill_dir = spill_dir
+        self.max_entries = max_entries
+        self.memory_limit = memory_limit
+        self.max_spilled = max_spilled
+        self.entries = deque()
+        self.spilled = []
+        self.memory_used = 0
+        self._clear_spill_dir()
+
+    def __len__(self):
+        return len(self.entries) + len(self.spilled)
+
+    def push(self, browser, private=False):
+        try:
+            entry = ClosedTab.capture(browser, private)
+            if not entry.url or entry.url == "about:blank":
+                return
+            self.entries.append(entry)
+            self.memory_used += entry.memory_size()
+            while self.entries and (len(self.entries) > self.max_entries or self.memory_used > self.memory_limit):
+                self._spill(self.entries.popleft())
+        except Exception as e:
+            logger.error(f"Failed to record closed tab: {str(e)}")
+
+    def pop(self):
+        if self.entries:
+            entry = self.entries.pop()
+            self.memory_used -= entry.memory_size()
+            return entry
+        while self.spilled:
+            path = self.spilled.pop()
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return ClosedTab.from_dict(json.load(f))
+            except Exception as e:
+                logger.error(f"Failed to load closed tab from {path}: {str(e)}")
+            finally:
+                self._remove(path)
+        return None
+
+    def clear(self):
+        self.entries.clear()
+        self.memory_used = 0
+        for path in self.spilled:
+            self._remove(path)
+        self.spilled.clear()
+
+    def _spill(self, entry):
+        self.memory_used -= entry.memory_size()
+        if entry.private:
+            return
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{time.time_ns()}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry.to_dict(), f)
+            self.spilled.append(path)
+            while len(self.spilled) > self.max_spilled:
+                self._remove(self.spilled.pop(0))
+        except Exception as e:
+            logger.error(f"Failed to spill closed tab to disk: {str(e)}")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _clear_spill_dir(self):
+        if not os.path.isdir(self.spill_dir):
+            return
+        for name in os.listdir(self.spill_dir):
+            if name.endswith(".json"):
+                self._remove(os.path.join(self.spill_dir, name))
@@ -0,0 +1,158 @@
+import os
+import json
+import math
+import time
+import logging
+import logging.handlers
+from collections import defaultdict
+from PyQt5.QtWebEngineWidgets import QWebEngineScript
+
+logger = logging.getLogger(__name__)
+
+NAVIGATION_TIMING_JS = """
+(function() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    var resources = performance.getEntriesByType('resource');
+    var transfer = nav.transferSize || 0, decoded = nav.decodedBodySize || 0;
+    for (var i = 0; i < resources.length; i++) {
+        transfer += resources[i].transferSize || 0;
+        decoded += resources[i].decodedBodySize || 0;
+    }
+    var loadEnd = nav.loadEventEnd || nav.loadEventStart || performance.now();
+    return JSON.stringify({
+        dns: nav.domainLookupEnd - nav.domainLookupStart,
+        connect: nav.connectEnd - nav.connectStart,
+        tls: nav.secureConnectionStart > 0 ? nav.connectEnd - nav.secureConnectionStart : 0,
+        ttfb: nav.responseStart - nav.requestStart,
+        dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+        load: loadEnd - nav.startTime,
+        transfer_size: transfer,
+        decoded_size: decoded,
+        resource_count: resources.length
+    });
+})();
+"""
+
+TIMING_FIELDS = ["dns", "connect", "tls", "ttfb", "dom_content_loaded", "load"]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+class NavigationTelemetry:
+    def __init__(self, browser, log_path="telemetry/navigation.log", max_bytes=2 * 1024 * 1024, backup_count=3):
+        self.browser = browser
+        self.log_path = log_path
+        self.backup_count = backup_count
+        self.log = logging.getLogger("mojo.telemetry.navigation")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        if not self.log.handlers:
+            try:
+                os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self.log.addHandler(handler)
+            except Exception as e:
+                logger.error(f"Failed to open navigation telemetry log: {str(e)}")
+
+    def collect(self, web_view):
+        try:
+            if web_view.page().profile().isOffTheRecord():
+                return
+            url = web_view.url()
+            if url.scheme() not in ("http", "https"):
+                return
+            host = url.host()
+            context = self.current_context()
+            web_view.page().runJavaScript(
+                NAVIGATION_TIMING_JS,
+                QWebEngineScript.ApplicationWorld,
+                lambda result, h=host, c=context: self.record(h, result, c)
+            )
+        except Exception as e:
+            logger.error(f"Failed to collect navigation timing: {str(e)}")
+
+    def current_context(self):
+        settings = self.browser.settings_persistence.privacy_settings
+        privacy_engine = self.browser.privacy_engine
+        extension_manager = self.browser.extension_manager
+        return {
+            "proxy": bool(privacy_engine and privacy_engine.proxy_settings),
+            "block_trackers": bool(settings.get("block_trackers", False)),
+            "fingerprint_protection": bool(settings.get("fingerprint_protection", False)),
+            "extensions": sum(1 for status in extension_manager.extension_status.values() if status == "enabled")
+        }
+
+    def record(self, host, result, context):
+        if not result:
+            return
+        try:
+            timing = json.loads(result)
+            entry = {"ts": time.time(), "host": host, "context": context}
+            entry.update({k: round(v, 2) if isinstance(v, float) else v for k, v in timing.items()})
+            self.log.info(json.dumps(entry, separators=(",", ":")))
+        except Exception as e:
+            logger.error(f"Failed to record navigation timing for {host}: {str(e)}")
+
+    def clear(self):
+        for handler in self.log.handlers:
+            handler.close()
+        for path in [self.log_path] + [f"{self.log_path}.{i}" for i in range(1, self.backup_count + 1)]:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logger.error(f"Failed to remove telemetry log {path}: {str(e)}")
+
+    def read_entries(self):
+        paths = [f"{self.log_path}.{i}" for i in range(self.backup_count, 0, -1)] + [self.log_path]
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            except Exception as e:
+                logger.error(f"Failed to read telemetry log {path}: {str(e)}")
+
+    def aggregate(self):
+        groups = defaultdict(lambda: defaultdict(list))
+        for entry in self.read_entries():
+            day = time.strftime("%Y-%m-%d", time.localtime(entry.get("ts", 0)))
+            key = (entry.get("host", ""), day, self.describe_context(entry.get("context", {})))
+            for field in TIMING_FIELDS:
+                if field in entry:
+                    groups[key][field].append(entry[field])
+            groups[key]["transfer_size"].append(entry.get("transfer_size", 0))
+        rows = []
+        for (host, day, context), values in groups.items():
+            row = {"host": host, "day": day, "context": context, "samples": len(values["load"])}
+            for field in TIMING_FIELDS:
+                row[f"{field}_p50"] = percentile(values[field], 50)
+                row[f"{field}_p95"] = percentile(values[field], 95)
+            row["transfer_size_p50"] = percentile(values["transfer_size"], 50)
+            rows.append(row)
+        rows.sort(key=lambda r: (r["host"], r["day"], r["context"]))
+        return rows
+
+    @staticmethod
+    def describe_context(context):
+        parts = []
+        if context.get("proxy"):
+            parts.append("proxy")
+        if context.get("block_trackers"):
+            parts.append("trackers")
+        if context.get("fingerprint_protection"):
+            parts.append("fingerprint")
+        if context.get("extensions"):
+            parts.append(f"ext({context['extensions']})")
+        return "+".join(parts) or "default"
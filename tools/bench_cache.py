@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import serve
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def build_corpus(root, assets, asset_size):
+    tags = []
+    for index in range(assets):
+        if index % 2:
+            name = f"style{index}.css"
+            body = f"/* {'x' * asset_size} */\n.c{index} {{ color: #333; }}\n"
+            tags.append(f'<link rel="stylesheet" href="{name}">')
+        else:
+            name = f"script{index}.js"
+            body = f"/* {'x' * asset_size} */\nwindow.loaded{index} = true;\n"
+            tags.append(f'<script src="{name}"></script>')
+        with open(os.path.join(root, name), "w", encoding="utf-8") as f:
+            f.write(body)
+    with open(os.path.join(root, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><title>Cache bench</title>{''.join(tags)}</head><body>bench</body></html>")
+
+def run_child(url, profile_dir, cache_type, limit, timeout_ms):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QElapsedTimer, QTimer, QUrl
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEnginePage
+    from cache_policy import CachePolicy
+
+    app = QApplication([sys.argv[0]])
+    profile = QWebEngineProfile("CacheBench", app)
+    profile.setPersistentStoragePath(os.path.join(profile_dir, "storage"))
+    profile.setCachePath(os.path.join(profile_dir, "cache"))
+    if cache_type == "memory":
+        profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        profile.setHttpCacheMaximumSize(50 * 1024 * 1024)
+    else:
+        CachePolicy(limit).configure(profile)
+    page = QWebEnginePage(profile, app)
+    result = {}
+    clock = QElapsedTimer()
+
+    def finished(ok):
+        result.update(ok=ok, load_ms=clock.elapsed())
+        QTimer.singleShot(500, app.quit)
+
+    page.loadFinished.connect(finished)
+    QTimer.singleShot(timeout_ms, app.quit)
+    clock.start()
+    page.load(QUrl(url))
+    app.exec_()
+    del page
+    print(json.dumps(result or {"ok": False, "load_ms": None}))
+    return 0 if result.get("ok") else 1
+
+def measure(url, profile_dir, args):
+    command = [sys.executable, os.path.abspath(__file__), "--child", url, "--profile-dir", profile_dir,
+               "--cache-type", args.cache_type, "--limit", args.limit, "--timeout", str(args.timeout)]
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout / 1000 + 30)
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"Benchmark child failed: {completed.stderr.strip()[-500:]}")
+    result = json.loads(lines[-1])
+    if not result.get("ok"):
+        raise RuntimeError(f"Page load failed for {url}")
+    return result["load_ms"]
+
+def summarize(samples):
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples), "samples": samples}
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold and warm start page-load time with the browser cache policy")
+    parser.add_argument("--runs", type=int, default=5, help="Cold and warm launches to measure")
+    parser.add_argument("--assets", type=int, default=40, help="Subresources referenced by the fixture page")
+    parser.add_argument("--asset-size", type=int, default=64 * 1024, help="Approximate size of each subresource in bytes")
+    parser.add_argument("--rate", type=int, default=2 * 1024 * 1024, help="Per-connection server rate limit in bytes per second")
+    parser.add_argument("--max-age", type=int, default=3600, help="Cache-Control max-age sent by the fixture server")
+    parser.add_argument("--cache-type", choices=["disk", "memory"], default="disk", help="disk uses CachePolicy, memory reproduces the old per-tab setup")
+    parser.add_argument("--limit", default="250 MB", help="Cache size limit passed to CachePolicy")
+    parser.add_argument("--timeout", type=int, default=60000, help="Per-launch page-load timeout in milliseconds")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", metavar="URL", help=argparse.SUPPRESS)
+    parser.add_argument("--profile-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args.child, args.profile_dir, args.cache_type, args.limit, args.timeout)
+
+    workdir = tempfile.mkdtemp(prefix="mojo-cache-bench-")
+    corpus = os.path.join(workdir, "site")
+    os.makedirs(corpus)
+    build_corpus(corpus, args.assets, args.asset_size)
+    server = serve(corpus, rate_limit=args.rate, max_age=args.max_age)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+    cold, warm = [], []
+    try:
+        for run in range(args.runs):
+            profile_dir = os.path.join(workdir, f"profile{run}")
+            cold.append(measure(url, profile_dir, args))
+            warm.append(measure(url, profile_dir, args))
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    except Exception as e:
+        logger.error(f"Cache benchmark failed: {str(e)}")
+        return 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"cache_type": args.cache_type, "limit": args.limit, "assets": args.assets, "cold": summarize(cold), "warm": summarize(warm)}
+    report["speedup"] = round(report["cold"]["median_ms"] / max(report["warm"]["median_ms"], 1), 2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Cache type: {args.cache_type} ({args.limit}), {args.assets} assets")
+        print(f"Cold start: median {report['cold']['median_ms']:.0f} ms (min {report['cold']['min_ms']} ms, max {report['cold']['max_ms']} ms)")
+        print(f"Warm start: median {report['warm']['median_ms']:.0f} ms (min {report['warm']['min_ms']} ms, max {report['warm']['max_ms']} ms)")
+        print(f"Speedup: {report['speedup']}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import logging
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from fixture_server import serve, serve_proxy
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger("fixture_server").setLevel(logging.WARNING)
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pageload_corpus")
+SITE_URL = "http://www.mojo-bench.test/"
+BENCH_DOMAINS = "*.test"
+TRACKER_DOMAINS = ("trackmetrics.test", "adnetwork.test", "socialshare.test")
+
+def build_filter_list(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[Adblock Plus 2.0]\n! Title: Mojo bench filter list\n")
+        for domain in TRACKER_DOMAINS:
+            f.write(f"||{domain}^\n")
+        for index in range(max(0, entries - len(TRACKER_DOMAINS))):
+            f.write(f"||tracker-{index:05d}.example^$third-party\n")
+
+def build_extensions(root, count):
+    os.makedirs(root, exist_ok=True)
+    names = []
+    for index in range(count):
+        name = f"bench-extension-{index}"
+        with open(os.path.join(root, f"{name}.js"), "w", encoding="utf-8") as f:
+            f.write(
+                f"// @Name Bench Extension {index}\n// @RunAt document-end\n"
+                "var links = document.querySelectorAll('a[href]');\n"
+                f"for (var i = 0; i < links.length; i++) links[i].setAttribute('data-bench-{index}', links[i].href.length);\n"
+                f"document.documentElement.setAttribute('data-bench-{index}-words', (document.body ? document.body.textContent : '').split(/\\s+/).length);\n"
+            )
+        names.append(name)
+    return names
+
+def process_tree_rss(pid):
+    if not os.path.isdir("/proc"):
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    children, rss = defaultdict(list), {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+            fields = stat[stat.rindex(")") + 2:].split()
+            children[int(fields[1])].append(int(entry))
+            rss[int(entry)] = int(fields[21]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        total += rss.get(current, 0)
+        pending.extend(children.get(current, []))
+    return total
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.pid = os.getpid()
+        self.peak = 0
+        self.overall = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        value = process_tree_rss(self.pid)
+        if value:
+            self.peak = max(self.peak, value)
+            self.overall = max(self.overall, value)
+
+    def reset(self):
+        self.sample()
+        peak, self.peak = self.peak, 0
+        return round(peak / (1024 * 1024), 1) if peak else None
+
+def write_profile(args, extension_names):
+    from data_manager import DataManager
+    data = DataManager()
+    settings = data.get_browser_settings()
+    settings.update(home_page="about:blank", new_tab_behavior="Blank Page", preload_pages=False)
+    settings["privacy_settings"].update(block_trackers=args.block_trackers, fingerprint_protection=args.fingerprinting)
+    data.set_browser_settings(settings)
+    privacy = data.get_privacy_settings()
+    privacy.update(https_only=False, anti_fingerprinting_enabled=args.fingerprinting)
+    data.set_privacy_settings(privacy)
+    data.set_extension_status({name: "enabled" for name in extension_names})
+
+def run_child(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if os.environ["QT_QPA_PLATFORM"] == "offscreen":
+        os.environ.setdefault("QT_QUICK_BACKEND", "software")
+    profile_dir = args.profile_dir
+    os.makedirs(profile_dir, exist_ok=True)
+    os.chdir(profile_dir)
+    extension_names = build_extensions("extensions", args.extensions)
+    write_profile(args, extension_names)
+
+    startup_origin = time.perf_counter()
+    from PyQt5.QtCore import QTimer, QUrl
+    from PyQt5.QtNetwork import QNetworkProxy
+    from PyQt5.QtWidgets import QApplication
+    from main import MojoBrowser
+    from offline_archive import register_archive_scheme
+    from startup import StartupTimer
+    import resource
+
+    register_archive_scheme()
+    app = QApplication([sys.argv[0], f"--host-resolver-rules=MAP {BENCH_DOMAINS} 127.0.0.1:{args.port}"])
+    startup = StartupTimer(startup_origin, args.budget)
+    browser = MojoBrowser(startup)
+    engine = browser.privacy_engine
+    engine.tracker_blacklist_url = f"{args.base_url}filters.txt"
+    if args.proxy:
+        host, port = args.proxy.rsplit(":", 1)
+        engine.proxy_settings = QNetworkProxy(QNetworkProxy.HttpProxy, host, int(port))
+        engine.apply_proxy(browser.tabs.currentWidget().page().profile())
+
+    lock = threading.Lock()
+    counters = {"requests": 0, "seconds": 0.0}
+    intercept = engine.interceptRequest
+
+    def timed_intercept(info):
+        start = time.perf_counter()
+        try:
+            intercept(info)
+        finally:
+            elapsed = time.perf_counter() - start
+            with lock:
+                counters["requests"] += 1
+                counters["seconds"] += elapsed
+
+    engine.interceptRequest = timed_intercept
+
+    sampler = RssSampler(args.sample_interval / 1000)
+    sampler.start()
+    view = browser.tabs.currentWidget()
+    queue = [(page, iteration) for iteration in range(args.warmup + args.iterations) for page in args.pages]
+    results = []
+    state = {"page": None, "iteration": 0, "start": 0.0, "load_ms": None, "ok": False, "snapshot": None}
+
+    def next_page():
+        if not queue:
+            finish()
+            return
+        page, iteration = queue.pop(0)
+        with lock:
+            state["snapshot"] = dict(counters)
+        sampler.reset()
+        state.update(page=page, iteration=iteration, load_ms=None, ok=False)
+        QTimer.singleShot(args.timeout, lambda expected=(page, iteration): on_timeout(expected))
+        state["start"] = time.perf_counter()
+        view.load(QUrl(f"{SITE_URL}{page}"))
+
+    def on_load_finished(ok):
+        if state["page"] is None or state["load_ms"] is not None:
+            return
+        state["load_ms"] = round((time.perf_counter() - state["start"]) * 1000, 1)
+        state["ok"] = ok
+        expected = (state["page"], state["iteration"])
+        QTimer.singleShot(args.settle, lambda: record(expected))
+
+    def on_timeout(expected):
+        if (state["page"], state["iteration"]) == expected and state["load_ms"] is None:
+            view.stop()
+            state["load_ms"] = float(args.timeout)
+            record(expected)
+
+    def record(expected):
+        if (state["page"], state["iteration"]) != expected:
+            return
+        with lock:
+            requests = counters["requests"] - state["snapshot"]["requests"]
+            seconds = counters["seconds"] - state["snapshot"]["seconds"]
+        if state["iteration"] >= args.warmup:
+            results.append({
+                "page": state["page"],
+                "ok": state["ok"],
+                "load_ms": state["load_ms"],
+                "interceptor_ms": round(seconds * 1000, 3),
+                "requests": requests,
+                "peak_rss_mb": sampler.reset()
+            })
+        state["page"] = None
+        QTimer.singleShot(0, next_page)
+
+    def finish():
+        sampler.stopped.set()
+        if results and not counters["requests"]:
+            logger.warning("The request interceptor was never called, interceptor times are not meaningful")
+        print(json.dumps({
+            "startup": startup.to_dict(),
+            "blacklist_size": len(engine.tracker_blacklist),
+            "pages": results,
+            "peak_rss_mb": round(sampler.overall / (1024 * 1024), 1) if sampler.overall else None,
+            "browser_max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        }), flush=True)
+        app.quit()
+
+    def wait_until_ready(deadline):
+        if args.block_trackers and not engine.tracker_blacklist and time.monotonic() < deadline:
+            QTimer.singleShot(100, lambda: wait_until_ready(deadline))
+            return
+        QTimer.singleShot(args.settle, next_page)
+
+    view.loadFinished.connect(on_load_finished)
+    startup.completed.connect(lambda: wait_until_ready(time.monotonic() + 10))
+    browser.show()
+    app.exec_()
+    return 0 if results and all(result["ok"] for result in results) else 1
+
+def summarize(samples):
+    samples = [sample for sample in samples if sample is not None]
+    if not samples:
+        return None
+    return {"median": round(statistics.median(samples), 3), "min": min(samples), "max": max(samples), "samples": samples}
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+def measure(args, base_url, port, proxy, profile_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--profile-dir", profile_dir, "--base-url", base_url, "--port", str(port),
+               "--pages", *args.pages, "--iterations", str(args.iterations), "--warmup", str(args.warmup), "--extensions", str(args.extensions),
+               "--timeout", str(args.timeout), "--settle", str(args.settle), "--sample-interval", str(args.sample_interval), "--budget", str(args.budget)]
+    if args.block_trackers:
+        command.append("--block-trackers")
+    if args.fingerprinting:
+        command.append("--fingerprinting")
+    if proxy:
+        command += ["--proxy", proxy]
+    timeout = (args.timeout + args.settle) / 1000 * len(args.pages) * (args.iterations + args.warmup) + 120
+    completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"Benchmark child failed: {completed.stderr.strip()[-500:]}")
+    return json.loads(lines[-1])
+
+def aggregate(runs):
+    grouped = defaultdict(list)
+    for run in runs:
+        for result in run["pages"]:
+            grouped[result["page"]].append(result)
+    pages = {}
+    for page, results in grouped.items():
+        rss = [result["peak_rss_mb"] for result in results if result["peak_rss_mb"] is not None]
+        pages[page] = {
+            "load_ms": summarize([result["load_ms"] for result in results if result["ok"]]),
+            "interceptor_ms": summarize([result["interceptor_ms"] for result in results if result["ok"]]),
+            "requests": statistics.median(result["requests"] for result in results),
+            "peak_rss_mb": max(rss) if rss else None,
+            "failures": sum(1 for result in results if not result["ok"])
+        }
+    first_paint = [run["startup"]["marks"].get("first_paint") for run in runs]
+    deferred = [run["startup"]["marks"].get("deferred_complete") for run in runs]
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "startup": {"first_paint_ms": summarize(first_paint), "deferred_complete_ms": summarize(deferred)},
+        "pages": pages,
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "browser_max_rss_mb": max(run["browser_max_rss_mb"] for run in runs)
+    }
+
+def change(current, baseline):
+    if current is None or not baseline:
+        return None
+    return round((current - baseline) / baseline * 100, 1)
+
+def compare(report, baseline):
+    pages = {}
+    for page, current in report["pages"].items():
+        previous = baseline.get("pages", {}).get(page)
+        if not previous:
+            continue
+        pages[page] = {
+            "load_ms_pct": change((current["load_ms"] or {}).get("median"), (previous.get("load_ms") or {}).get("median")),
+            "interceptor_ms_pct": change((current["interceptor_ms"] or {}).get("median"), (previous.get("interceptor_ms") or {}).get("median")),
+            "peak_rss_mb_pct": change(current["peak_rss_mb"], previous.get("peak_rss_mb"))
+        }
+    return {"commit": baseline.get("commit"), "config_matches": baseline.get("config") == report["config"], "pages": pages}
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a bundled page corpus in an offscreen MojoBrowser and report page-load time, interceptor time and peak RSS as JSON")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of pages and assets to serve")
+    parser.add_argument("--pages", nargs="+", help="Corpus pages to load (default: every .html file in the corpus)")
+    parser.add_argument("--runs", type=int, default=3, help="Browser launches, each with a fresh profile")
+    parser.add_argument("--iterations", type=int, default=3, help="Measured loads of each page per launch")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured loads of each page per launch before measuring")
+    parser.add_argument("--block-trackers", action="store_true", help="Enable tracker blocking against the bundled filter list")
+    parser.add_argument("--filter-entries", type=int, default=20000, help="Domains in the generated tracker filter list")
+    parser.add_argument("--fingerprinting", action="store_true", help="Enable anti-fingerprinting request headers")
+    parser.add_argument("--extensions", type=int, default=0, help="Number of generated content-script extensions to enable")
+    parser.add_argument("--proxy", metavar="HOST:PORT|local", help="Route page loads through an HTTP proxy, 'local' starts a forwarding proxy in front of the fixture server")
+    parser.add_argument("--rate", type=int, default=0, help="Per-connection server rate limit in bytes per second")
+    parser.add_argument("--timeout", type=int, default=30000, help="Per-page load timeout in milliseconds")
+    parser.add_argument("--settle", type=int, default=300, help="Milliseconds to wait after each load before sampling and moving on")
+    parser.add_argument("--sample-interval", type=int, default=50, help="RSS sampling interval in milliseconds")
+    parser.add_argument("--budget", type=float, default=1000, help="First-paint budget in milliseconds reported with the startup phases")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier JSON report to compute per-page changes against")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--profile-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args)
+
+    corpus = os.path.abspath(args.corpus)
+    args.pages = args.pages or sorted(name for name in os.listdir(corpus) if name.endswith(".html"))
+    workdir = tempfile.mkdtemp(prefix="mojo-pageload-bench-")
+    site = os.path.join(workdir, "site")
+    shutil.copytree(corpus, site)
+    build_filter_list(os.path.join(site, "filters.txt"), args.filter_entries)
+
+    server = serve(site, rate_limit=args.rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    base_url = f"http://127.0.0.1:{port}/"
+    proxy_server = None
+    proxy = args.proxy
+    if proxy == "local":
+        proxy_server = serve_proxy(("127.0.0.1", port))
+        threading.Thread(target=proxy_server.serve_forever, daemon=True).start()
+        proxy = f"127.0.0.1:{proxy_server.server_address[1]}"
+
+    runs = []
+    try:
+        for run in range(args.runs):
+            runs.append(measure(args, base_url, port, proxy, os.path.join(workdir, f"profile{run}")))
+    except Exception as e:
+        logger.error(f"Page-load benchmark failed: {str(e)}")
+        return 1
+    finally:
+        for running in (server, proxy_server):
+            if running:
+                running.shutdown()
+                running.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": git_revision(),
+        "created": round(time.time()),
+        "config": {
+            "pages": args.pages,
+            "runs": args.runs,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "block_trackers": args.block_trackers,
+            "filter_entries": args.filter_entries,
+            "fingerprinting": args.fingerprinting,
+            "extensions": args.extensions,
+            "proxy": args.proxy,
+            "rate": args.rate
+        },
+        **aggregate(runs)
+    }
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            report["baseline"] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0 if all(page["failures"] == 0 for page in report["pages"].values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
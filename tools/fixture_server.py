@@ -0,0 +1,209 @@
+import os
+import re
+import sys
+import time
+import argparse
+import hashlib
+import logging
+import http.client
+from urllib.parse import urlsplit
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler, SimpleHTTPRequestHandler
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+HOP_HEADERS = ("connection", "keep-alive", "proxy-connection", "proxy-authorization", "te", "trailer", "transfer-encoding", "upgrade", "content-length")
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rate_limit = 0
+    fail_after = 0
+    max_age = 0
+
+    def cache_control(self):
+        return f"public, max-age={self.max_age}" if self.max_age else "no-cache"
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def validators(self, stat):
+        etag = '"' + hashlib.sha1(f"{stat.st_mtime_ns}-{stat.st_size}".encode()).hexdigest()[:16] + '"'
+        return etag, formatdate(stat.st_mtime, usegmt=True)
+
+    def parse_range(self, size):
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        match = RANGE_PATTERN.match(header.strip())
+        if not match or (not match.group(1) and not match.group(2)):
+            return None
+        if match.group(1):
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+        else:
+            start = max(0, size - int(match.group(2)))
+            end = size - 1
+        return start, end
+
+    def range_allowed(self, etag, last_modified):
+        if_range = self.headers.get("If-Range")
+        if not if_range:
+            return True
+        return if_range == etag or if_range == last_modified
+
+    def not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            return super().send_head()
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        etag, last_modified = self.validators(stat)
+
+        if self.not_modified(etag, stat.st_mtime):
+            f.close()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Cache-Control", self.cache_control())
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            return None
+
+        byte_range = self.parse_range(size) if self.range_allowed(etag, last_modified) else None
+        if byte_range and byte_range[0] >= size:
+            f.close()
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        if byte_range:
+            start, end = byte_range
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            start, end = 0, size - 1
+            self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Cache-Control", self.cache_control())
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        f.seek(start)
+        self.remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        try:
+            self._copy_body(source, outputfile)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _copy_body(self, source, outputfile):
+        remaining = getattr(self, "remaining", None)
+        sent = 0
+        while remaining is None or remaining > 0:
+            chunk = source.read(64 * 1024 if remaining is None else min(64 * 1024, remaining))
+            if not chunk:
+                break
+            if self.fail_after and sent + len(chunk) > self.fail_after:
+                outputfile.write(chunk[:self.fail_after - sent])
+                self.close_connection = True
+                return
+            outputfile.write(chunk)
+            sent += len(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+            if self.rate_limit:
+                time.sleep(len(chunk) / self.rate_limit)
+
+class ForwardProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    upstream = None
+
+    def log_message(self, format, *args):
+        logger.debug(f"proxy {self.address_string()} {format % args}")
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {key: value for key, value in self.headers.items() if key.lower() not in HOP_HEADERS}
+        connection = http.client.HTTPConnection(*self.upstream, timeout=30)
+        try:
+            connection.request(self.command, target, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except OSError as e:
+            self.send_error(502, f"Upstream request failed: {str(e)}")
+            return
+        finally:
+            connection.close()
+        self.send_response(response.status)
+        for key, value in response.getheaders():
+            if key.lower() not in HOP_HEADERS:
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+def serve_proxy(upstream, host="127.0.0.1", port=0):
+    handler = type("BoundForwardProxyHandler", (ForwardProxyHandler,), {"upstream": upstream})
+    return ThreadingHTTPServer((host, port), handler)
+
+def serve(root, host="127.0.0.1", port=0, rate_limit=0, fail_after=0, max_age=0):
+    handler = type("BoundFixtureHandler", (FixtureHandler,), {
+        "rate_limit": rate_limit,
+        "fail_after": fail_after,
+        "max_age": max_age,
+        "__init__": lambda self, *args, **kwargs: FixtureHandler.__init__(self, *args, directory=root, **kwargs)
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Range-capable static file server for download and page-load tests")
+    parser.add_argument("root", nargs="?", default=".", help="Directory to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=int, default=0, help="Per-connection rate limit in bytes per second")
+    parser.add_argument("--fail-after", type=int, default=0, help="Drop each response after this many body bytes")
+    parser.add_argument("--max-age", type=int, default=0, help="Cache-Control max-age in seconds (0 sends no-cache)")
+    args = parser.parse_args()
+
+    server = serve(os.path.abspath(args.root), args.host, args.port, args.rate, args.fail_after, args.max_age)
+    logger.info(f"Serving {os.path.abspath(args.root)} on http://{args.host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+(function() {
+    var tbody = document.querySelector("#data tbody");
+    var rows = [];
+    var sortKey = "weekday", descending = true;
+    function render() {
+        rows.sort(function(a, b) {
+            var x = a[sortKey], y = b[sortKey];
+            var order = typeof x === "number" ? x - y : String(x).localeCompare(String(y));
+            return descending ? -order : order;
+        });
+        var html = [];
+        for (var i = 0; i < rows.length; i++) {
+            var row = rows[i];
+            html.push("<tr><td>" + row.station + "</td><td>" + row.line + "</td><td>" + row.weekday.toLocaleString() + "</td><td>" +
+                row.weekend.toLocaleString() + '</td><td class="' + (row.change < 0 ? "down" : "up") + '">' + row.change.toFixed(1) + "%</td></tr>");
+        }
+        tbody.innerHTML = html.join("");
+    }
+    document.querySelector("#data thead").addEventListener("click", function(event) {
+        var key = event.target.getAttribute("data-key");
+        if (!key) return;
+        descending = key === sortKey ? !descending : true;
+        sortKey = key;
+        render();
+    });
+    var xhr = new XMLHttpRequest();
+    xhr.open("GET", "http://static.mojo-bench.test/static/data.json", false);
+    xhr.send();
+    rows = JSON.parse(xhr.responseText);
+    var total = rows.reduce(function(sum, row) { return sum + row.weekday; }, 0);
+    document.getElementById("summary").textContent = rows.length + " stations, " + total.toLocaleString() + " weekday riders";
+    render();
+})();
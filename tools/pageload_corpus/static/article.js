@@ -0,0 +1,16 @@
+(function() {
+    var article = document.querySelector(".story");
+    var bar = document.createElement("div");
+    bar.style.cssText = "position:fixed;top:0;left:0;height:3px;background:#1d4ed8;width:0;z-index:10";
+    document.body.appendChild(bar);
+    function update() {
+        var rect = article.getBoundingClientRect();
+        var total = rect.height - window.innerHeight;
+        bar.style.width = (total > 0 ? Math.min(100, Math.max(0, -rect.top / total * 100)) : 100) + "%";
+    }
+    window.addEventListener("scroll", update, {passive: true});
+    update();
+    var words = article.textContent.split(/\s+/).length;
+    var byline = document.querySelector(".byline");
+    byline.textContent += " · " + Math.max(1, Math.round(words / 230)) + " min read";
+})();
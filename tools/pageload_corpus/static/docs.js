@@ -0,0 +1,23 @@
+(function() {
+    var headings = document.querySelectorAll(".content h2, .content h3");
+    var index = [];
+    for (var i = 0; i < headings.length; i++) {
+        var next = headings[i].nextElementSibling;
+        index.push({id: headings[i].id, text: (headings[i].textContent + " " + (next ? next.textContent : "")).toLowerCase()});
+    }
+    var links = document.querySelectorAll(".sidebar a");
+    document.getElementById("doc-search").addEventListener("input", function() {
+        var query = this.value.trim().toLowerCase();
+        var hits = {};
+        index.forEach(function(entry) {
+            if (!query || entry.text.indexOf(query) !== -1) hits[entry.id] = true;
+        });
+        for (var j = 0; j < links.length; j++) {
+            links[j].parentNode.style.display = hits[links[j].getAttribute("href").slice(1)] ? "" : "none";
+        }
+    });
+    var blocks = document.querySelectorAll("pre code");
+    for (var k = 0; k < blocks.length; k++) {
+        blocks[k].innerHTML = blocks[k].innerHTML.replace(/(#[^\n]*)/g, '<span style="color:#94a3b8">$1</span>');
+    }
+})();
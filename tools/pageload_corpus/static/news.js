@@ -0,0 +1,15 @@
+(function() {
+    var cards = document.querySelectorAll(".card");
+    var now = Date.now();
+    for (var i = 0; i < cards.length; i++) {
+        var meta = cards[i].querySelector(".meta");
+        cards[i].dataset.rendered = String(now);
+        if (meta && /^[1-9] min/.test(meta.textContent)) {
+            var badge = document.createElement("strong");
+            badge.textContent = "New ";
+            meta.insertBefore(badge, meta.firstChild);
+        }
+    }
+    var slots = document.querySelectorAll(".ad-slot");
+    for (var j = 0; j < slots.length; j++) slots[j].setAttribute("aria-label", "Advertisement");
+})();
@@ -0,0 +1,27 @@
+(function() {
+    var products = Array.prototype.slice.call(document.querySelectorAll(".product"));
+    var list = document.querySelector(".products");
+    var count = document.getElementById("cart-count");
+    var cart = [];
+    try { cart = JSON.parse(localStorage.getItem("bench-cart") || "[]"); } catch (e) {}
+    count.textContent = cart.length;
+    list.addEventListener("click", function(event) {
+        if (!event.target.classList.contains("add")) return;
+        cart.push(event.target.parentNode.querySelector("h2").textContent);
+        count.textContent = cart.length;
+        localStorage.setItem("bench-cart", JSON.stringify(cart));
+    });
+    function apply() {
+        var checked = Array.prototype.map.call(document.querySelectorAll(".filters input:checked"), function(input) { return input.value; });
+        var key = document.getElementById("sort").value;
+        products.sort(function(a, b) {
+            return key === "price" ? parseFloat(a.dataset.price) - parseFloat(b.dataset.price) : 0;
+        });
+        products.forEach(function(product) {
+            product.classList.toggle("hidden", checked.length > 0 && checked.indexOf(product.dataset.category) === -1);
+            list.appendChild(product);
+        });
+    }
+    document.querySelector(".filters").addEventListener("change", apply);
+    apply();
+})();
@@ -0,0 +1,10 @@
+(function() {
+    var slots = document.querySelectorAll(".ad-slot");
+    for (var i = 0; i < slots.length; i++) {
+        var frame = document.createElement("img");
+        frame.src = "http://ads.adnetwork.test/track/pixel.svg?slot=" + (slots[i].getAttribute("data-slot") || "") + "&n=" + i;
+        frame.width = 300;
+        frame.height = 250;
+        slots[i].appendChild(frame);
+    }
+})();
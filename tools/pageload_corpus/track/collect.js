@@ -0,0 +1,5 @@
+(function() {
+    var payload = {u: location.href, r: document.referrer, w: screen.width, h: screen.height, t: Date.now()};
+    var img = new Image();
+    img.src = "http://analytics.trackmetrics.test/track/pixel.svg?d=" + encodeURIComponent(JSON.stringify(payload));
+})();
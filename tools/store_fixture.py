@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import serve
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def build_store(root, count, base_url):
+    os.makedirs(root, exist_ok=True)
+    catalog = []
+    for index in range(count):
+        name = f"fixture-addon-{index}"
+        source = f"// @Name Fixture Add-On {index}\n// @RunAt document-idle\nconsole.log({json.dumps(name)});\n".encode()
+        with open(os.path.join(root, f"{name}.js"), "wb") as f:
+            f.write(source)
+        catalog.append({
+            "name": f"Fixture Add-On {index}",
+            "description": f"Generated store entry {index} for catalog and install tests.",
+            "author": f"Fixture Author {index % 17}",
+            "url": f"{base_url}{name}.js",
+            "sha256": hashlib.sha256(source).hexdigest()
+        })
+    with open(os.path.join(root, "Add-On-Lists.js"), "w", encoding="utf-8") as f:
+        json.dump(catalog, f)
+    return catalog
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and serve a stand-in MojoX add-on store")
+    parser.add_argument("root", nargs="?", default="store_fixture", help="Directory to generate the store into")
+    parser.add_argument("--count", type=int, default=5000, help="Number of catalog entries")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--max-age", type=int, default=0, help="Cache-Control max-age in seconds (0 sends no-cache)")
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    base_url = f"http://{args.host}:{args.port}/"
+    build_store(root, args.count, base_url)
+    server = serve(root, args.host, args.port, max_age=args.max_age)
+    logger.info(f"Serving {args.count} add-ons on {base_url}, start the browser with MOJO_STORE_URL={base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())